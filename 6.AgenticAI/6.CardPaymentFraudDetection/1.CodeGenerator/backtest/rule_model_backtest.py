@@ -0,0 +1,290 @@
+"""
+Rule + Model Backtest
+---------------------
+
+Streams the fraud training CSV in fixed-size chunks, fans the chunks out to
+a process pool and runs RuleService, MLService and FraudDecisionEngine on
+every row.
+
+Report:
+- Per-rule hit counts (and how many hits were fraud)
+- Precision / recall against `label` per stage
+- Decision mix
+- Rows/second per stage
+
+Usage (from 1.CodeGenerator/):
+    python -m backtest.rule_model_backtest \
+        --data taining_data/rule_compatible_fraud_data.csv \
+        --rules artifacts/rule_book.json \
+        --model artifacts/model/fraud_xgboost_model.joblib \
+        --chunk-size 100000 --workers 8
+"""
+
+import argparse
+import json
+import os
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from run_time.rule_engine.rule_loader import RuleLoader
+from run_time.rule_engine.rule_service import RuleService
+from run_time.ml_engine.fraud_detection_service_using_ml import MLService
+from run_time.decision_engine.fraud_decision_engine import FraudDecisionEngine
+
+# --------------------------------------------------
+# CONFIGURATION
+# --------------------------------------------------
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DATA_FILE = os.path.join(BASE_DIR, "taining_data", "rule_compatible_fraud_data.csv")
+RULE_BOOK_PATH = os.path.join(BASE_DIR, "artifacts", "rule_book.json")
+MODEL_PATH = os.path.join(BASE_DIR, "artifacts", "model", "fraud_xgboost_model.joblib")
+
+TARGET_COL = "label"
+CHUNK_SIZE = 100_000
+
+# --------------------------------------------------
+# WORKER
+# --------------------------------------------------
+
+# Loaded once per worker process by `_init_worker`
+_engine = None
+
+
+def _init_worker(rules_path, model_path):
+    global _engine
+    rule_service = RuleService(RuleLoader.load_rules(rules_path))
+    ml_service = MLService(model_path) if model_path else None
+    _engine = FraudDecisionEngine(rule_service, ml_service)
+
+
+def _ml_scores(ml_service, chunk):
+    return ml_service.predict(ml_service.to_matrix(chunk))
+
+
+def _ml_decisions(ml_service, scores):
+    return np.select(
+        [scores >= ml_service.decline_threshold, scores >= ml_service.step_up_threshold],
+        ["DECLINE", "STEP_UP"],
+        default="APPROVE"
+    )
+
+
+def _confusion(predicted, label):
+    return {
+        "tp": int(np.sum(predicted & label)),
+        "fp": int(np.sum(predicted & ~label)),
+        "fn": int(np.sum(~predicted & label)),
+    }
+
+
+def _backtest_chunk(chunk: pd.DataFrame) -> dict:
+    rule_service = _engine.rule_service
+    ml_service = _engine.ml_service
+    label = chunk[TARGET_COL].to_numpy().astype(bool)
+    timings = {}
+
+    # 1️⃣ Rules
+    start = time.perf_counter()
+    rule_result = rule_service.evaluate_batch(chunk)
+    timings["rules"] = time.perf_counter() - start
+
+    rule_decisions = rule_result["decision"].to_numpy()
+    hits = rule_result["hits"].to_numpy()
+
+    # 2️⃣ ML
+    if ml_service is not None:
+        start = time.perf_counter()
+        scores = _ml_scores(ml_service, chunk)
+        ml_decisions = _ml_decisions(ml_service, scores)
+        timings["ml"] = time.perf_counter() - start
+    else:
+        ml_decisions = np.full(len(chunk), "APPROVE", dtype=object)
+
+    # 3️⃣ Decision
+    start = time.perf_counter()
+    final_decisions = _engine.combine_batch(rule_decisions, ml_decisions)
+    timings["decision"] = time.perf_counter() - start
+
+    stage_decisions = {"rules": rule_decisions}
+    if ml_service is not None:
+        stage_decisions["ml"] = ml_decisions
+    stage_decisions["decision"] = final_decisions
+
+    return {
+        "rows": len(chunk),
+        "fraud_rows": int(label.sum()),
+        "rule_hits": hits.sum(axis=0),
+        "rule_fraud_hits": hits[label].sum(axis=0),
+        "confusion": {
+            stage: {
+                "decline": _confusion(decisions == "DECLINE", label),
+                "flagged": _confusion(decisions != "APPROVE", label),
+            }
+            for stage, decisions in stage_decisions.items()
+        },
+        "decision_mix": Counter(final_decisions.tolist()),
+        "timings": timings,
+    }
+
+# --------------------------------------------------
+# DRIVER
+# --------------------------------------------------
+
+def _merge(total, part):
+    if total is None:
+        return part
+
+    total["rows"] += part["rows"]
+    total["fraud_rows"] += part["fraud_rows"]
+    total["rule_hits"] = total["rule_hits"] + part["rule_hits"]
+    total["rule_fraud_hits"] = total["rule_fraud_hits"] + part["rule_fraud_hits"]
+    total["decision_mix"].update(part["decision_mix"])
+
+    for stage, kinds in part["confusion"].items():
+        for kind, counts in kinds.items():
+            for key, value in counts.items():
+                total["confusion"][stage][kind][key] += value
+
+    for stage, seconds in part["timings"].items():
+        total["timings"][stage] = total["timings"].get(stage, 0.0) + seconds
+
+    return total
+
+
+def _precision_recall(counts):
+    tp, fp, fn = counts["tp"], counts["fp"], counts["fn"]
+    return {
+        "precision": round(tp / (tp + fp), 4) if tp + fp else 0.0,
+        "recall": round(tp / (tp + fn), 4) if tp + fn else 0.0,
+        **counts,
+    }
+
+
+def _report(total, rules, wall_seconds, workers):
+    rows = total["rows"]
+    return {
+        "rows": rows,
+        "fraud_rows": total["fraud_rows"],
+        "workers": workers,
+        "wall_seconds": round(wall_seconds, 3),
+        "rows_per_second": {
+            "wall": round(rows / wall_seconds, 1) if wall_seconds else 0.0,
+            # Per-core throughput of each stage (summed worker time)
+            **{
+                stage: round(rows / seconds, 1) if seconds else 0.0
+                for stage, seconds in total["timings"].items()
+            },
+        },
+        "decision_mix": dict(total["decision_mix"]),
+        "metrics": {
+            stage: {kind: _precision_recall(counts) for kind, counts in kinds.items()}
+            for stage, kinds in total["confusion"].items()
+        },
+        "rule_hits": [
+            {
+                "rule_id": rule["rule_id"],
+                "use_case": rule["use_case"],
+                "action": rule["action"],
+                "hits": int(hits),
+                "fraud_hits": int(fraud_hits),
+            }
+            for rule, hits, fraud_hits in zip(
+                rules, total["rule_hits"], total["rule_fraud_hits"]
+            )
+        ],
+    }
+
+
+def run_backtest(data_path=DATA_FILE, rules_path=RULE_BOOK_PATH, model_path=MODEL_PATH,
+                 chunk_size=CHUNK_SIZE, workers=None):
+    """Backtest the rule book (and model, unless `model_path` is None) over `data_path`."""
+    workers = workers or os.cpu_count() or 1
+    rules = RuleLoader.load_rules(rules_path)
+    chunks = pd.read_csv(data_path, chunksize=chunk_size)
+    total = None
+
+    start = time.perf_counter()
+
+    if workers == 1:
+        _init_worker(rules_path, model_path)
+        for chunk in chunks:
+            total = _merge(total, _backtest_chunk(chunk))
+    else:
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(rules_path, model_path)
+        ) as pool:
+            # Bounded in-flight chunks keep parent memory flat while streaming
+            pending = []
+            for chunk in chunks:
+                pending.append(pool.submit(_backtest_chunk, chunk))
+                if len(pending) >= 2 * workers:
+                    total = _merge(total, pending.pop(0).result())
+            for future in pending:
+                total = _merge(total, future.result())
+
+    wall_seconds = time.perf_counter() - start
+
+    if total is None:
+        raise ValueError(f"❌ No rows found in {data_path}")
+
+    return _report(total, rules, wall_seconds, workers)
+
+
+def print_report(report):
+    print(f"\n📊 Rows: {report['rows']}  🚨 Fraud: {report['fraud_rows']}  "
+          f"👷 Workers: {report['workers']}  ⏱️ {report['wall_seconds']}s")
+
+    print("\n⚡ Rows/second:")
+    for stage, rate in report["rows_per_second"].items():
+        print(f"  {stage:<10} {rate:>14,.1f}")
+
+    print("\n🧮 Decision mix:")
+    for decision, count in sorted(report["decision_mix"].items()):
+        print(f"  {decision:<10} {count:>10}")
+
+    print("\n📈 Precision / Recall:")
+    for stage, kinds in report["metrics"].items():
+        for kind, m in kinds.items():
+            print(f"  {stage:<10} {kind:<8} precision={m['precision']:.4f} recall={m['recall']:.4f}")
+
+    print("\n🔍 Rule hits:")
+    hits = pd.DataFrame(report["rule_hits"])
+    print(hits.sort_values(by="hits", ascending=False).to_string(index=False))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Backtest the fraud rule book and model")
+    parser.add_argument("--data", default=DATA_FILE)
+    parser.add_argument("--rules", default=RULE_BOOK_PATH)
+    parser.add_argument("--model", default=MODEL_PATH)
+    parser.add_argument("--no-ml", action="store_true", help="Backtest rules only")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    args = parser.parse_args(argv)
+
+    report = run_backtest(
+        data_path=args.data,
+        rules_path=args.rules,
+        model_path=None if args.no_ml else args.model,
+        chunk_size=args.chunk_size,
+        workers=args.workers,
+    )
+    print_report(report)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n💾 Report saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Inference Backend Benchmark
+---------------------------
+
+Per backend (sklearn, booster, onnx, numpy):
+- Max |score - sklearn score| over the sample (parity)
+- Single-row predict latency p50 / p99
+- Bulk rows/second
+
+Usage (from 1.CodeGenerator/):
+    python -m benchmarks.inference_backend_benchmark \
+        --model artifacts/model/fraud_xgboost_model.joblib \
+        --data taining_data/rule_compatible_fraud_data.csv
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from run_time.ml_engine.fraud_detection_service_using_ml import MLService
+from run_time.ml_engine.inference_backends import BACKENDS
+from benchmarks.ml_service_benchmark import DATA_FILE, MODEL_PATH, percentiles
+
+
+def bench_backend(ml_service, X, reference, single_calls):
+    for i in range(min(50, len(X))):
+        ml_service.predict(X[i:i + 1])
+
+    latencies = []
+    for i in range(min(single_calls, len(X))):
+        row = X[i:i + 1]
+        start = time.perf_counter()
+        ml_service.predict(row)
+        latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    scores = ml_service.predict(X)
+    bulk_seconds = time.perf_counter() - start
+
+    return {
+        "max_abs_diff": float(np.max(np.abs(scores - reference))),
+        "rows_per_sec": round(len(X) / bulk_seconds, 1),
+        **percentiles(latencies),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark MLService inference backends")
+    parser.add_argument("--model", default=MODEL_PATH)
+    parser.add_argument("--data", default=DATA_FILE)
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--single-calls", type=int, default=2000)
+    parser.add_argument("--backends", nargs="+", default=list(BACKENDS))
+    args = parser.parse_args(argv)
+
+    reference_service = MLService(args.model, backend="sklearn")
+    X = reference_service.to_matrix(pd.read_csv(args.data, nrows=args.rows))
+    reference = reference_service.predict(X)
+
+    print(f"\n{'backend':<10} {'max_abs_diff':>13} {'p50_us':>10} {'p99_us':>10} {'rows/sec':>14}")
+    for name in args.backends:
+        try:
+            ml_service = MLService(args.model, backend=name)
+        except ImportError as e:
+            print(f"{name:<10} skipped: {e}")
+            continue
+
+        r = bench_backend(ml_service, X, reference, args.single_calls)
+        print(f"{name:<10} {r['max_abs_diff']:>13.2e} {r['p50_us']:>10.1f} "
+              f"{r['p99_us']:>10.1f} {r['rows_per_sec']:>14,.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,338 @@
+"""
+Open-Loop Load Generator
+------------------------
+
+Replays rows of the synthetic fraud dataset against FraudDecisionEngine (in
+process) or an HTTP wrapper of it at a fixed arrival rate, independent of
+how fast responses come back. A closed-loop benchmark waits for each
+response before sending the next and so never sees queueing delay.
+
+- Arrivals (`--profile`): constant gaps, Poisson, or Poisson bursts
+  (`--burst-factor` x the rate for `--burst-duty` of every
+  `--burst-period-s`, quieter in between, same mean rate)
+- A dispatcher thread releases each request at its scheduled time into a
+  queue served by `--concurrency` worker threads (1 = one engine instance)
+- Latency is measured from the *scheduled* send time (coordinated-omission
+  correction): time a request spent waiting behind a slow one counts.
+  `service` latency (from dequeue) is reported next to it
+- `--rates` sweeps arrival rates into a latency-vs-throughput curve; the
+  saturation point is the highest rate still served at ≥ SATURATION_SHARE
+  of the offered rate with p99 within `--slo-ms`
+
+The dispatcher shares the GIL with an in-process engine; the switch
+interval is lowered to SWITCH_INTERVAL_S for the run so it wakes on time.
+
+Usage (from 1.CodeGenerator/):
+    python -m benchmarks.load_generator --model artifacts/model/fraud_xgboost_model.joblib \
+        --rates 500 1000 2000 4000 --duration-s 10 --profile poisson --output load_curve.json
+    python -m benchmarks.load_generator --url http://localhost:8080/evaluate --concurrency 32 \
+        --rates 1000 2000 4000
+"""
+
+import argparse
+import http.client
+import json
+import math
+import os
+import queue
+import sys
+import threading
+import time
+from urllib.parse import urlsplit
+
+import numpy as np
+import pandas as pd
+
+from run_time.decision_engine.fraud_decision_engine import FraudDecisionEngine
+from run_time.ml_engine.fraud_detection_service_using_ml import MLService
+from run_time.rule_engine.rule_loader import RuleLoader
+from run_time.rule_engine.rule_service import RuleService
+
+# --------------------------------------------------
+# CONFIGURATION
+# --------------------------------------------------
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DATA_FILE = os.path.join(BASE_DIR, "taining_data", "rule_compatible_fraud_data.csv")
+RULE_BOOK_PATH = os.path.join(BASE_DIR, "artifacts", "rule_book.json")
+MODEL_PATH = os.path.join(BASE_DIR, "artifacts", "model", "fraud_xgboost_model.joblib")
+
+DROP_COLUMNS = ["label"]
+DURATION_S = 10.0
+WARMUP_S = 1.0                  # leading seconds left out of the statistics
+SLO_MS = 50.0
+SATURATION_SHARE = 0.95         # achieved / offered throughput still counted as keeping up
+BURST_FACTOR = 4.0
+BURST_PERIOD_S = 1.0
+BURST_DUTY = 0.2
+SWITCH_INTERVAL_S = 0.0002
+HTTP_TIMEOUT_S = 10.0
+
+# --------------------------------------------------
+# ARRIVALS
+# --------------------------------------------------
+
+def arrivals(profile, rate, duration_s, seed=0, burst_factor=BURST_FACTOR,
+             burst_period_s=BURST_PERIOD_S, burst_duty=BURST_DUTY) -> np.ndarray:
+    """Sorted scheduled send times (seconds from start) for a mean `rate` per second."""
+    rng = np.random.default_rng(seed)
+
+    if profile == "constant":
+        return np.arange(0.0, duration_s, 1.0 / rate)
+
+    if profile == "poisson":
+        return _poisson(rng, rate, 0.0, duration_s)
+
+    if profile == "burst":
+        if burst_factor * burst_duty > 1:
+            raise ValueError(f"❌ burst_factor x burst_duty must be ≤ 1, got {burst_factor * burst_duty}")
+        burst_rate = rate * burst_factor
+        quiet_rate = rate * (1 - burst_factor * burst_duty) / (1 - burst_duty)
+        times = []
+        for period_start in np.arange(0.0, duration_s, burst_period_s):
+            burst_end = min(period_start + burst_duty * burst_period_s, duration_s)
+            period_end = min(period_start + burst_period_s, duration_s)
+            times.append(_poisson(rng, burst_rate, period_start, burst_end))
+            times.append(_poisson(rng, quiet_rate, burst_end, period_end))
+        return np.concatenate(times)
+
+    raise ValueError(f"❌ Unknown profile {profile!r}, choose from constant / poisson / burst")
+
+
+def _poisson(rng, rate, start, end):
+    if rate <= 0 or end <= start:
+        return np.empty(0)
+    # Enough exponential gaps to pass `end` with overwhelming probability
+    n = int((end - start) * rate + 10 * math.sqrt((end - start) * rate) + 10)
+    times = start + np.cumsum(rng.exponential(1.0 / rate, n))
+    return times[times < end]
+
+# --------------------------------------------------
+# TARGETS
+# --------------------------------------------------
+
+class EngineTarget:
+    """`FraudDecisionEngine.evaluate` in this process."""
+
+    def __init__(self, engine):
+        self.engine = engine
+
+    @classmethod
+    def from_files(cls, rules_path=RULE_BOOK_PATH, model_path=MODEL_PATH, **ml_options):
+        return cls(FraudDecisionEngine(
+            RuleService(RuleLoader.load_rules(rules_path)),
+            MLService(model_path, **ml_options),
+        ))
+
+    def __call__(self, transaction):
+        return self.engine.evaluate(transaction)
+
+
+class HttpTarget:
+    """POSTs each transaction as JSON to `url`; one keep-alive connection per worker thread."""
+
+    def __init__(self, url, timeout_s=HTTP_TIMEOUT_S):
+        parts = urlsplit(url)
+        self.host = parts.hostname
+        self.port = parts.port
+        self.path = parts.path or "/"
+        self.https = parts.scheme == "https"
+        self.timeout_s = timeout_s
+        self._local = threading.local()
+
+    def _connection(self):
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            cls = http.client.HTTPSConnection if self.https else http.client.HTTPConnection
+            connection = self._local.connection = cls(self.host, self.port, timeout=self.timeout_s)
+        return connection
+
+    def __call__(self, transaction):
+        body = json.dumps(transaction, default=str).encode()
+        connection = self._connection()
+        try:
+            connection.request("POST", self.path, body, {"Content-Type": "application/json"})
+            response = connection.getresponse()
+            payload = response.read()
+        except (OSError, http.client.HTTPException):
+            # Reconnect on the next request
+            connection.close()
+            self._local.connection = None
+            raise
+        if response.status >= 400:
+            raise RuntimeError(f"HTTP {response.status}")
+        return payload
+
+# --------------------------------------------------
+# OPEN-LOOP RUN
+# --------------------------------------------------
+
+def run(target, transactions, schedule, concurrency=1):
+    """
+    Send transactions[i % n] at schedule[i] seconds from start.
+    Returns (scheduled, started, finished, ok) arrays of absolute perf_counter seconds.
+    """
+    n = len(schedule)
+    started = np.zeros(n)
+    finished = np.zeros(n)
+    ok = np.zeros(n, dtype=bool)
+    pending = queue.SimpleQueue()
+
+    def work():
+        while True:
+            i = pending.get()
+            if i is None:
+                return
+            started[i] = time.perf_counter()
+            try:
+                target(transactions[i % len(transactions)])
+                ok[i] = True
+            except Exception:
+                pass
+            finished[i] = time.perf_counter()
+
+    workers = [threading.Thread(target=work, name=f"load-worker-{k}", daemon=True) for k in range(concurrency)]
+    for worker in workers:
+        worker.start()
+
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(SWITCH_INTERVAL_S)
+    try:
+        base = time.perf_counter() + 0.01
+        scheduled = base + schedule
+        for i, at in enumerate(scheduled):
+            delay = at - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            pending.put(i)
+        for _ in workers:
+            pending.put(None)
+        for worker in workers:
+            worker.join()
+    finally:
+        sys.setswitchinterval(switch_interval)
+
+    return scheduled, started, finished, ok
+
+
+def summarize(rate, scheduled, started, finished, ok, warmup_s=WARMUP_S):
+    """Offered vs achieved throughput and corrected / service latency percentiles (ms)."""
+    measured = scheduled >= scheduled[0] + warmup_s if len(scheduled) else scheduled.astype(bool)
+    if not measured.any():
+        measured = np.ones(len(scheduled), dtype=bool)
+
+    window = finished[measured].max() - scheduled[measured].min()
+    done = measured & ok
+    latency = (finished[done] - scheduled[done]) * 1e3
+    service = (finished[done] - started[done]) * 1e3
+
+    def pct(values, q):
+        return round(float(np.percentile(values, q)), 3) if len(values) else None
+
+    return {
+        "offered_rps": rate,
+        "achieved_rps": round(int(done.sum()) / window, 1) if window > 0 else 0.0,
+        "requests": int(measured.sum()),
+        "errors": int((measured & ~ok).sum()),
+        "latency_ms": {"p50": pct(latency, 50), "p99": pct(latency, 99),
+                       "p99.9": pct(latency, 99.9), "max": pct(latency, 100)},
+        "service_ms": {"p50": pct(service, 50), "p99": pct(service, 99)},
+        # Mean time spent queued behind earlier requests
+        "queue_ms": round(float(np.mean(latency - service)), 3) if len(latency) else None,
+    }
+
+
+def sweep(target, transactions, rates, duration_s=DURATION_S, profile="poisson", concurrency=1,
+          slo_ms=SLO_MS, warmup_s=WARMUP_S, seed=0, verbose=True, **profile_options):
+    """Latency-vs-throughput curve over `rates`; stops once a rate is clearly past saturation."""
+    curve = []
+    for rate in sorted(rates):
+        schedule = arrivals(profile, rate, duration_s, seed, **profile_options)
+        point = summarize(rate, *run(target, transactions, schedule, concurrency), warmup_s=warmup_s)
+        point["keeps_up"] = (
+            point["achieved_rps"] >= SATURATION_SHARE * rate
+            and point["latency_ms"]["p99"] is not None and point["latency_ms"]["p99"] <= slo_ms
+        )
+        curve.append(point)
+
+        if verbose:
+            lat = point["latency_ms"]
+            print(f"  {'✅' if point['keeps_up'] else '❌'} offered {rate:>8,.0f}/s  achieved {point['achieved_rps']:>9,.1f}/s  "
+                  f"p50 {lat['p50']}ms  p99 {lat['p99']}ms  p99.9 {lat['p99.9']}ms  "
+                  f"(service p99 {point['service_ms']['p99']}ms)")
+
+        # Well past saturation the queue only grows; higher rates tell nothing new
+        if point["achieved_rps"] < 0.5 * rate:
+            break
+
+    kept_up = [p["offered_rps"] for p in curve if p["keeps_up"]]
+    return {
+        "profile": profile,
+        "concurrency": concurrency,
+        "duration_s": duration_s,
+        "slo_ms": slo_ms,
+        "curve": curve,
+        "saturation_rps": max(kept_up) if kept_up else None,
+    }
+
+
+def load_transactions(data_path=DATA_FILE, rows=10_000):
+    df = pd.read_csv(data_path, nrows=rows)
+    return df.drop(columns=[c for c in DROP_COLUMNS if c in df.columns]).to_dict("records")
+
+# --------------------------------------------------
+# MAIN
+# --------------------------------------------------
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Open-loop load test of the fraud decision path")
+    parser.add_argument("--data", default=DATA_FILE)
+    parser.add_argument("--rows", type=int, default=10_000, help="Dataset rows replayed (cycled)")
+    parser.add_argument("--rules", default=RULE_BOOK_PATH)
+    parser.add_argument("--model", default=MODEL_PATH)
+    parser.add_argument("--url", help="Target an HTTP wrapper (POST JSON) instead of the in-process engine")
+    parser.add_argument("--rates", type=float, nargs="+", default=[250, 500, 1000, 2000, 4000])
+    parser.add_argument("--duration-s", type=float, default=DURATION_S)
+    parser.add_argument("--warmup-s", type=float, default=WARMUP_S)
+    parser.add_argument("--profile", choices=["constant", "poisson", "burst"], default="poisson")
+    parser.add_argument("--burst-factor", type=float, default=BURST_FACTOR)
+    parser.add_argument("--burst-period-s", type=float, default=BURST_PERIOD_S)
+    parser.add_argument("--burst-duty", type=float, default=BURST_DUTY)
+    parser.add_argument("--concurrency", type=int, default=1, help="Requests in flight at once")
+    parser.add_argument("--slo-ms", type=float, default=SLO_MS)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write the curve JSON here")
+    args = parser.parse_args(argv)
+
+    target = HttpTarget(args.url) if args.url else EngineTarget.from_files(args.rules, args.model)
+    transactions = load_transactions(args.data, args.rows)
+
+    # Warm up the target outside the measured runs
+    for t in transactions[:200]:
+        target(t)
+
+    print(f"\n🚦 Open-loop {args.profile} load → {args.url or 'FraudDecisionEngine'} "
+          f"({args.concurrency} in flight, {args.duration_s}s per rate)")
+    report = sweep(
+        target, transactions, args.rates, args.duration_s, args.profile, args.concurrency,
+        args.slo_ms, args.warmup_s, args.seed,
+        **({"burst_factor": args.burst_factor, "burst_period_s": args.burst_period_s,
+            "burst_duty": args.burst_duty} if args.profile == "burst" else {}),
+    )
+
+    if report["saturation_rps"] is None:
+        print(f"\n❌ No rate met p99 ≤ {args.slo_ms}ms at ≥{SATURATION_SHARE:.0%} of offered load")
+    else:
+        print(f"\n📈 Saturation: {report['saturation_rps']:,.0f}/s (p99 ≤ {args.slo_ms}ms)")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"💾 Curve saved to {args.output}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
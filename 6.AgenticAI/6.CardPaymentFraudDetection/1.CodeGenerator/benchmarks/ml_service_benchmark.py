@@ -0,0 +1,148 @@
+"""
+MLService Scoring Benchmark
+---------------------------
+
+Compares the original one-row DataFrame path of `MLService.score` with:
+- `score`        : single transaction via the float32 matrix path
+- `score_batch`  : bulk scoring
+- micro-batching : concurrent `score` calls gathered by MicroBatcher
+
+Usage (from 1.CodeGenerator/):
+    python -m benchmarks.ml_service_benchmark \
+        --model artifacts/model/fraud_xgboost_model.joblib \
+        --data taining_data/rule_compatible_fraud_data.csv
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from run_time.ml_engine.fraud_detection_service_using_ml import MLService
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DATA_FILE = os.path.join(BASE_DIR, "taining_data", "rule_compatible_fraud_data.csv")
+MODEL_PATH = os.path.join(BASE_DIR, "artifacts", "model", "fraud_xgboost_model.joblib")
+
+# --------------------------------------------------
+# HELPERS
+# --------------------------------------------------
+
+def legacy_score(ml_service, transaction):
+    """The pre-`score_batch` MLService.score path, kept as the baseline."""
+    df = pd.DataFrame([transaction])
+    for col in df.select_dtypes(include=["bool"]).columns:
+        df[col] = df[col].astype(int)
+    df = df.reindex(columns=ml_service.features, fill_value=0)
+    return float(ml_service.model.predict_proba(df)[0][1])
+
+
+def percentiles(latencies):
+    us = np.asarray(latencies) * 1e6
+    return {
+        "p50_us": round(float(np.percentile(us, 50)), 1),
+        "p99_us": round(float(np.percentile(us, 99)), 1),
+    }
+
+
+def time_each(fn, items):
+    latencies = []
+    for item in items:
+        start = time.perf_counter()
+        fn(item)
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+# --------------------------------------------------
+# BENCHMARKS
+# --------------------------------------------------
+
+def bench_single(ml_service, transactions):
+    legacy = time_each(lambda t: legacy_score(ml_service, t), transactions)
+    current = time_each(ml_service.score, transactions)
+    return {
+        "legacy": percentiles(legacy),
+        "score": percentiles(current),
+    }
+
+
+def bench_bulk(ml_service, transactions, batch_sizes):
+    start = time.perf_counter()
+    for t in transactions:
+        legacy_score(ml_service, t)
+    results = {"legacy_rows_per_sec": round(len(transactions) / (time.perf_counter() - start), 1)}
+
+    for size in batch_sizes:
+        start = time.perf_counter()
+        for i in range(0, len(transactions), size):
+            ml_service.score_batch(transactions[i:i + size])
+        results[f"score_batch_{size}_rows_per_sec"] = round(
+            len(transactions) / (time.perf_counter() - start), 1
+        )
+
+    return results
+
+
+def bench_micro_batch(model_path, transactions, threads, batch_size, wait_us):
+    ml_service = MLService(model_path, micro_batch_size=batch_size, micro_batch_wait_us=wait_us)
+
+    def timed(t):
+        start = time.perf_counter()
+        ml_service.score(t)
+        return time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        latencies = list(pool.map(timed, transactions))
+    elapsed = time.perf_counter() - start
+    ml_service.close()
+
+    return {
+        "threads": threads,
+        "rows_per_sec": round(len(transactions) / elapsed, 1),
+        "avg_batch": round(ml_service.batcher.items / max(ml_service.batcher.batches, 1), 1),
+        **percentiles(latencies),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark MLService scoring paths")
+    parser.add_argument("--model", default=MODEL_PATH)
+    parser.add_argument("--data", default=DATA_FILE)
+    parser.add_argument("--rows", type=int, default=2000)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[64, 512])
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--micro-batch-size", type=int, default=32)
+    parser.add_argument("--micro-batch-wait-us", type=int, default=200)
+    args = parser.parse_args(argv)
+
+    ml_service = MLService(args.model)
+    transactions = pd.read_csv(args.data, nrows=args.rows).to_dict("records")
+
+    # Warm up both paths
+    for t in transactions[:50]:
+        legacy_score(ml_service, t)
+        ml_service.score(t)
+
+    print(f"\n⏱️ Single transaction ({len(transactions)} calls):")
+    for path, stats in bench_single(ml_service, transactions).items():
+        print(f"  {path:<10} p50={stats['p50_us']:>9.1f}µs  p99={stats['p99_us']:>9.1f}µs")
+
+    print("\n📦 Bulk throughput:")
+    for name, rate in bench_bulk(ml_service, transactions, args.batch_sizes).items():
+        print(f"  {name:<32} {rate:>12,.1f}")
+
+    print("\n🧵 Micro-batched concurrent score:")
+    stats = bench_micro_batch(
+        args.model, transactions, args.threads, args.micro_batch_size, args.micro_batch_wait_us
+    )
+    print(f"  threads={stats['threads']} rows/sec={stats['rows_per_sec']:,.1f} "
+          f"avg_batch={stats['avg_batch']} p50={stats['p50_us']}µs p99={stats['p99_us']}µs")
+
+
+if __name__ == "__main__":
+    main()
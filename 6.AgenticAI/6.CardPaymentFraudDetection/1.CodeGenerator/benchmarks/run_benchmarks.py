@@ -0,0 +1,281 @@
+"""
+Fraud Run-time Benchmark Suite
+------------------------------
+
+Sweeps:
+- RuleService.evaluate       : rule book size (10 → 10k synthetic rules) x transaction sparsity
+- RuleService.evaluate_batch : batch size
+- MLService.score / score_batch : single call and batch size          (needs --model)
+- FraudDecisionEngine.evaluate  : real rule book + model              (needs --model)
+
+Transactions are rows from taining_data/sample_data_generator.py.
+
+Results are written as JSON (`--output`). With a stored baseline the run
+fails (exit code 1) when any case regresses past `--tolerance`:
+- p50_us / p99_us       higher than baseline x (1 + tolerance)
+- throughput            lower than baseline x (1 - tolerance)
+
+Usage (from 1.CodeGenerator/):
+    python -m benchmarks.run_benchmarks --model artifacts/model/fraud_xgboost_model.joblib \
+        --output bench_results.json --baseline benchmarks/baseline.json
+    python -m benchmarks.run_benchmarks ... --update-baseline
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from run_time.rule_engine.rule_loader import RuleLoader
+from run_time.rule_engine.rule_service import RuleService
+from run_time.ml_engine.fraud_detection_service_using_ml import MLService
+from run_time.decision_engine.fraud_decision_engine import FraudDecisionEngine
+from taining_data import sample_data_generator as generator
+
+# --------------------------------------------------
+# CONFIGURATION
+# --------------------------------------------------
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+RULE_BOOK_PATH = os.path.join(BASE_DIR, "artifacts", "rule_book.json")
+BASELINE_FILE = os.path.join(BASE_DIR, "benchmarks", "baseline.json")
+
+RULE_BOOK_SIZES = [10, 100, 1_000, 10_000]
+SPARSITY = [1.0, 0.3, 0.1]  # share of features present per transaction
+BATCH_SIZES = [1, 64, 1_024, 16_384]
+
+TOLERANCE = 0.2
+LATENCY_METRICS = ["p50_us", "p99_us"]
+THROUGHPUT_METRICS = ["throughput"]
+
+SEED = 42
+
+# --------------------------------------------------
+# DATA
+# --------------------------------------------------
+
+def generate_rows(n, fraud_rate=generator.FRAUD_RATE, seed=SEED):
+    random.seed(seed)
+    rows = [
+        generator.generate_fraud(i) if random.random() < fraud_rate else generator.generate_genuine(i)
+        for i in range(n)
+    ]
+    for row in rows:
+        row.pop("transaction_id")
+        row.pop("label")
+    return rows
+
+
+def sparsify(rows, keep, seed=SEED):
+    if keep >= 1.0:
+        return rows
+    rng = random.Random(seed)
+    return [{k: v for k, v in row.items() if rng.random() < keep} for row in rows]
+
+
+def synthetic_rules(n, rows, seed=SEED):
+    """Threshold rules over the generator's features, at realistic quantiles."""
+    rng = random.Random(seed)
+    df = pd.DataFrame(rows)
+    rules = []
+
+    for i in range(n):
+        feature = rng.choice(list(df.columns))
+        column = df[feature]
+
+        if column.dtype == bool:
+            condition = f"{feature} == {rng.choice(['true', 'false'])}"
+        elif rng.random() < 0.5:
+            condition = f"{feature} > {column.quantile(rng.uniform(0.9, 0.999)):.4g}"
+        else:
+            condition = f"{feature} < {column.quantile(rng.uniform(0.001, 0.1)):.4g}"
+
+        rules.append({
+            "rule_id": f"synthetic_{i}",
+            "use_case": f"Synthetic rule {i}",
+            "primary_feature": feature,
+            "condition": condition,
+            "action": rng.choice(["DECLINE", "STEP_UP", "MONITOR"]),
+        })
+
+    return rules
+
+# --------------------------------------------------
+# MEASUREMENT
+# --------------------------------------------------
+
+def measure(fn, items, warmup=20):
+    """Per-call latency percentiles + calls/second."""
+    for item in items[:warmup]:
+        fn(item)
+
+    latencies = np.empty(len(items))
+    start = time.perf_counter()
+    for i, item in enumerate(items):
+        t0 = time.perf_counter()
+        fn(item)
+        latencies[i] = time.perf_counter() - t0
+    elapsed = time.perf_counter() - start
+
+    us = latencies * 1e6
+    return {
+        "p50_us": round(float(np.percentile(us, 50)), 2),
+        "p99_us": round(float(np.percentile(us, 99)), 2),
+        "throughput": round(len(items) / elapsed, 1),
+    }
+
+
+def measure_batches(fn, batches, batch_size):
+    """Per-batch latency percentiles + rows/second."""
+    result = measure(fn, batches, warmup=1)
+    result["throughput"] = round(result["throughput"] * batch_size, 1)
+    return result
+
+
+def batches_of(rows, batch_size, n_batches=None):
+    """~20k rows worth of batches (at least 3, at most 200)."""
+    if n_batches is None:
+        n_batches = min(200, max(3, 20_000 // batch_size))
+    return [
+        [rows[(b * batch_size + j) % len(rows)] for j in range(batch_size)]
+        for b in range(n_batches)
+    ]
+
+# --------------------------------------------------
+# SUITE
+# --------------------------------------------------
+
+def run_suite(model_path=None, rows=5_000, rule_sizes=RULE_BOOK_SIZES,
+              sparsity=SPARSITY, batch_sizes=BATCH_SIZES):
+    results = {}
+    transactions = generate_rows(rows)
+
+    print("\n📏 RuleService.evaluate")
+    for size in rule_sizes:
+        service = RuleService(synthetic_rules(size, transactions))
+        for keep in sparsity:
+            name = f"rules.evaluate[rules={size},sparsity={keep}]"
+            results[name] = measure(service.evaluate, sparsify(transactions, keep))
+            print(f"  {name:<50} {results[name]}")
+
+    print("\n📏 RuleService.evaluate_batch")
+    service = RuleService(synthetic_rules(100, transactions))
+    for size in batch_sizes:
+        name = f"rules.evaluate_batch[rules=100,batch={size}]"
+        frames = [pd.DataFrame(b) for b in batches_of(transactions, size)]
+        results[name] = measure_batches(service.evaluate_batch, frames, size)
+        print(f"  {name:<50} {results[name]}")
+
+    if model_path:
+        ml_service = MLService(model_path)
+
+        print("\n📏 MLService")
+        for keep in sparsity:
+            name = f"ml.score[sparsity={keep}]"
+            results[name] = measure(ml_service.score, sparsify(transactions, keep))
+            print(f"  {name:<50} {results[name]}")
+
+        for size in batch_sizes:
+            name = f"ml.score_batch[batch={size}]"
+            batches = batches_of(transactions, size)
+            results[name] = measure_batches(ml_service.score_batch, batches, size)
+            print(f"  {name:<50} {results[name]}")
+
+        print("\n📏 FraudDecisionEngine.evaluate")
+        engine = FraudDecisionEngine(RuleService(RuleLoader.load_rules(RULE_BOOK_PATH)), ml_service)
+        for keep in sparsity:
+            name = f"engine.evaluate[sparsity={keep}]"
+            results[name] = measure(engine.evaluate, sparsify(transactions, keep))
+            print(f"  {name:<50} {results[name]}")
+
+    return results
+
+# --------------------------------------------------
+# REGRESSION GATE
+# --------------------------------------------------
+
+def compare(results, baseline, tolerance=TOLERANCE):
+    """List of regressions of `results` against `baseline` (cases missing from either side are skipped)."""
+    regressions = []
+
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            continue
+
+        for metric in LATENCY_METRICS:
+            if metric in previous and current[metric] > previous[metric] * (1 + tolerance):
+                regressions.append((name, metric, previous[metric], current[metric]))
+
+        for metric in THROUGHPUT_METRICS:
+            if metric in previous and current[metric] < previous[metric] * (1 - tolerance):
+                regressions.append((name, metric, previous[metric], current[metric]))
+
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fraud run-time benchmark suite")
+    parser.add_argument("--model", help="XGBoost model (.joblib); ML and engine cases are skipped without it")
+    parser.add_argument("--rows", type=int, default=5_000)
+    parser.add_argument("--rule-sizes", type=int, nargs="+", default=RULE_BOOK_SIZES)
+    parser.add_argument("--sparsity", type=float, nargs="+", default=SPARSITY)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=BATCH_SIZES)
+    parser.add_argument("--output", help="Write results JSON here")
+    parser.add_argument("--baseline", default=BASELINE_FILE)
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE)
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args(argv)
+
+    results = run_suite(args.model, args.rows, args.rule_sizes, args.sparsity, args.batch_sizes)
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "processor": platform.processor(),
+            "rows": args.rows,
+        },
+        "results": results,
+    }
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n💾 Results saved to {args.output}")
+
+    if args.update_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"💾 Baseline updated: {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"\n⚠️ No baseline at {args.baseline}, skipping regression gate")
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)["results"]
+
+    regressions = compare(results, baseline, args.tolerance)
+    if not regressions:
+        print(f"\n✅ No regressions beyond {args.tolerance:.0%}")
+        return 0
+
+    print(f"\n❌ {len(regressions)} regression(s) beyond {args.tolerance:.0%}:")
+    for name, metric, previous, current in regressions:
+        print(f"  {name:<50} {metric:<11} {previous:>12} → {current}")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,119 @@
+"""
+Training Pipeline Benchmark
+---------------------------
+
+Wall time and peak RSS of:
+- legacy           : fraud_detection_model_build.py (whole-file read_csv,
+                     64-bit dtypes, preprocess copy, train_test_split)
+- quantile         : training_pipeline.train, in-memory QuantileDMatrix
+- external_memory  : training_pipeline.train, ExtMemQuantileDMatrix
+
+Each run happens in a fresh process so peak RSS is its own.
+
+Usage (from 1.CodeGenerator/):
+    python -m benchmarks.training_benchmark --data taining_data/rule_compatible_fraud_data.csv
+"""
+
+import argparse
+import json
+import multiprocessing
+import time
+
+import pandas as pd
+import xgboost as xgb
+from sklearn.metrics import roc_auc_score
+from sklearn.model_selection import train_test_split
+
+from run_time.ml_engine import training_pipeline as pipeline
+
+PATHS = ["legacy", "quantile", "external_memory"]
+
+# --------------------------------------------------
+# PATHS
+# --------------------------------------------------
+
+def legacy_train(data_path, num_boost_round):
+    """The fraud_detection_model_build.py steps, kept as the baseline."""
+    start = time.perf_counter()
+
+    df = pd.read_csv(data_path)
+    X = df.drop(columns=[pipeline.TARGET_COL]).copy()
+    X.drop(columns=[c for c in pipeline.ID_COLS if c in X.columns], inplace=True)
+    for col in X.select_dtypes(include=["bool"]).columns:
+        X[col] = X[col].astype(int)
+    X.fillna(0, inplace=True)
+    y = df[pipeline.TARGET_COL]
+
+    X_train, X_val, y_train, y_val = train_test_split(
+        X, y, test_size=pipeline.TEST_SIZE, stratify=y, random_state=pipeline.RANDOM_STATE
+    )
+
+    model = xgb.XGBClassifier(
+        objective="binary:logistic",
+        eval_metric="auc",
+        n_estimators=num_boost_round,
+        max_depth=7,
+        learning_rate=0.05,
+        subsample=0.8,
+        colsample_bytree=0.8,
+        scale_pos_weight=(len(y) - y.sum()) / y.sum(),
+        tree_method="hist",
+        random_state=pipeline.RANDOM_STATE
+    )
+    model.fit(X_train, y_train, eval_set=[(X_val, y_val)], verbose=False)
+    auc = roc_auc_score(y_val, model.predict_proba(X_val)[:, 1])
+
+    return {
+        "rows": len(df),
+        "auc": round(float(auc), 6),
+        "wall_seconds": round(time.perf_counter() - start, 2),
+        "peak_rss_mb": round(pipeline.peak_rss_mb(), 1),
+    }
+
+
+def _run(path, data_path, num_boost_round, queue):
+    if path == "legacy":
+        report = legacy_train(data_path, num_boost_round)
+    else:
+        _, report = pipeline.train(
+            data_path, num_boost_round=num_boost_round,
+            external_memory=path == "external_memory", verbose=False
+        )
+    queue.put(report)
+
+
+def run(path, data_path, num_boost_round):
+    ctx = multiprocessing.get_context("spawn")
+    queue = ctx.Queue()
+    process = ctx.Process(target=_run, args=(path, data_path, num_boost_round, queue))
+    process.start()
+    report = queue.get()
+    process.join()
+    return report
+
+# --------------------------------------------------
+# MAIN
+# --------------------------------------------------
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Training pipeline wall time / peak RSS benchmark")
+    parser.add_argument("--data", required=True, help="CSV training file")
+    parser.add_argument("--rounds", type=int, default=pipeline.NUM_BOOST_ROUND)
+    parser.add_argument("--paths", nargs="+", choices=PATHS, default=PATHS)
+    parser.add_argument("--output", help="Write results JSON here")
+    args = parser.parse_args(argv)
+
+    results = {}
+    print(f"\n{'path':<18} {'rows':>10} {'auc':>9} {'wall s':>9} {'peak MB':>9}")
+    for path in args.paths:
+        r = results[path] = run(path, args.data, args.rounds)
+        print(f"{path:<18} {r['rows']:>10} {r['auc']:>9.4f} {r['wall_seconds']:>9} {r['peak_rss_mb']:>9}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\n💾 Results saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Velocity Feature Engine Benchmark
+---------------------------------
+
+Replays the synthetic generator's rows through VelocityFeatureEngine.
+The generator has no card / time / amount columns, so each row gets:
+- card_id   : Zipf-distributed over --cards cards (a few very busy cards)
+- timestamp : Poisson arrivals at --rate transactions/second
+- amount    : lognormal base amount x the row's amount_spike_ratio
+
+Reports updates/second, per-update p50/p99, slab memory and evictions.
+
+Usage (from 1.CodeGenerator/):
+    python -m benchmarks.velocity_feature_benchmark --rows 1000000 --cards 2000000
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from run_time.feature_engine.velocity_features import VelocityFeatureEngine
+from benchmarks.ml_service_benchmark import DATA_FILE, percentiles
+
+
+def replay_stream(data_path, rows, cards, rate, seed=42):
+    df = pd.read_csv(data_path, nrows=rows, usecols=["amount_spike_ratio"])
+    rng = np.random.default_rng(seed)
+    n = len(df)
+
+    card_ids = (rng.zipf(1.3, n) - 1) % cards
+    timestamps = 1_700_000_000 + np.cumsum(rng.exponential(1 / rate, n))
+    amounts = rng.lognormal(3.5, 1.0, n) * df["amount_spike_ratio"].to_numpy()
+
+    return card_ids.tolist(), timestamps.tolist(), amounts.tolist()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the streaming velocity feature engine")
+    parser.add_argument("--data", default=DATA_FILE)
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--cards", type=int, default=100_000)
+    parser.add_argument("--rate", type=float, default=2_000, help="transactions per second")
+    parser.add_argument("--capacity", type=int, default=None, help="defaults to --cards")
+    args = parser.parse_args(argv)
+
+    card_ids, timestamps, amounts = replay_stream(args.data, args.rows, args.cards, args.rate)
+    engine = VelocityFeatureEngine(capacity=args.capacity or args.cards)
+
+    latencies = np.empty(len(card_ids))
+    start = time.perf_counter()
+    for i, (card_id, ts, amount) in enumerate(zip(card_ids, timestamps, amounts)):
+        t0 = time.perf_counter()
+        engine.update(card_id, ts, amount)
+        latencies[i] = time.perf_counter() - t0
+    elapsed = time.perf_counter() - start
+
+    stats = percentiles(latencies)
+    print(f"\n⚡ Updates: {len(card_ids):,}  updates/sec: {len(card_ids) / elapsed:,.0f}")
+    print(f"⏱️ p50={stats['p50_us']}µs  p99={stats['p99_us']}µs")
+    print(f"💳 Active cards: {len(engine):,}  evictions: {engine.evictions:,}")
+    print(f"🧠 Slab memory: {engine.nbytes / 1e6:,.1f} MB "
+          f"({engine.nbytes / engine.capacity:,.0f} bytes/card)")
+
+
+if __name__ == "__main__":
+    main()
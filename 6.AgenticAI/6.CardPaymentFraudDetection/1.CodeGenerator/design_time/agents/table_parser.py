@@ -0,0 +1,64 @@
+"""
+Deterministic markdown / CSV table parser for tabular_to_json_agent.
+No design-time imports, so it runs (and is tested) without the graph or an LLM.
+"""
+
+import csv
+import re
+
+IGNORED_COLUMNS = {"sr.", "sr", "sr no", "sr. no.", "#"}
+
+# Cell boundaries: pipes not escaped as \|
+CELL_SPLIT = re.compile(r"(?<!\\)\|")
+SEPARATOR_CELL = re.compile(r"^:?-+:?$")
+
+
+def _markdown_cells(line: str):
+    line = line.strip()
+    if line.startswith("|"):
+        line = line[1:]
+    if line.endswith("|") and not line.endswith("\\|"):
+        line = line[:-1]
+    return [cell.strip().replace("\\|", "|") for cell in CELL_SPLIT.split(line)]
+
+
+def _rows(lines):
+    """Cells of every non-empty line; markdown pipe table or CSV, by the header line."""
+    lines = (line for line in lines if line.strip())
+    header = next(lines, None)
+    if header is None:
+        return
+    if "|" in header:
+        yield _markdown_cells(header)
+        for line in lines:
+            cells = _markdown_cells(line)
+            if all(SEPARATOR_CELL.match(cell) for cell in cells):
+                continue
+            yield cells
+    else:
+        yield from csv.reader([header])
+        for cells in csv.reader(lines):
+            yield [cell.strip() for cell in cells]
+
+
+def parse_table(text: str):
+    """
+    Rows of a markdown / CSV table as dicts keyed by the trimmed headers,
+    values trimmed and otherwise unchanged, 'Sr.' columns dropped.
+    Raises ValueError on a malformed table (no rows, ragged rows, blank or duplicate headers).
+    """
+    rows = _rows(text.splitlines())
+    header = [cell.strip() for cell in next(rows, [])]
+    if not header or "" in header or len(set(header)) != len(header):
+        raise ValueError(f"Malformed table header: {header}")
+    keep = [j for j, name in enumerate(header) if name.lower() not in IGNORED_COLUMNS]
+
+    records = []
+    for line_no, cells in enumerate(rows, start=2):
+        if len(cells) != len(header):
+            raise ValueError(f"Row {line_no} has {len(cells)} cells, header has {len(header)}")
+        records.append({header[j]: cells[j] for j in keep})
+
+    if not records:
+        raise ValueError("Table has no rows")
+    return records
@@ -1,5 +1,5 @@
 from state.State import FraudRuleState
-from tools.llm import call_llm
+from agents.table_parser import parse_table
 import json
 from tools.filesystem import write_file
 
@@ -23,10 +23,18 @@ INPUT TABLE:
 """
 
 def tabular_to_json_agent(state: FraudRuleState) -> FraudRuleState:
-    response =call_llm(
-        TABLE_TO_JSON_PROMPT ,state["raw_table"]
-    )
-    # Parse LLM output safely
-    write_file("json_output.json",response, state["run_dir"])
-    state["use_cases"] = json.loads(response)
-    return state
\ No newline at end of file
+    try:
+        use_cases = parse_table(state["raw_table"])
+    except ValueError as e:
+        # Malformed table: let the LLM make sense of it
+        print(f"⚠️ {e}; falling back to the LLM")
+        from tools.llm import call_llm   # imported here so the parser path needs no OpenAI client
+
+        response = call_llm(
+            TABLE_TO_JSON_PROMPT, state["raw_table"]
+        )
+        use_cases = json.loads(response)
+
+    write_file("json_output.json", json.dumps(use_cases, indent=2), state["run_dir"])
+    state["use_cases"] = use_cases
+    return state
@@ -0,0 +1,357 @@
+"""
+Decision Audit Log
+------------------
+
+Append-only binary record of every FraudDecisionEngine decision: inputs,
+matched rule IDs, score, decision and per-stage timings.
+
+Request path:
+- `AuditLog.record` appends one tuple to a deque (atomic under the GIL,
+  no lock taken) and returns; when `capacity` records are already waiting
+  the record is counted in `dropped` instead of blocking the decision
+
+Background writer:
+- Drains the deque, encodes records and appends them to the current
+  segment file
+- fsyncs once per group (every `fsync_interval_s`), not per record
+- Rotates to a new segment after `max_segment_bytes` or `max_segment_age_s`
+
+Segment format (little-endian):
+    b"FAUD" + version byte, then entries of  <u32 length><payload>
+    payload "S": <u16 id><utf-8 string>       string table entry (feature
+                                               names, rule IDs, stage names)
+    payload "R": <f64 ts><u8 decision><u8 source><f32 score>
+                 <u16 n_inputs><u16 n_rules><u8 n_timings>
+                 inputs  : <u16 name id><u8 tag><value>  (d=f64, b=u8, s=u16 len+utf-8, n=none;
+                                                          strings cut to MAX_VALUE_BYTES)
+                 rules   : <u16 rule id string>
+                 timings : <u16 stage name id><f32 microseconds>
+
+A decision or source outside DECISIONS / SOURCES is stored as UNKNOWN_CODE
+and read back as UNKNOWN. A record that fails to encode is dropped whole
+(counted in `dropped`, error in `last_error`) before anything of it, string
+table entries included, is written. A torn record at the end of a segment
+(crash mid-write) is skipped by the reader. `read_audit_log` / `iter_audit_frames` stream segments back
+as DataFrames.
+"""
+
+import os
+import struct
+import threading
+import time
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+# --------------------------------------------------
+# CONFIGURATION
+# --------------------------------------------------
+
+MAGIC = b"FAUD\x01"
+SEGMENT_SUFFIX = ".seg"
+
+CAPACITY = 100_000
+MAX_SEGMENT_BYTES = 64 * 1024 * 1024
+MAX_SEGMENT_AGE_S = 3600
+FSYNC_INTERVAL_S = 0.05
+POLL_INTERVAL_S = 0.002
+
+DECISIONS = ["APPROVE", "STEP_UP", "DECLINE"]
+SOURCES = ["RULE_ENGINE", "RULE_ENGINE + ML", "ML"]
+UNKNOWN_CODE = 255
+UNKNOWN = "UNKNOWN"
+MAX_VALUE_BYTES = 0xFFFF
+
+_LENGTH = struct.Struct("<I")
+_STRING = struct.Struct("<cH")
+_HEADER = struct.Struct("<cdBBfHHB")
+_INPUT = struct.Struct("<Hc")
+_F64 = struct.Struct("<d")
+_U16 = struct.Struct("<H")
+_TIMING = struct.Struct("<Hf")
+
+# --------------------------------------------------
+# WRITER
+# --------------------------------------------------
+
+class AuditLog:
+    def __init__(self, directory, capacity=CAPACITY, max_segment_bytes=MAX_SEGMENT_BYTES,
+                 max_segment_age_s=MAX_SEGMENT_AGE_S, fsync_interval_s=FSYNC_INTERVAL_S):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.capacity = capacity
+        self.max_segment_bytes = max_segment_bytes
+        self.max_segment_age_s = max_segment_age_s
+        self.fsync_interval_s = fsync_interval_s
+
+        self.written = 0
+        self.dropped = 0
+        self.segments = 0
+        self.last_error = None
+
+        self._queue = deque()
+        self._closing = threading.Event()
+        self._file = None
+        self._strings = {}
+        self._segment_bytes = 0
+        self._segment_opened = 0.0
+        self._thread = threading.Thread(target=self._run, name="audit-log-writer", daemon=True)
+        self._thread.start()
+
+    def record(self, transaction, result, rule_ids=(), timings=None):
+        """Queue one decision; never blocks. Returns False if the record was dropped."""
+        if len(self._queue) >= self.capacity:
+            self.dropped += 1
+            return False
+        self._queue.append((time.time(), dict(transaction), result, tuple(rule_ids), timings or {}))
+        return True
+
+    def close(self):
+        """Write everything queued, fsync and stop the writer."""
+        self._closing.set()
+        self._thread.join()
+
+    def stats(self):
+        return {
+            "written": self.written,
+            "dropped": self.dropped,
+            "queued": len(self._queue),
+            "segments": self.segments,
+        }
+
+    # --------------------------------------------------
+    # BACKGROUND WRITER
+    # --------------------------------------------------
+
+    def _run(self):
+        last_sync = time.monotonic()
+        dirty = False
+
+        while True:
+            closing = self._closing.is_set()
+            wrote = False
+
+            while self._queue:
+                entry = self._queue.popleft()
+                try:
+                    self._write(entry)
+                    wrote = dirty = True
+                except (OSError, ValueError, struct.error) as e:
+                    self.last_error = e
+                    self.dropped += 1
+
+            now = time.monotonic()
+            if dirty and (closing or now - last_sync >= self.fsync_interval_s):
+                self._sync()
+                last_sync, dirty = now, False
+
+            if closing:
+                self._close_segment()
+                return
+            if not wrote:
+                time.sleep(POLL_INTERVAL_S)
+
+    def _write(self, entry):
+        if self._file is None or self._should_rotate():
+            self._open_segment()
+
+        table, payload, new_strings = self._encode(*entry)
+        # String table entries precede the record that uses them
+        data = table + _LENGTH.pack(len(payload)) + payload
+        self._file.write(data)
+        self._strings.update(new_strings)
+        self._segment_bytes += len(data)
+        self.written += 1
+
+    def _should_rotate(self):
+        return (
+            self._segment_bytes >= self.max_segment_bytes
+            or time.monotonic() - self._segment_opened >= self.max_segment_age_s
+        )
+
+    def _open_segment(self):
+        self._close_segment()
+        name = f"audit-{time.time_ns()}-{self.segments:06d}{SEGMENT_SUFFIX}"
+        self._file = open(os.path.join(self.directory, name), "ab", buffering=1024 * 1024)
+        self._file.write(MAGIC)
+        self._strings = {}
+        self._segment_bytes = len(MAGIC)
+        self._segment_opened = time.monotonic()
+        self.segments += 1
+
+    def _close_segment(self):
+        if self._file is not None:
+            self._sync()
+            self._file.close()
+            self._file = None
+
+    def _sync(self):
+        if self._file is not None:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    # --------------------------------------------------
+    # ENCODING
+    # --------------------------------------------------
+
+    def _string_id(self, value, new_strings, out):
+        """
+        Segment-local id of `value`. A string seen for the first time gets its
+        table entry in `out` and its id in `new_strings`, both committed only
+        once the whole record has encoded.
+        """
+        string_id = self._strings.get(value)
+        if string_id is None:
+            string_id = new_strings.get(value)
+        if string_id is None:
+            string_id = new_strings[value] = len(self._strings) + len(new_strings)
+            data = _STRING.pack(b"S", string_id) + str(value).encode("utf-8")
+            out.append(_LENGTH.pack(len(data)) + data)
+        return string_id
+
+    def _encode(self, ts, transaction, result, rule_ids, timings):
+        """(string table entries, record payload, new string ids); writes nothing."""
+        new_strings = {}
+        strings = []
+        body = []
+
+        for name, value in transaction.items():
+            name_id = self._string_id(name, new_strings, strings)
+            if value is None:
+                body.append(_INPUT.pack(name_id, b"n"))
+            elif isinstance(value, (bool, np.bool_)):
+                body.append(_INPUT.pack(name_id, b"b") + bytes([bool(value)]))
+            elif isinstance(value, (int, float, np.integer, np.floating)):
+                body.append(_INPUT.pack(name_id, b"d") + _F64.pack(float(value)))
+            else:
+                data = str(value).encode("utf-8")
+                if len(data) > MAX_VALUE_BYTES:
+                    data = data[:MAX_VALUE_BYTES].decode("utf-8", "ignore").encode("utf-8")
+                body.append(_INPUT.pack(name_id, b"s") + _U16.pack(len(data)) + data)
+
+        for rule_id in rule_ids:
+            body.append(_U16.pack(self._string_id(rule_id, new_strings, strings)))
+
+        for stage, micros in timings.items():
+            body.append(_TIMING.pack(self._string_id(stage, new_strings, strings), micros))
+
+        score = result.get("fraud_score", result.get("score"))
+        header = _HEADER.pack(
+            b"R", ts,
+            _code(DECISIONS, result.get("decision")),
+            _code(SOURCES, result.get("source", "RULE_ENGINE")),
+            np.nan if score is None else score,
+            len(transaction), len(rule_ids), len(timings),
+        )
+        return b"".join(strings), header + b"".join(body), new_strings
+
+
+def _code(labels, value):
+    try:
+        return labels.index(value)
+    except ValueError:
+        return UNKNOWN_CODE
+
+# --------------------------------------------------
+# READER
+# --------------------------------------------------
+
+def segment_files(directory):
+    return sorted(
+        os.path.join(directory, f) for f in os.listdir(directory) if f.endswith(SEGMENT_SUFFIX)
+    )
+
+
+def _decode_record(payload, strings):
+    (_, ts, decision, source, score, n_inputs, n_rules, n_timings) = _HEADER.unpack_from(payload)
+    record = {
+        "ts": ts,
+        "decision": DECISIONS[decision] if decision < len(DECISIONS) else UNKNOWN,
+        "source": SOURCES[source] if source < len(SOURCES) else UNKNOWN,
+        "score": score if np.isnan(score) else round(float(score), 4),
+    }
+    pos = _HEADER.size
+
+    inputs = {}
+    for _ in range(n_inputs):
+        name_id, tag = _INPUT.unpack_from(payload, pos)
+        pos += _INPUT.size
+        if tag == b"d":
+            value = _F64.unpack_from(payload, pos)[0]
+            pos += _F64.size
+        elif tag == b"b":
+            value = bool(payload[pos])
+            pos += 1
+        elif tag == b"s":
+            length = _U16.unpack_from(payload, pos)[0]
+            pos += _U16.size
+            value = payload[pos:pos + length].decode("utf-8")
+            pos += length
+        else:
+            value = None
+        inputs[strings[name_id]] = value
+
+    rule_ids = []
+    for _ in range(n_rules):
+        rule_ids.append(strings[_U16.unpack_from(payload, pos)[0]])
+        pos += _U16.size
+    record["rule_ids"] = rule_ids
+
+    for _ in range(n_timings):
+        stage_id, micros = _TIMING.unpack_from(payload, pos)
+        pos += _TIMING.size
+        record[f"t_{strings[stage_id]}_us"] = round(float(micros), 1)
+
+    record["inputs"] = inputs
+    return record
+
+
+def iter_records(directory):
+    """Every decision record, oldest segment first."""
+    for path in segment_files(directory):
+        with open(path, "rb") as f:
+            data = f.read()
+        if not data.startswith(MAGIC):
+            continue
+
+        strings = {}
+        pos = len(MAGIC)
+        while pos + _LENGTH.size <= len(data):
+            length = _LENGTH.unpack_from(data, pos)[0]
+            start, end = pos + _LENGTH.size, pos + _LENGTH.size + length
+            if end > len(data):
+                break  # torn write at the end of the segment
+            payload = data[start:end]
+            pos = end
+
+            if payload[:1] == b"S":
+                string_id = _U16.unpack_from(payload, 1)[0]
+                strings[string_id] = payload[_STRING.size:].decode("utf-8")
+            elif payload[:1] == b"R":
+                yield _decode_record(payload, strings)
+
+
+def _frame(records):
+    rows = []
+    for record in records:
+        inputs = record.pop("inputs")
+        rows.append({**record, **inputs})
+    return pd.DataFrame(rows)
+
+
+def iter_audit_frames(directory, chunk_rows=100_000):
+    """DataFrames of at most `chunk_rows` decisions (one column per input feature)."""
+    chunk = []
+    for record in iter_records(directory):
+        chunk.append(record)
+        if len(chunk) == chunk_rows:
+            yield _frame(chunk)
+            chunk = []
+    if chunk:
+        yield _frame(chunk)
+
+
+def read_audit_log(directory) -> pd.DataFrame:
+    frames = list(iter_audit_frames(directory))
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
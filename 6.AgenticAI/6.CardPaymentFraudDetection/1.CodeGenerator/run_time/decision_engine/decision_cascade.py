@@ -0,0 +1,88 @@
+"""
+Cost-aware Decision Cascade
+---------------------------
+
+Splits the FraudDecisionEngine work into cheap-to-expensive stages, each
+with an exit condition:
+
+1. hot_rules       : small set of high-hit DECLINE rules → exit on DECLINE
+2. rules           : every other rule                   → exit on DECLINE
+3. trusted_profile : rules APPROVE and a trusted low-risk
+                     profile matches                    → exit APPROVE, skip ML
+4. ml              : model score, combined as before
+
+Stages 1-2 never change a decision (any DECLINE rule declines) nor its
+reasons: a hot DECLINE is reported only once no DECLINE rule ahead of it
+in the rule book matches, so the declining rule is the first one in file
+order, as in a single pass. Stage 3 is opt-in: only profiles you
+configure skip the model.
+"""
+
+from run_time.rule_engine.rule_compiler import RuleCompiler
+from run_time.rule_engine.rule_service import RuleService
+
+STAGES = ["hot_rules", "rules", "trusted_profile", "ml"]
+
+
+class DecisionCascade:
+    def __init__(self, rules, hot_rule_ids=(), trusted_profiles=()):
+        """
+        hot_rule_ids     : rule_ids evaluated first (see `hot_rule_ids_from_backtest`)
+        trusted_profiles : [{"name": ..., "condition": "card_age_days > 1000 and ..."}]
+        """
+        hot = {str(rule_id) for rule_id in hot_rule_ids}
+        self.hot_service = RuleService([r for r in rules if str(r["rule_id"]) in hot])
+        self.rest_service = RuleService([r for r in rules if str(r["rule_id"]) not in hot])
+        self._file_order = {id(r): i for i, r in enumerate(rules)}
+
+        # Per hot DECLINE rule: the other DECLINE rules ahead of it in the rule book
+        self._earlier_declines = {}
+        for i, rule in enumerate(rules):
+            if str(rule["rule_id"]) in hot and rule["action"] == "DECLINE":
+                self._earlier_declines[id(rule)] = RuleService([
+                    r for r in rules[:i] if r["action"] == "DECLINE" and str(r["rule_id"]) not in hot
+                ])
+
+        self.trusted_profiles = [
+            (p["name"], RuleCompiler.compile_rule({"rule_id": p["name"], **p}))
+            for p in trusted_profiles
+        ]
+
+    def evaluate_rules(self, transaction):
+        """Returns (rule_result, exit_stage); exit_stage is None if the rules did not decline."""
+        hot_result = self.hot_service.evaluate(transaction)
+        if hot_result["decision"] == "DECLINE":
+            earlier = self._earlier_declines[id(hot_result["matched_rules"][0])].evaluate(transaction)
+            if earlier["decision"] == "DECLINE":
+                return earlier, "hot_rules"
+            return hot_result, "hot_rules"
+
+        rest_result = self.rest_service.evaluate(transaction)
+        if rest_result["decision"] == "DECLINE":
+            return rest_result, "rules"
+
+        matched_rules = sorted(
+            hot_result["matched_rules"] + rest_result["matched_rules"],
+            key=lambda r: self._file_order[id(r)]
+        )
+        decision = "STEP_UP" if "STEP_UP" in (hot_result["decision"], rest_result["decision"]) else "APPROVE"
+
+        return {
+            "decision": decision,
+            "matched_rules": matched_rules,
+            "source": "RULE_ENGINE"
+        }, None
+
+    def trusted_profile(self, transaction):
+        """Name of the first matching trusted low-risk profile, or None."""
+        for name, condition in self.trusted_profiles:
+            if condition(transaction):
+                return name
+        return None
+
+    @staticmethod
+    def hot_rule_ids_from_backtest(report, top_n=10):
+        """DECLINE rules with the most hits in a `backtest.rule_model_backtest` report."""
+        declines = [r for r in report["rule_hits"] if r["action"] == "DECLINE" and r["hits"]]
+        declines.sort(key=lambda r: r["hits"], reverse=True)
+        return [r["rule_id"] for r in declines[:top_n]]
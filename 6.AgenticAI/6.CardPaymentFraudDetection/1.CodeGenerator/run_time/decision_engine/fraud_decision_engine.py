@@ -1,31 +1,180 @@
+import time
+from collections import Counter
+
+import numpy as np
+
+from run_time.decision_engine.decision_cascade import DecisionCascade, STAGES
+from run_time.feature_engine.transaction_schema import TransactionBatch
+
+
 class FraudDecisionEngine:
-    def __init__(self, rule_service, ml_service):
+    def __init__(self, rule_service, ml_service, hot_rule_ids=(), trusted_profiles=(),
+                 explainer=None, audit_log=None, shadow=None, metrics=None):
         self.rule_service = rule_service
         self.ml_service = ml_service
 
+        # Optional per-stage latency histograms (see latency_metrics.py)
+        self.metrics = metrics
+
+        # Optional non-blocking decision audit trail (see audit_log.py)
+        self.audit_log = audit_log
+
+        # Optional candidate engine fed a sample of traffic (see shadow_mode.py)
+        self.shadow = shadow
+
+        # Optional ML reason codes on STEP_UP / DECLINE (see reason_codes.py)
+        self.explainer = explainer
+
+        # Optional cost-aware cascade (see decision_cascade.py)
+        self.cascade = None
+        if hot_rule_ids or trusted_profiles:
+            self._cascade_config = (hot_rule_ids, trusted_profiles)
+            self.cascade = DecisionCascade(rule_service.rules, hot_rule_ids, trusted_profiles)
+            # Rebuild on rule book hot reload
+            rule_service.add_listener(self._rebuild_cascade)
+        self._attach_metrics()
+
+        # How many evaluations exited at each stage
+        self.stage_exits = Counter()
+
     def evaluate(self, transaction):
+        shadowed = self.shadow is not None and self.shadow.sample()
+        if self.audit_log is None and self.metrics is None and not shadowed:
+            return self._evaluate(transaction, None)[0]
+
+        timings = {}
+        start = time.perf_counter()
+        result, rule_result = self._evaluate(transaction, timings)
+        timings["total"] = (time.perf_counter() - start) * 1e6
+
+        if self.metrics is not None:
+            for stage, us in timings.items():
+                self.metrics.record(f"engine.{stage}", int(us * 1e3))
+        if self.audit_log is not None:
+            rule_ids = [r["rule_id"] for r in rule_result.get("matched_rules", [])]
+            self.audit_log.record(transaction, result, rule_ids, timings)
+        if shadowed:
+            self.shadow.submit(transaction, result, timings["total"])
+        return result
+
+    def _evaluate(self, transaction, timings):
+        """(decision dict, rule result); fills `timings` (µs per stage) when given."""
+        t0 = time.perf_counter() if timings is not None else 0.0
+
         # 1️⃣ Rules first
-        rule_result = self.rule_service.evaluate(transaction)
+        if self.cascade is not None:
+            rule_result, exit_stage = self.cascade.evaluate_rules(transaction)
+        else:
+            rule_result = self.rule_service.evaluate(transaction)
+            exit_stage = "rules" if rule_result["decision"] == "DECLINE" else None
+
+        if timings is not None:
+            timings["rules"] = (time.perf_counter() - t0) * 1e6
 
-        if rule_result["decision"] == "DECLINE":
+        if exit_stage is not None:
+            self.stage_exits[exit_stage] += 1
             return {
                 "decision": "DECLINE",
                 "reasons": self._rule_reasons(rule_result),
                 "source": "RULE_ENGINE"
-            }
+            }, rule_result
+
+        # Trusted low-risk profile → skip ML
+        if self.cascade is not None and rule_result["decision"] == "APPROVE":
+            profile = self.cascade.trusted_profile(transaction)
+            if profile is not None:
+                self.stage_exits["trusted_profile"] += 1
+                return {
+                    "decision": "APPROVE",
+                    "reasons": [],
+                    "trusted_profile": profile,
+                    "source": "RULE_ENGINE"
+                }, rule_result
 
         # 2️⃣ ML next
+        self.stage_exits["ml"] += 1
+        t0 = time.perf_counter() if timings is not None else 0.0
         ml_result = self.ml_service.score(transaction)
+        if timings is not None:
+            timings["ml"] = (time.perf_counter() - t0) * 1e6
 
+        t0 = time.perf_counter() if timings is not None else 0.0
         final_decision = self._combine(rule_result, ml_result)
+        if timings is not None:
+            timings["combine"] = (time.perf_counter() - t0) * 1e6
 
-        return {
+        result = {
             "decision": final_decision,
             "fraud_score": ml_result["score"],
             "reasons": self._rule_reasons(rule_result),
             "source": "RULE_ENGINE + ML"
         }
 
+        if self.explainer is not None and final_decision != "APPROVE":
+            t0 = time.perf_counter() if timings is not None else 0.0
+            result["ml_reasons"], result["ml_reasons_source"] = self.explainer.explain(transaction)
+            if timings is not None:
+                timings["explain"] = (time.perf_counter() - t0) * 1e6
+
+        return result, rule_result
+
+    def evaluate_batch(self, transactions):
+        """
+        Vectorized `evaluate` over a TransactionBatch (or DataFrame): the same
+        decisions, with every row scored in one predict call.
+
+        Returns:
+            decision    : array of APPROVE / STEP_UP / DECLINE per row
+            fraud_score : model score per row, NaN where `evaluate` skips ML
+                          (rule DECLINE, trusted profile)
+        """
+        rule_decisions = self.rule_service.evaluate_batch(transactions)["decision"].to_numpy()
+        skip_ml = rule_decisions == "DECLINE"
+
+        trusted = np.zeros(len(transactions), dtype=bool)
+        if self.cascade is not None and self.cascade.trusted_profiles:
+            for _, condition in self.cascade.trusted_profiles:
+                if isinstance(transactions, TransactionBatch):
+                    trusted |= transactions.mask(condition)
+                else:
+                    trusted |= condition.mask(transactions)
+            trusted &= rule_decisions == "APPROVE"
+            skip_ml |= trusted
+
+        scores = self.ml_service.predict(self.ml_service.to_matrix(transactions)).astype(np.float64)
+        decisions = self.combine_batch(rule_decisions, self.ml_service.decide_batch(scores))
+        decisions[trusted] = "APPROVE"
+
+        scores = np.round(scores, 4)
+        scores[skip_ml] = np.nan
+        return {"decision": decisions, "fraud_score": scores}
+
+    def _rebuild_cascade(self, ruleset):
+        self.cascade = DecisionCascade(ruleset.rules, *self._cascade_config)
+        self._attach_metrics()
+
+    def _attach_metrics(self):
+        """Share `metrics` with the services (and cascade rule services) that have none."""
+        if self.metrics is None:
+            return
+        services = [self.rule_service, self.ml_service]
+        if self.cascade is not None:
+            services += [self.cascade.hot_service, self.cascade.rest_service]
+        for service in services:
+            if service is not None and getattr(service, "metrics", None) is None:
+                service.metrics = self.metrics
+
+    def stage_stats(self):
+        """Share of evaluations that exited at each cascade stage."""
+        total = sum(self.stage_exits.values())
+        return {
+            stage: {
+                "count": self.stage_exits[stage],
+                "share": round(self.stage_exits[stage] / total, 4) if total else 0.0
+            }
+            for stage in STAGES
+        }
+
     def _combine(self, rule_result, ml_result):
         if ml_result["decision"] == "DECLINE":
             return "DECLINE"
@@ -35,5 +184,20 @@ class FraudDecisionEngine:
 
         return "APPROVE"
 
+    def combine_batch(self, rule_decisions, ml_decisions):
+        """Vectorized `_combine` over aligned arrays of rule and ML decisions."""
+        rule_decisions = np.asarray(rule_decisions)
+        ml_decisions = np.asarray(ml_decisions)
+
+        return np.select(
+            [
+                rule_decisions == "DECLINE",
+                ml_decisions == "DECLINE",
+                (rule_decisions == "STEP_UP") | (ml_decisions == "STEP_UP"),
+            ],
+            ["DECLINE", "DECLINE", "STEP_UP"],
+            default="APPROVE"
+        )
+
     def _rule_reasons(self, rule_result):
         return [r["use_case"] for r in rule_result.get("matched_rules", [])]
@@ -0,0 +1,253 @@
+"""
+Per-Stage Latency Metrics
+-------------------------
+
+Low-overhead latency histograms for the scoring path, so a p99 spike can be
+pinned on the rule pass, one pathological rule, the feature-vector build or
+the XGBoost predict call.
+
+Stages recorded when a LatencyMetrics is passed as `metrics=`:
+- FraudDecisionEngine : engine.rules, engine.ml, engine.combine,
+                        engine.explain, engine.total
+- RuleService         : rules.pass, and every RULE_SAMPLE_EVERY-th pass
+                        each evaluated rule on its own (rules.rule{rule_id});
+                        the sampled pass is left out of rules.pass
+- MLService           : ml.features (to_matrix), ml.predict
+
+Histograms are HDR-style log-linear: values in nanoseconds, 2^SUB_BUCKET_BITS
+linear sub-buckets per power of two (≤ 1/2^(SUB_BUCKET_BITS-1) relative
+error, ~1.6%), fixed size covering any 64-bit value. Recording is an
+index computation and a list increment. Each thread records into its own shard
+(no lock on the hot path); `snapshot()` merges the shards.
+
+Exports:
+- `snapshot()`   : JSON-ready dict (count, mean, p50 / p90 / p99 / p99.9, max
+                   and the non-empty buckets per stage)
+- `prometheus()` : text exposition (histogram over PROMETHEUS_BUCKETS_US plus
+                   quantile gauges)
+- `add_sink(fn)` : fn(stage, nanoseconds, rule_id) on every observation,
+                   for custom sinks (StatsD, tracing, ...)
+
+Usage:
+    metrics = LatencyMetrics()
+    engine = FraudDecisionEngine(rule_service, ml_service, metrics=metrics)
+    ...
+    print(metrics.prometheus())
+"""
+
+import itertools
+import threading
+
+# --------------------------------------------------
+# CONFIGURATION
+# --------------------------------------------------
+
+SUB_BUCKET_BITS = 7
+RULE_SAMPLE_EVERY = 1_000          # rule passes between per-rule timings (kept out of p99)
+QUANTILES = [0.5, 0.9, 0.99, 0.999]
+PROMETHEUS_BUCKETS_US = [10, 25, 50, 100, 250, 500, 1_000, 2_500, 5_000, 10_000, 25_000, 100_000, 1_000_000]
+METRIC_NAME = "fraud_engine_stage_latency_seconds"
+
+_HALF = 1 << (SUB_BUCKET_BITS - 1)
+
+# --------------------------------------------------
+# HISTOGRAM
+# --------------------------------------------------
+
+def bucket_index(ns: int) -> int:
+    """Log-linear bucket of a non-negative integer value."""
+    shift = ns.bit_length() - SUB_BUCKET_BITS
+    if shift <= 0:
+        return ns
+    return shift * _HALF + (ns >> shift)
+
+
+def bucket_bounds(index: int):
+    """[lower, upper) values of a bucket."""
+    shift = max(0, index // _HALF - 1)
+    lower = (index - shift * _HALF) << shift
+    return lower, lower + (1 << shift)
+
+
+_BUCKETS = bucket_index(2**64 - 1) + 1
+
+
+class LatencyHistogram:
+    """Fixed-size log-linear histogram of non-negative nanosecond values; one writer thread."""
+
+    __slots__ = ("counts", "total")
+
+    def __init__(self):
+        self.counts = [0] * _BUCKETS
+        self.total = 0
+
+    def record(self, ns: int):
+        # bucket_index, inlined
+        shift = ns.bit_length() - SUB_BUCKET_BITS
+        self.counts[ns if shift <= 0 else shift * _HALF + (ns >> shift)] += 1
+        self.total += ns
+
+    @property
+    def count(self) -> int:
+        return sum(self.counts)
+
+    def merge(self, other):
+        counts = self.counts
+        for i, c in enumerate(other.counts):
+            if c:
+                counts[i] += c
+        self.total += other.total
+
+    def quantile(self, q: float) -> int:
+        """Upper bound of the bucket holding the q-quantile (0 when empty)."""
+        count = self.count
+        if not count:
+            return 0
+        rank = max(1, round(q * count))
+        seen = 0
+        for i, c in enumerate(self.counts):
+            seen += c
+            if seen >= rank:
+                return bucket_bounds(i)[1]
+        return bucket_bounds(_BUCKETS - 1)[1]
+
+    def count_below(self, ns: int) -> int:
+        """Observations whose bucket lies at or below `ns`."""
+        return sum(c for i, c in enumerate(self.counts) if c and bucket_bounds(i)[0] <= ns)
+
+    def summary(self) -> dict:
+        """JSON-ready percentiles in µs plus the non-empty [lower_us, upper_us, count] buckets."""
+        count = self.count
+        stats = {
+            "count": count,
+            "mean_us": round(self.total / count / 1e3, 3) if count else 0.0,
+            **{f"p{q * 100:g}_us": round(self.quantile(q) / 1e3, 3) for q in QUANTILES},
+            "max_us": round(self.quantile(1.0) / 1e3, 3),
+        }
+        stats["buckets"] = [
+            [bucket_bounds(i)[0] / 1e3, bucket_bounds(i)[1] / 1e3, c]
+            for i, c in enumerate(self.counts) if c
+        ]
+        return stats
+
+# --------------------------------------------------
+# REGISTRY
+# --------------------------------------------------
+
+class LatencyMetrics:
+    def __init__(self, rule_sample_every=RULE_SAMPLE_EVERY):
+        self.rule_sample_every = rule_sample_every
+        self._local = threading.local()
+        self._shards = []           # (stages, rules) dicts, one pair per recording thread
+        self._shards_lock = threading.Lock()
+        self._rule_ticks = itertools.count()
+        self._sinks = ()
+
+    def _histogram(self, kind, key):
+        """Slow path of `record`: this thread's shard (registered on first use) histogram for `key`."""
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = self._local.shard = ({}, {})
+            with self._shards_lock:
+                self._shards.append(shard)
+        histogram = shard[kind].get(key)
+        if histogram is None:
+            histogram = shard[kind][key] = LatencyHistogram()
+        return histogram
+
+    # --------------------------------------------------
+    # RECORDING
+    # --------------------------------------------------
+
+    def record(self, stage: str, ns: int):
+        try:
+            histogram = self._local.shard[0][stage]
+        except (AttributeError, KeyError):
+            histogram = self._histogram(0, stage)
+        histogram.record(ns)
+
+        for sink in self._sinks:
+            sink(stage, ns, None)
+
+    def record_rule(self, rule_id, ns: int):
+        try:
+            histogram = self._local.shard[1][rule_id]
+        except (AttributeError, KeyError):
+            histogram = self._histogram(1, rule_id)
+        histogram.record(ns)
+
+        for sink in self._sinks:
+            sink("rules.rule", ns, rule_id)
+
+    def sample_rules(self) -> bool:
+        """True on every `rule_sample_every`-th rule pass."""
+        return next(self._rule_ticks) % self.rule_sample_every == 0
+
+    def add_sink(self, sink):
+        """`sink(stage, nanoseconds, rule_id)` is called for every observation (rule_id None outside rules.rule)."""
+        self._sinks = (*self._sinks, sink)
+
+    def reset(self):
+        """Drop everything recorded so far (a concurrent observation may land on either side)."""
+        with self._shards_lock:
+            for stages, rules in self._shards:
+                stages.clear()
+                rules.clear()
+
+    # --------------------------------------------------
+    # EXPORT
+    # --------------------------------------------------
+
+    def histograms(self):
+        """(merged stage histograms, merged per-rule histograms)."""
+        stages, rules = {}, {}
+        with self._shards_lock:
+            shards = list(self._shards)
+        for shard_stages, shard_rules in shards:
+            for merged, shard in ((stages, shard_stages), (rules, shard_rules)):
+                for key, histogram in list(shard.items()):
+                    merged.setdefault(key, LatencyHistogram()).merge(histogram)
+        return stages, rules
+
+    def snapshot(self) -> dict:
+        stages, rules = self.histograms()
+        return {
+            "stages": {stage: h.summary() for stage, h in sorted(stages.items())},
+            "rules": {str(rule_id): h.summary() for rule_id, h in sorted(rules.items(), key=lambda kv: str(kv[0]))},
+        }
+
+    def prometheus(self) -> str:
+        stages, rules = self.histograms()
+        series = [({"stage": stage}, h) for stage, h in sorted(stages.items())]
+        series += [
+            ({"stage": "rules.rule", "rule_id": str(rule_id)}, h)
+            for rule_id, h in sorted(rules.items(), key=lambda kv: str(kv[0]))
+        ]
+
+        lines = [
+            f"# HELP {METRIC_NAME} Fraud scoring latency per stage.",
+            f"# TYPE {METRIC_NAME} histogram",
+        ]
+        for labels, h in series:
+            for le in PROMETHEUS_BUCKETS_US:
+                lines.append(f"{METRIC_NAME}_bucket{_labels(labels, le=f'{le / 1e6:g}')} {h.count_below(le * 1000)}")
+            lines.append(f"{METRIC_NAME}_bucket{_labels(labels, le='+Inf')} {h.count}")
+            lines.append(f"{METRIC_NAME}_sum{_labels(labels)} {h.total / 1e9:.9f}")
+            lines.append(f"{METRIC_NAME}_count{_labels(labels)} {h.count}")
+
+        quantile_name = f"{METRIC_NAME[:-len('_seconds')]}_quantile_seconds"
+        lines += [
+            f"# HELP {quantile_name} Fraud scoring latency quantiles per stage (histogram upper bound).",
+            f"# TYPE {quantile_name} gauge",
+        ]
+        for labels, h in series:
+            for q in QUANTILES:
+                lines.append(f"{quantile_name}{_labels(labels, quantile=f'{q:g}')} {h.quantile(q) / 1e9:.9f}")
+
+        return "\n".join(lines) + "\n"
+
+
+def _labels(labels, **extra):
+    pairs = {**labels, **extra}
+    escaped = (str(v).replace("\\", "\\\\").replace('"', '\\"') for v in pairs.values())
+    return "{" + ",".join(f'{k}="{v}"' for k, v in zip(pairs, escaped)) + "}"
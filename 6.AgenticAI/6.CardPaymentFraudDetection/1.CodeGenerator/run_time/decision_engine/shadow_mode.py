@@ -0,0 +1,216 @@
+"""
+Shadow-Mode Evaluation
+----------------------
+
+Runs a candidate FraudDecisionEngine (new rule book and/or model) on a
+sample of live traffic next to production, before cutover.
+
+- The production engine draws `sample()` before deciding: only the
+  `sample_rate` share of transactions is timed and `submit`ted to the
+  candidate, the rest cost one random draw
+- The candidate runs on `workers` background threads fed by a bounded
+  queue; when the queue is full the transaction is dropped (`dropped`)
+  rather than making production wait
+- The candidate's result never reaches the caller; only the aggregated
+  production-vs-candidate decision matrix and latency deltas are kept
+
+Usage:
+    shadow = ShadowEvaluator.from_files("candidate/rule_book.json",
+                                        "candidate/fraud_model.joblib",
+                                        sample_rate=0.05)
+    engine = FraudDecisionEngine(rule_service, ml_service, shadow=shadow)
+    ...
+    print_report(shadow.report())
+"""
+
+import queue
+import random
+import threading
+import time
+from collections import Counter, deque
+
+import numpy as np
+
+from run_time.rule_engine.rule_loader import RuleLoader
+from run_time.rule_engine.rule_service import RuleService
+
+# --------------------------------------------------
+# CONFIGURATION
+# --------------------------------------------------
+
+SAMPLE_RATE = 0.05
+WORKERS = 1
+QUEUE_SIZE = 1_000
+LATENCY_WINDOW = 10_000   # most recent latency deltas kept for percentiles
+
+
+class ShadowEvaluator:
+    def __init__(self, candidate_engine, sample_rate=SAMPLE_RATE, workers=WORKERS,
+                 queue_size=QUEUE_SIZE, latency_window=LATENCY_WINDOW, seed=None):
+        if not 0.0 <= sample_rate <= 1.0:
+            raise ValueError(f"❌ sample_rate must be in [0, 1], got {sample_rate}")
+
+        self.candidate = candidate_engine
+        self.sample_rate = sample_rate
+
+        self.offered = 0
+        self.sampled = 0
+        self.dropped = 0
+        self.evaluated = 0
+        self.errors = 0
+        self.last_error = None
+
+        self._random = random.Random(seed)
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._lock = threading.Lock()
+        self._decisions = Counter()
+        self._latency_deltas = deque(maxlen=latency_window)
+        self._score_deltas = deque(maxlen=latency_window)
+
+        self._threads = [
+            threading.Thread(target=self._run, name=f"shadow-worker-{i}", daemon=True)
+            for i in range(workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    @classmethod
+    def from_files(cls, rule_book_path, model_path, ml_options=None, engine_options=None, **kwargs):
+        """Candidate engine built from a rule book and a model file."""
+        from run_time.decision_engine.fraud_decision_engine import FraudDecisionEngine
+        from run_time.ml_engine.fraud_detection_service_using_ml import MLService
+
+        candidate = FraudDecisionEngine(
+            RuleService(RuleLoader.load_rules(rule_book_path)),
+            MLService(model_path, **(ml_options or {})),
+            **(engine_options or {}),
+        )
+        return cls(candidate, **kwargs)
+
+    # --------------------------------------------------
+    # PRODUCTION SIDE
+    # --------------------------------------------------
+
+    def offer(self, transaction, production_result, production_us):
+        """Maybe queue `transaction` for the candidate; never blocks."""
+        return self.sample() and self.submit(transaction, production_result, production_us)
+
+    def sample(self):
+        """Draw whether the next transaction goes to the candidate."""
+        self.offered += 1
+        if self._random.random() >= self.sample_rate:
+            return False
+        self.sampled += 1
+        return True
+
+    def submit(self, transaction, production_result, production_us):
+        """Queue an already-sampled transaction; drops it if the queue is full."""
+        try:
+            self._queue.put_nowait((dict(transaction), production_result, production_us))
+        except queue.Full:
+            self.dropped += 1
+            return False
+        return True
+
+    def close(self):
+        """Finish the queued transactions and stop the workers."""
+        for _ in self._threads:
+            self._queue.put(None)
+        for thread in self._threads:
+            thread.join()
+
+    # --------------------------------------------------
+    # CANDIDATE SIDE
+    # --------------------------------------------------
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+
+            transaction, production_result, production_us = item
+            start = time.perf_counter()
+            try:
+                candidate_result = self.candidate.evaluate(transaction)
+            except Exception as e:
+                self.errors += 1
+                self.last_error = e
+                continue
+            candidate_us = (time.perf_counter() - start) * 1e6
+
+            self._record(production_result, candidate_result, candidate_us - production_us)
+
+    def _record(self, production_result, candidate_result, latency_delta_us):
+        with self._lock:
+            self.evaluated += 1
+            self._decisions[(production_result["decision"], candidate_result["decision"])] += 1
+            self._latency_deltas.append(latency_delta_us)
+
+            production_score = production_result.get("fraud_score")
+            candidate_score = candidate_result.get("fraud_score")
+            if production_score is not None and candidate_score is not None:
+                self._score_deltas.append(candidate_score - production_score)
+
+    # --------------------------------------------------
+    # REPORT
+    # --------------------------------------------------
+
+    def report(self):
+        """Decision agreement and candidate-minus-production latency (µs) so far."""
+        with self._lock:
+            decisions = dict(self._decisions)
+            latency = np.array(self._latency_deltas, dtype=np.float64)
+            scores = np.array(self._score_deltas, dtype=np.float64)
+            evaluated = self.evaluated
+
+        agreed = sum(count for (prod, cand), count in decisions.items() if prod == cand)
+        disagreements = sorted(
+            (
+                {"production": prod, "candidate": cand, "count": count}
+                for (prod, cand), count in decisions.items() if prod != cand
+            ),
+            key=lambda d: d["count"], reverse=True,
+        )
+
+        def percentiles(values):
+            if not len(values):
+                return {"mean": None, "p50": None, "p99": None}
+            p50, p99 = np.percentile(values, [50, 99])
+            return {
+                "mean": round(float(values.mean()), 4),
+                "p50": round(float(p50), 4),
+                "p99": round(float(p99), 4),
+            }
+
+        return {
+            "offered": self.offered,
+            "sampled": self.sampled,
+            "dropped": self.dropped,
+            "evaluated": evaluated,
+            "errors": self.errors,
+            "agreement_rate": round(agreed / evaluated, 4) if evaluated else None,
+            "disagreements": disagreements,
+            "latency_delta_us": percentiles(latency),
+            "score_delta": percentiles(scores),
+        }
+
+
+def print_report(report):
+    print("\n🔁 Shadow candidate vs production")
+    print(f"   offered={report['offered']}  sampled={report['sampled']}  "
+          f"evaluated={report['evaluated']}  dropped={report['dropped']}  errors={report['errors']}")
+
+    if report["agreement_rate"] is None:
+        print("   (no shadow evaluations yet)")
+        return
+
+    print(f"   ✅ decision agreement: {report['agreement_rate']:.2%}")
+    for d in report["disagreements"]:
+        print(f"   ❌ {d['production']:>8} → {d['candidate']:<8} {d['count']}")
+
+    latency = report["latency_delta_us"]
+    print(f"   ⏱️ latency delta (candidate - production): "
+          f"mean={latency['mean']:+.1f}µs  p50={latency['p50']:+.1f}µs  p99={latency['p99']:+.1f}µs")
+    if report["score_delta"]["mean"] is not None:
+        print(f"   📊 score delta mean={report['score_delta']['mean']:+.4f}")
@@ -0,0 +1,270 @@
+"""
+Transaction Schema
+------------------
+
+Typed transaction containers generated once from the model's feature list
+and the rule book's features, so the run-time engines stop re-converting
+free-form dicts on every call.
+
+- TransactionSchema : ordered features (model features first, then
+                      rule-only features) and which of them are boolean
+- TransactionRecord : one transaction in a generated `__slots__` class
+                      (one slot per feature). It is a read-only Mapping, so
+                      it goes wherever a transaction dict goes; RuleService
+                      reads its features as slots and MLService reuses its
+                      cached float32 model row
+- TransactionBatch  : struct-of-arrays (one float64 column + presence mask
+                      per feature) for RuleService.evaluate_batch,
+                      MLService.score_batch and FraudDecisionEngine.evaluate_batch
+
+Coercion and defaulting happen once, when the record / batch is built:
+- bool features: True/False, 1/0 and "true"/"false" → bool
+- an absent feature stays absent (rules reading it do not match); the
+  model row fills it with 0 (None → NaN, bool → 0/1), as MLService.to_matrix
+- keys outside the schema are kept as-is
+
+Usage:
+    schema = TransactionSchema.from_services(ml_service, rule_service)
+    engine.evaluate(schema.record(transaction))
+    engine.evaluate_batch(schema.batch(transactions))   # list of dicts or DataFrame
+"""
+
+import ast
+from collections.abc import Mapping
+from itertools import chain
+
+import numpy as np
+import pandas as pd
+
+from run_time.rule_engine.rule_compiler import RuleCompiler
+
+_BOOLS = {True: True, False: False, "true": True, "false": False, "True": True, "False": False}
+
+
+def _to_bool(value):
+    """bool for recognised truthy/falsy encodings (1/0 compare equal to True/False); anything else unchanged."""
+    try:
+        return _BOOLS.get(value, value)
+    except TypeError:   # unhashable
+        return value
+
+
+def _bool_compared(tree):
+    """Features compared against a True/False literal in a condition."""
+    features = set()
+    for node in ast.walk(tree):
+        if not isinstance(node, ast.Compare):
+            continue
+        operands = [node.left, *node.comparators]
+        if any(isinstance(o, ast.Constant) and isinstance(o.value, bool) for o in operands):
+            features.update(o.id for o in operands if isinstance(o, ast.Name))
+    return features
+
+
+def _compile_filler(features, bool_features):
+    """
+    Generated `fill(record, transaction) -> present features`: one unrolled
+    get / coerce / slot store per feature, no per-key dict probing.
+    """
+    lines = ["def fill(r, t):", "    get = t.get", "    present = []"]
+    for feature in features:
+        value = "v if v is True or v is False else _to_bool(v)" if feature in bool_features else "v"
+        lines += [
+            f"    v = get({feature!r}, _ABSENT)",
+            "    if v is not _ABSENT:",
+            f"        r.{feature} = {value}",
+            f"        present.append({feature!r})",
+        ]
+    lines.append("    return present")
+
+    namespace = {"_ABSENT": object(), "_to_bool": _to_bool}
+    exec(compile("\n".join(lines), "<transaction schema>", "exec"), namespace)
+    return namespace["fill"]
+
+
+# --------------------------------------------------
+# SINGLE TRANSACTION
+# --------------------------------------------------
+
+class TransactionRecord(Mapping):
+    """Base of the per-schema record classes; feature slots are added by TransactionSchema."""
+
+    __slots__ = ("schema", "_present", "_extra", "_vector")
+
+    def __getitem__(self, name):
+        try:
+            return getattr(self, name) if name in self.schema.index else self._extra[name]
+        except (AttributeError, TypeError):
+            raise KeyError(name) from None
+
+    def __iter__(self):
+        if self._extra:
+            return chain(self._present, self._extra)
+        return iter(self._present)
+
+    def __len__(self):
+        return len(self._present) + (len(self._extra) if self._extra else 0)
+
+    def __contains__(self, name):
+        return name in self._present or (self._extra is not None and name in self._extra)
+
+    def __repr__(self):
+        return f"TransactionRecord({dict(self)!r})"
+
+    @property
+    def vector(self) -> np.ndarray:
+        """float32 row in model feature order (absent → 0, None → NaN, bool → 0/1); built once."""
+        if self._vector is None:
+            self._vector = np.array(
+                [getattr(self, f, 0.0) for f in self.schema.model_features], dtype=np.float32
+            )
+        return self._vector
+
+
+# --------------------------------------------------
+# BATCH
+# --------------------------------------------------
+
+class TransactionBatch:
+    """
+    Struct-of-arrays transactions: `columns[feature]` is a float64 array
+    (NaN where absent or None; object dtype for non-numeric values) and
+    `present[feature]` marks the rows that carry the feature. Only features
+    present in at least one row have a column.
+
+    A None value is NaN in its column, so a condition reading it compares
+    False (as on a DataFrame) instead of failing the whole condition.
+    """
+
+    def __init__(self, schema, n, columns, present):
+        self.schema = schema
+        self.n = n
+        self.columns = columns
+        self.present = present
+        self._frame = None
+        self._matrices = {}
+
+    def __len__(self):
+        return self.n
+
+    def frame(self) -> pd.DataFrame:
+        """The columns as a DataFrame (for the vectorized rule masks)."""
+        if self._frame is None:
+            self._frame = pd.DataFrame(self.columns, index=pd.RangeIndex(self.n), copy=False)
+        return self._frame
+
+    def mask(self, condition, columns=None) -> np.ndarray:
+        """`condition.mask` over the batch; a feature a row does not carry is invalid for that row."""
+        match = condition.mask(self.frame(), columns, self.present)
+        # The row-wise fallback of `mask` sees NaN, not an absent feature
+        for feature in condition.required:
+            if feature in self.present:
+                match &= self.present[feature]
+        return match
+
+    def matrix(self, features) -> np.ndarray:
+        """float32 matrix in `features` order, filled as MLService.to_matrix; cached."""
+        key = tuple(features)
+        X = self._matrices.get(key)
+        if X is None:
+            X = np.zeros((self.n, len(key)), dtype=np.float32)
+            for j, feature in enumerate(key):
+                column = self.columns.get(feature)
+                if column is not None:
+                    X[:, j] = np.where(self.present[feature], column, 0)
+            self._matrices[key] = X
+        return X
+
+
+# --------------------------------------------------
+# SCHEMA
+# --------------------------------------------------
+
+class TransactionSchema:
+    def __init__(self, features, model_features=(), bool_features=()):
+        self.model_features = list(model_features)
+        self.features = list(dict.fromkeys([*self.model_features, *features]))
+        self.index = {f: j for j, f in enumerate(self.features)}
+        self.bool_features = frozenset(bool_features) & self.index.keys()
+
+        reserved = {
+            name for cls in TransactionRecord.__mro__ for name in vars(cls)
+        } | set(TransactionRecord.__slots__)
+        for feature in self.features:
+            if not feature.isidentifier() or feature in reserved:
+                raise ValueError(f"❌ Feature {feature!r} cannot be a TransactionRecord slot")
+
+        self.record_type = type(
+            "TransactionRecord", (TransactionRecord,), {"__slots__": tuple(self.features)}
+        )
+        self._fill = _compile_filler(self.features, self.bool_features)
+
+    @classmethod
+    def from_services(cls, ml_service=None, rules=None, bool_features=()):
+        """
+        Schema for a model (MLService) and a rule book (RuleService,
+        CompiledRuleSet or rule dicts). Features compared to true/false in a
+        condition are boolean.
+        """
+        model_features = ml_service.features if ml_service is not None else []
+        features, bools = [], set(bool_features)
+
+        if rules is not None:
+            conditions = rules.conditions if hasattr(rules, "conditions") else RuleCompiler.compile_rules(rules)
+            for condition in conditions:
+                features.extend(sorted(condition.features))
+                bools |= _bool_compared(condition._tree)
+
+        return cls(features, model_features, bools)
+
+    def record(self, transaction) -> TransactionRecord:
+        """Slotted copy of one transaction dict (a record of this schema is returned as is)."""
+        if isinstance(transaction, TransactionRecord) and transaction.schema is self:
+            return transaction
+
+        record = self.record_type.__new__(self.record_type)
+        record.schema = self
+        record._vector = None
+        record._present = present = tuple(self._fill(record, transaction))
+
+        record._extra = None
+        if len(transaction) != len(present):
+            record._extra = {k: v for k, v in transaction.items() if k not in self.index}
+        return record
+
+    def batch(self, transactions) -> TransactionBatch:
+        """Columnar batch from a list of dicts / records or a DataFrame."""
+        n = len(transactions)
+        columns, present = {}, {}
+
+        if isinstance(transactions, pd.DataFrame):
+            # Every row carries every column (NaN is a value, as in the DataFrame paths)
+            for feature in self.features:
+                if feature in transactions.columns:
+                    columns[feature] = self._column(feature, transactions[feature].to_numpy())
+                    present[feature] = np.ones(n, dtype=bool)
+            return TransactionBatch(self, n, columns, present)
+
+        keys = set().union(*transactions)
+        for feature in self.features:
+            if feature not in keys:
+                continue
+            column = columns[feature] = self._column(feature, [t.get(feature) for t in transactions])
+            if column.dtype == object or np.isnan(column).any():
+                # NaN is None or absent; the model row (and rules) need to tell them apart
+                present[feature] = np.fromiter((feature in t for t in transactions), dtype=bool, count=n)
+            else:
+                present[feature] = np.ones(n, dtype=bool)
+
+        return TransactionBatch(self, n, columns, present)
+
+    def _column(self, feature, values) -> np.ndarray:
+        """float64 column (bools coerced, None → NaN), or object dtype for non-numeric values."""
+        if isinstance(values, np.ndarray) and values.dtype != object:
+            return values.astype(np.float64)
+        if feature in self.bool_features:
+            values = [_to_bool(v) for v in values]
+        try:
+            return np.array(values, dtype=np.float64)
+        except (TypeError, ValueError):
+            return np.array(values, dtype=object)
@@ -0,0 +1,204 @@
+"""
+Streaming Velocity Feature Engine
+---------------------------------
+
+Stateful, in-memory sliding-window features per card, computed as each
+authorization arrives, so callers no longer precompute them upstream.
+
+Emitted features (for the transaction at time t, amount a):
+- txn_count_1m / 5m / 10m : card transactions in (t - window, t], current included
+- txn_velocity_5m         : earlier transactions in the last 5 minutes
+- time_gap                : seconds since the card's previous transaction (absent on the first)
+- txn_density             : transactions per minute over the last 5 minutes
+- avg_amount_30d          : mean amount of earlier transactions in the last 30 days
+                            (absent without history)
+- amount_spike_ratio      : a / avg_amount_30d (1.0 without history)
+
+State:
+- One preallocated slab of ring buffers for all cards, so memory is bounded
+  by `capacity` whatever the number of cards seen
+- Short windows : RESOLUTION_S second buckets over the 10 minute horizon
+- 30 day window : one bucket per day (sum + count)
+- Each ring slot stores the bucket id it holds; a stale slot is reset on
+  write and ignored on read, so updates are O(1) and expired state needs
+  no sweeping
+- Cards are evicted least-recently-seen first when the slab is full, or
+  by `evict_expired` once they have been idle longer than 30 days
+
+Window edges are at bucket resolution: a transaction counts in window W if
+its bucket is one of the last W / RESOLUTION_S buckets.
+
+Out-of-order arrivals: a late transaction never resets a slot holding a
+newer bucket. It is recorded (and counts for later transactions) while
+its bucket is still inside the ring horizon (10 minutes / 30 days behind
+the card's newest one) and dropped past that. Its own counts only see
+buckets the ring still holds, so windows reaching back to buckets
+already recycled by newer ones can come out low.
+"""
+
+from collections import OrderedDict
+
+import numpy as np
+
+# --------------------------------------------------
+# CONFIGURATION
+# --------------------------------------------------
+
+RESOLUTION_S = 10
+SHORT_WINDOWS_S = {"1m": 60, "5m": 300, "10m": 600}
+SHORT_HORIZON_S = 600
+
+DAY_S = 86_400
+AMOUNT_WINDOW_DAYS = 30
+
+DEFAULT_CAPACITY = 1_000_000
+
+EMPTY_BUCKET = np.iinfo(np.int32).min // 2
+
+
+class VelocityFeatureEngine:
+    def __init__(self, capacity=DEFAULT_CAPACITY, resolution_s=RESOLUTION_S):
+        self.capacity = capacity
+        self.resolution_s = resolution_s
+        self.n_short = SHORT_HORIZON_S // resolution_s
+        self.short_spans = {
+            name: seconds // resolution_s for name, seconds in SHORT_WINDOWS_S.items()
+        }
+
+        # ~0.7 KB per card at the default resolution
+        self.short_bucket = np.full((capacity, self.n_short), EMPTY_BUCKET, dtype=np.int32)
+        self.short_count = np.zeros((capacity, self.n_short), dtype=np.int16)
+
+        self.day_bucket = np.full((capacity, AMOUNT_WINDOW_DAYS), EMPTY_BUCKET, dtype=np.int32)
+        self.day_count = np.zeros((capacity, AMOUNT_WINDOW_DAYS), dtype=np.int32)
+        self.day_sum = np.zeros((capacity, AMOUNT_WINDOW_DAYS), dtype=np.float32)
+
+        self.last_ts = np.full(capacity, np.nan, dtype=np.float64)
+
+        # card_id → slot, least recently seen first
+        self.slots = OrderedDict()
+        self.free_slots = list(range(capacity - 1, -1, -1))
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self.slots)
+
+    @property
+    def nbytes(self):
+        arrays = [self.short_bucket, self.short_count, self.day_bucket,
+                  self.day_count, self.day_sum, self.last_ts]
+        return sum(a.nbytes for a in arrays)
+
+    # --------------------------------------------------
+    # UPDATE
+    # --------------------------------------------------
+
+    def update(self, card_id, timestamp: float, amount: float) -> dict:
+        """Record one transaction and return its velocity features."""
+        slot = self._slot(card_id)
+        features = {}
+
+        # Short windows (row views keep per-update indexing cheap)
+        buckets, counts = self.short_bucket[slot], self.short_count[slot]
+        bucket = int(timestamp // self.resolution_s)
+        ring = bucket % self.n_short
+        dropped = 0
+        if bucket > buckets[ring]:
+            buckets[ring] = bucket
+            counts[ring] = 1
+        elif bucket == buckets[ring]:
+            counts[ring] += 1
+        else:
+            # Late past the horizon of the slot's newer bucket: out of every later window
+            dropped = 1
+
+        # Per-bucket count indexed by age, so each window is a prefix sum
+        age = bucket - buckets
+        live = (age >= 0) & (age < self.n_short)
+        by_age = np.bincount(age[live], weights=counts[live], minlength=self.n_short).cumsum()
+        for name, span in self.short_spans.items():
+            features[f"txn_count_{name}"] = int(by_age[span - 1]) + dropped
+
+        features["txn_velocity_5m"] = features["txn_count_5m"] - 1
+        features["txn_density"] = features["txn_count_5m"] / (SHORT_WINDOWS_S["5m"] / 60)
+
+        last_ts = self.last_ts[slot]
+        if last_ts == last_ts:  # not NaN
+            features["time_gap"] = float(timestamp - last_ts)
+            if timestamp > last_ts:
+                self.last_ts[slot] = timestamp
+        else:
+            self.last_ts[slot] = timestamp
+
+        # 30 day amount window (history before this transaction)
+        days, day_counts, day_sums = self.day_bucket[slot], self.day_count[slot], self.day_sum[slot]
+        day = int(timestamp // DAY_S)
+        age = day - days
+        live = (age >= 0) & (age < AMOUNT_WINDOW_DAYS)
+        history_count = int(day_counts[live].sum())
+
+        if history_count:
+            avg = float(day_sums[live].sum()) / history_count
+            features["avg_amount_30d"] = avg
+            features["amount_spike_ratio"] = amount / avg if avg else 1.0
+        else:
+            features["amount_spike_ratio"] = 1.0
+
+        ring = day % AMOUNT_WINDOW_DAYS
+        if day > days[ring]:
+            days[ring] = day
+            day_counts[ring] = 1
+            day_sums[ring] = amount
+        elif day == days[ring]:
+            day_counts[ring] += 1
+            day_sums[ring] += amount
+
+        return features
+
+    def enrich(self, transaction: dict, card_id, timestamp: float, amount: float) -> dict:
+        """`transaction` plus its velocity features, ready for FraudDecisionEngine.evaluate."""
+        return {**transaction, **self.update(card_id, timestamp, amount)}
+
+    # --------------------------------------------------
+    # STATE MANAGEMENT
+    # --------------------------------------------------
+
+    def _slot(self, card_id):
+        slot = self.slots.get(card_id)
+        if slot is not None:
+            self.slots.move_to_end(card_id)
+            return slot
+
+        if not self.free_slots:
+            _, evicted = self.slots.popitem(last=False)
+            self._release(evicted)
+            self.evictions += 1
+
+        slot = self.free_slots.pop()
+        self.slots[card_id] = slot
+        return slot
+
+    def _release(self, slot):
+        self.short_bucket[slot] = EMPTY_BUCKET
+        self.short_count[slot] = 0
+        self.day_bucket[slot] = EMPTY_BUCKET
+        self.day_count[slot] = 0
+        self.day_sum[slot] = 0.0
+        self.last_ts[slot] = np.nan
+        self.free_slots.append(slot)
+
+    def evict_expired(self, now: float) -> int:
+        """Drop cards idle for longer than the 30 day window. Returns how many."""
+        horizon = now - AMOUNT_WINDOW_DAYS * DAY_S
+        evicted = 0
+
+        # Least recently seen first: stop at the first card still active
+        while self.slots:
+            card_id, slot = next(iter(self.slots.items()))
+            if self.last_ts[slot] >= horizon:
+                break
+            self.slots.popitem(last=False)
+            self._release(slot)
+            evicted += 1
+
+        return evicted
@@ -0,0 +1,372 @@
+"""
+Feature & Score Drift Monitor
+-----------------------------
+
+Constant-memory streaming sketches of every booster feature and of the
+model score, compared against a baseline snapshot of the training data.
+`MLService.to_matrix` fills an absent feature with 0, so a broken upstream
+pipeline looks like a transaction full of zeros; the monitor catches it
+as a missing-rate jump or a distribution shift.
+
+Per feature (and for the score):
+- numeric     : counts over DRIFT_BINS bins cut at the baseline quantiles
+                (a fixed-size quantile sketch) → PSI and binned KS
+- categorical : counts per baseline value (≤ MAX_CATEGORIES distinct
+                values) plus an "other" bucket → PSI
+- missing     : absent or None, counted apart from the value sketch
+
+Scoring path cost: `observe` draws one random number per transaction;
+only the `sample_rate` share is copied (model row + missing mask) into a
+fixed buffer, which is folded into the sketches with vectorized NumPy once
+FLUSH_ROWS rows are buffered.
+
+Alerts (once a sketch holds MIN_SAMPLES values):
+- PSI ≥ PSI_ALERT (≥ PSI_WARN warns), KS ≥ KS_ALERT (numeric),
+  |missing rate - baseline| ≥ MISSING_ALERT
+
+A baseline belongs to one model (the score sketch is the model's output);
+build a new one when the model changes.
+
+Usage (from 1.CodeGenerator/):
+    python -m run_time.ml_engine.drift_monitor --model fraud_xgboost_model.joblib \
+        --data taining_data/rule_compatible_fraud_data.csv --output drift_baseline.json
+
+    monitor = DriftMonitor(DriftBaseline.load("drift_baseline.json"), sample_rate=0.01)
+    ml_service = MLService(model_path, drift_monitor=monitor)
+    ...
+    print_report(monitor.report())
+"""
+
+import argparse
+import json
+import random
+import threading
+
+import numpy as np
+import pandas as pd
+
+from run_time.feature_engine.transaction_schema import TransactionBatch
+
+# --------------------------------------------------
+# CONFIGURATION
+# --------------------------------------------------
+
+DRIFT_BINS = 20
+MAX_CATEGORIES = 16
+BASELINE_ROWS = 200_000
+SAMPLE_RATE = 0.01
+FLUSH_ROWS = 256
+MIN_SAMPLES = 500
+
+PSI_WARN = 0.1
+PSI_ALERT = 0.25
+KS_ALERT = 0.1
+MISSING_ALERT = 0.05
+
+SCORE = "__score__"
+EPSILON = 1e-4          # floor on bin shares so an empty bin does not make PSI infinite
+DROP_COLUMNS = ["label", "transaction_id"]
+
+# --------------------------------------------------
+# SKETCH MATH
+# --------------------------------------------------
+
+def psi(expected, actual) -> float:
+    """Population stability index of two bin-share vectors."""
+    e = np.clip(np.asarray(expected, dtype=np.float64), EPSILON, None)
+    a = np.clip(np.asarray(actual, dtype=np.float64), EPSILON, None)
+    return float(np.sum((a - e) * np.log(a / e)))
+
+
+def ks(expected, actual) -> float:
+    """Kolmogorov-Smirnov distance between two binned distributions (bin edges as the support)."""
+    return float(np.max(np.abs(np.cumsum(expected) - np.cumsum(actual))))
+
+
+def _profile(values) -> dict:
+    """Baseline sketch of the non-missing `values` of one feature."""
+    distinct = np.unique(values)
+    if len(distinct) <= MAX_CATEGORIES:
+        counts = np.array([np.sum(values == v) for v in distinct], dtype=np.float64)
+        return {
+            "kind": "categorical",
+            "values": distinct.tolist(),
+            "probs": (counts / max(len(values), 1)).tolist() + [0.0],   # + other
+        }
+
+    edges = np.unique(np.quantile(values, np.linspace(0, 1, DRIFT_BINS + 1)[1:-1]))
+    counts = np.bincount(np.searchsorted(edges, values, side="right"), minlength=len(edges) + 1)
+    return {
+        "kind": "numeric",
+        "edges": edges.tolist(),
+        "probs": (counts / len(values)).tolist(),
+    }
+
+# --------------------------------------------------
+# BASELINE
+# --------------------------------------------------
+
+class DriftBaseline:
+    """Per-feature (and score) sketches of the training data; JSON round-trippable."""
+
+    def __init__(self, features, sketches):
+        self.features = list(features)
+        self.sketches = sketches      # name → {"kind", "edges"/"values", "probs", "missing_rate"}
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, ml_service):
+        """
+        Baseline of `df` for the model of `ml_service` (booster feature order).
+        Values go through `to_matrix` (float32), as live transactions do, so a
+        category like 0.1 is stored as the value the monitor will see.
+        """
+        numeric = pd.DataFrame({
+            feature: pd.to_numeric(df[feature], errors="coerce")
+            for feature in ml_service.features if feature in df.columns
+        }, index=df.index)
+        X = ml_service.to_matrix(numeric).astype(np.float64)
+
+        sketches = {}
+        for j, feature in enumerate(ml_service.features):
+            column = X[:, j] if feature in numeric.columns else np.full(len(df), np.nan)
+            missing = np.isnan(column)
+            sketch = _profile(column[~missing]) if (~missing).any() else {"kind": "categorical", "values": [], "probs": [0.0]}
+            sketch["missing_rate"] = float(missing.mean()) if len(df) else 0.0
+            sketches[feature] = sketch
+
+        scores = ml_service.predict(X.astype(np.float32)).astype(np.float64)
+        sketches[SCORE] = {**_profile(scores), "missing_rate": 0.0}
+        return cls(ml_service.features, sketches)
+
+    @classmethod
+    def from_csv(cls, data_path, ml_service, rows=BASELINE_ROWS):
+        df = pd.read_csv(data_path, nrows=rows)
+        return cls.from_frame(df.drop(columns=[c for c in DROP_COLUMNS if c in df.columns]), ml_service)
+
+    def to_dict(self) -> dict:
+        return {"features": self.features, "sketches": self.sketches}
+
+    def save(self, path):
+        with open(path, "w") as f:
+            json.dump(self.to_dict(), f)
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as f:
+            data = json.load(f)
+        return cls(data["features"], data["sketches"])
+
+# --------------------------------------------------
+# STREAMING MONITOR
+# --------------------------------------------------
+
+class DriftMonitor:
+    def __init__(self, baseline: DriftBaseline, sample_rate=SAMPLE_RATE, flush_rows=FLUSH_ROWS, seed=None):
+        if not 0.0 <= sample_rate <= 1.0:
+            raise ValueError(f"❌ sample_rate must be in [0, 1], got {sample_rate}")
+
+        self.baseline = baseline
+        self.features = baseline.features
+        self.sample_rate = sample_rate
+        self.feature_index = {f: j for j, f in enumerate(self.features)}
+
+        self.offered = 0
+        self.sampled = 0
+
+        n = len(self.features)
+        self._random = random.Random(seed).random
+        self._rng = np.random.default_rng(seed)
+        self._lock = threading.Lock()
+        self._values = np.empty((flush_rows, n + 1), dtype=np.float32)   # features + score
+        self._missing = np.empty((flush_rows, n), dtype=bool)
+        self._buffered = 0
+        self._frame_absent = {}   # DataFrame column set → absent-feature mask
+
+        names = [*self.features, SCORE]
+        self._sketches = [baseline.sketches[name] for name in names]
+        self._counts = [np.zeros(len(s["probs"]), dtype=np.int64) for s in self._sketches]
+        self._missing_counts = np.zeros(n, dtype=np.int64)
+        self._rows = 0
+        # Live values are float32 model rows: compare in float32 precision
+        # (a baseline built from raw float64 data would never match 0.1)
+        self._edges = [
+            np.asarray(s["edges"], dtype=np.float32).astype(np.float64) if s["kind"] == "numeric" else None
+            for s in self._sketches
+        ]
+        self._category_values = [
+            np.asarray(s["values"], dtype=np.float32).astype(np.float64) if s["kind"] == "categorical" else None
+            for s in self._sketches
+        ]
+
+    # --------------------------------------------------
+    # SCORING PATH
+    # --------------------------------------------------
+
+    def observe(self, transactions, X: np.ndarray, scores: np.ndarray):
+        """Sample rows of one scoring call (`X` = MLService.to_matrix(transactions))."""
+        n = len(X)
+        self.offered += n
+        if n == 1:
+            if self._random() >= self.sample_rate:
+                return
+            rows = (0,)
+        else:
+            rows = np.flatnonzero(self._rng.random(n) < self.sample_rate)
+
+        for i in rows:
+            self._add(X[i], scores[i], self._absent(transactions, i))
+
+    def _absent(self, transactions, i):
+        """Features the transaction does not carry (to_matrix filled them with 0)."""
+        if isinstance(transactions, pd.DataFrame):
+            key = tuple(transactions.columns)
+            absent = self._frame_absent.get(key)
+            if absent is None:
+                columns = set(key)
+                absent = self._frame_absent[key] = np.array([f not in columns for f in self.features])
+            return absent
+        if isinstance(transactions, TransactionBatch):
+            present = transactions.present
+            return np.array([f not in present or not present[f][i] for f in self.features])
+        transaction = transactions[i]
+        return np.fromiter((f not in transaction for f in self.features), dtype=bool, count=len(self.features))
+
+    def _add(self, row, score, absent):
+        with self._lock:
+            k = self._buffered
+            self._values[k, :-1] = row
+            self._values[k, -1] = score
+            self._missing[k] = absent
+            self._buffered = k + 1
+            self.sampled += 1
+            if self._buffered == len(self._values):
+                self._flush()
+
+    def _flush(self):
+        """Fold the buffered rows into the sketches (call with the lock held)."""
+        n = self._buffered
+        if not n:
+            return
+        values = self._values[:n].astype(np.float64)
+        missing = np.zeros((n, values.shape[1]), dtype=bool)
+        missing[:, :-1] = self._missing[:n]
+        missing |= np.isnan(values)
+
+        self._missing_counts += missing[:, :-1].sum(axis=0)
+        self._rows += n
+
+        for j, categories in enumerate(self._category_values):
+            column = values[~missing[:, j], j]
+            if not len(column):
+                continue
+            if categories is None:
+                bins = np.searchsorted(self._edges[j], column, side="right")
+            else:
+                # Index of the baseline value, or the trailing "other" bucket
+                bins = np.searchsorted(categories, column) if len(categories) else np.zeros(len(column), dtype=np.int64)
+                known = bins < len(categories)
+                known[known] = categories[bins[known]] == column[known]
+                bins[~known] = len(categories)
+            self._counts[j] += np.bincount(bins, minlength=len(self._counts[j]))
+
+        self._buffered = 0
+
+    # --------------------------------------------------
+    # REPORT
+    # --------------------------------------------------
+
+    def reset(self):
+        with self._lock:
+            self.offered = 0
+            self.sampled = 0
+            self._buffered = 0
+            self._rows = 0
+            self._missing_counts[:] = 0
+            for counts in self._counts:
+                counts[:] = 0
+
+    def report(self, min_samples=MIN_SAMPLES) -> dict:
+        """Drift per feature and for the score since the last reset; `alerts` lists the drifted ones."""
+        with self._lock:
+            self._flush()
+            counts = [c.copy() for c in self._counts]
+            missing_counts = self._missing_counts.copy()
+            rows = self._rows
+
+        features = {}
+        for j, name in enumerate([*self.features, SCORE]):
+            sketch = self._sketches[j]
+            observed = int(counts[j].sum())
+            missing_rate = float(missing_counts[j] / rows) if name != SCORE and rows else 0.0
+            entry = {
+                "kind": sketch["kind"],
+                "observed": observed,
+                "missing_rate": round(missing_rate, 4),
+                "baseline_missing_rate": round(sketch["missing_rate"], 4),
+                "psi": None,
+                "ks": None,
+                "status": "insufficient",
+            }
+
+            if name != SCORE and rows >= min_samples and abs(missing_rate - sketch["missing_rate"]) >= MISSING_ALERT:
+                entry["status"] = "alert"
+            if observed >= min_samples:
+                actual = counts[j] / observed
+                entry["psi"] = round(psi(sketch["probs"], actual), 4)
+                if sketch["kind"] == "numeric":
+                    entry["ks"] = round(ks(sketch["probs"], actual), 4)
+                if entry["status"] != "alert":
+                    if entry["psi"] >= PSI_ALERT or (entry["ks"] is not None and entry["ks"] >= KS_ALERT):
+                        entry["status"] = "alert"
+                    elif entry["psi"] >= PSI_WARN:
+                        entry["status"] = "warn"
+                    else:
+                        entry["status"] = "ok"
+            features["score" if name == SCORE else name] = entry
+
+        return {
+            "offered": self.offered,
+            "sampled": self.sampled,
+            "rows": rows,
+            "features": features,
+            "alerts": sorted(name for name, e in features.items() if e["status"] == "alert"),
+        }
+
+
+def print_report(report):
+    print(f"\n📊 Drift: {report['rows']} sampled rows of {report['offered']} scored")
+    icons = {"ok": "✅", "warn": "⚠️", "alert": "❌", "insufficient": "…"}
+    for name, e in sorted(report["features"].items(), key=lambda kv: -(kv[1]["psi"] or 0)):
+        psi_text = "-" if e["psi"] is None else f"{e['psi']:.4f}"
+        ks_text = "-" if e["ks"] is None else f"{e['ks']:.4f}"
+        print(f"  {icons[e['status']]} {name:<28} PSI {psi_text:>8}  KS {ks_text:>7}  "
+              f"missing {e['missing_rate']:.2%} (baseline {e['baseline_missing_rate']:.2%})")
+    if report["alerts"]:
+        print(f"\n❌ Drift alerts: {', '.join(report['alerts'])}")
+
+# --------------------------------------------------
+# MAIN
+# --------------------------------------------------
+
+def main(argv=None):
+    from run_time.ml_engine.fraud_detection_service_using_ml import MLService
+
+    parser = argparse.ArgumentParser(description="Build a drift baseline from the training data")
+    parser.add_argument("--model", required=True, help="Trained model (.joblib)")
+    parser.add_argument("--data", required=True, help="Training CSV")
+    parser.add_argument("--rows", type=int, default=BASELINE_ROWS)
+    parser.add_argument("--output", required=True, help="Baseline JSON")
+    args = parser.parse_args(argv)
+
+    baseline = DriftBaseline.from_csv(args.data, MLService(args.model), args.rows)
+    baseline.save(args.output)
+
+    kinds = [s["kind"] for s in baseline.sketches.values()]
+    print(f"✅ Baseline of {len(baseline.features)} features + score "
+          f"({kinds.count('numeric')} numeric, {kinds.count('categorical')} categorical)")
+    print(f"💾 Saved to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
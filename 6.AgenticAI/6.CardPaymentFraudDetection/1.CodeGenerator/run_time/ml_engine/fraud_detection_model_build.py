@@ -10,6 +10,9 @@ Supports:
 
 Input  : CSV training file
 Output : fraud_xgboost_model.joblib
+
+For training sets too large for one DataFrame, use training_pipeline.py
+(typed chunked reads, QuantileDMatrix / external memory, same model).
 """
 
 import pandas as pd
@@ -1,33 +1,229 @@
+import hashlib
+from time import perf_counter_ns
+
 from joblib import load
+import numpy as np
 import pandas as pd
 
-class MLService:
-    def __init__(self, model_path, decline_threshold=0.85, step_up_threshold=0.65):
+from run_time.feature_engine.transaction_schema import TransactionBatch, TransactionRecord
+from run_time.ml_engine.inference_backends import create_backend
+from run_time.ml_engine.micro_batcher import MicroBatcher
+
+
+def model_version(model_path) -> str:
+    """SHA-256 of the model file."""
+    digest = hashlib.sha256()
+    with open(model_path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class LoadedModel:
+    """
+    One model file with its inference backend and booster feature order.
+    Never mutated once built, so MLService.reload swaps it in with one
+    assignment and a scoring call that read it keeps a consistent
+    (features, backend, version) triple.
+    """
+
+    __slots__ = ("model", "version", "backend", "features", "feature_index")
+
+    def __init__(self, model_path, backend="booster", backend_options=None):
         self.model = load(model_path)
+        self.version = model_version(model_path)
         self.features = self.model.get_booster().feature_names
+        self.feature_index = {f: j for j, f in enumerate(self.features)}
+        # sklearn | booster | onnx | numpy (see inference_backends.py)
+        self.backend = create_backend(backend, self.model, **(backend_options or {}))
+
+
+class MLService:
+    def __init__(self, model_path, decline_threshold=0.85, step_up_threshold=0.65,
+                 micro_batch_size=None, micro_batch_wait_us=200,
+                 backend="booster", backend_options=None, metrics=None, score_cache=None,
+                 drift_monitor=None):
+        self._backend_config = (backend, backend_options or {})
+        self._loaded = LoadedModel(model_path, *self._backend_config)
+        self._listeners = []
         self.decline_threshold = decline_threshold
         self.step_up_threshold = step_up_threshold
 
+        # Optional feature-build / predict latency (see latency_metrics.py)
+        self.metrics = metrics
+
+        # Optional LRU + TTL cache of `score` results (see score_cache.py)
+        self.score_cache = score_cache
+
+        # Optional sampled feature / score drift sketches (see drift_monitor.py)
+        self.drift_monitor = drift_monitor
+        self._check_drift_features(self.features)
+
+        # Optional: gather concurrent `score` calls into one predict call
+        self.batcher = None
+        if micro_batch_size:
+            self.batcher = MicroBatcher(
+                self.score_batch, max_batch_size=micro_batch_size, max_wait_us=micro_batch_wait_us
+            )
+
+    # The live model; read `loaded` once when several of these must agree
+    @property
+    def loaded(self) -> LoadedModel:
+        return self._loaded
+
+    @property
+    def model(self):
+        return self._loaded.model
+
+    @property
+    def model_version(self) -> str:
+        return self._loaded.version
+
+    @property
+    def backend(self):
+        return self._loaded.backend
+
+    @property
+    def features(self):
+        return self._loaded.features
+
+    @property
+    def feature_index(self):
+        return self._loaded.feature_index
+
     def score(self, transaction: dict):
-        df = pd.DataFrame([transaction])
+        if self.score_cache is not None:
+            return self._cached_score(transaction)
+        if self.batcher is not None:
+            return self.batcher.submit(transaction)
+        return self.score_batch([transaction])[0]
 
-        # bool → int
-        for col in df.select_dtypes(include=["bool"]).columns:
-            df[col] = df[col].astype(int)
+    def _cached_score(self, transaction):
+        loaded = self._loaded
+        X = self.to_matrix([transaction], loaded)
+        key = X.tobytes()
+        result = self.score_cache.get(loaded.version, key)
+        if result is not None:
+            return dict(result)
 
-        df = df.reindex(columns=self.features, fill_value=0)
+        if self.batcher is None and self.metrics is None:
+            scores = loaded.backend.predict(X)
+            if self.drift_monitor is not None:
+                self.drift_monitor.observe([transaction], X, scores)
+            result = self._result(float(scores[0]))
+            cacheable = True
+        else:
+            result = self.batcher.submit(transaction) if self.batcher is not None else self.score_batch([transaction])[0]
+            # score_batch read the live model after us: cache only if no reload happened in between
+            cacheable = self._loaded is loaded
+        if cacheable:
+            self.score_cache.put(loaded.version, key, dict(result))
+        return result
 
-        score = float(self.model.predict_proba(df)[0][1])
+    def reload(self, model_path):
+        """
+        Swap in another model file (same backend) with one assignment; calls
+        already running finish on the model they started with. The score
+        cache is keyed by model version and invalidated after the swap.
+        Returns the previous LoadedModel.
+        """
+        loaded = LoadedModel(model_path, *self._backend_config)
+        self._check_drift_features(loaded.features)
 
-        if score >= self.decline_threshold:
-            decision = "DECLINE"
-        elif score >= self.step_up_threshold:
-            decision = "STEP_UP"
+        previous = self._loaded
+        self._loaded = loaded
+
+        if self.score_cache is not None:
+            self.score_cache.invalidate()
+        for listener in self._listeners:
+            listener(loaded)
+        return previous
+
+    def add_listener(self, listener):
+        """`listener(loaded_model)` is called after every reload (e.g. to rebuild derived state)."""
+        self._listeners.append(listener)
+
+    def score_batch(self, transactions):
+        """Score many transactions with one predict call; same result dicts as `score`."""
+        loaded = self._loaded
+        if self.metrics is None:
+            X = self.to_matrix(transactions, loaded)
+            scores = loaded.backend.predict(X)
         else:
-            decision = "APPROVE"
+            start = perf_counter_ns()
+            X = self.to_matrix(transactions, loaded)
+            built = perf_counter_ns()
+            scores = loaded.backend.predict(X)
+            self.metrics.record("ml.features", built - start)
+            self.metrics.record("ml.predict", perf_counter_ns() - built)
+        if self.drift_monitor is not None:
+            self.drift_monitor.observe(transactions, X, scores)
+        return [self._result(float(s)) for s in scores]
+
+    def _check_drift_features(self, features):
+        if self.drift_monitor is not None and self.drift_monitor.features != features:
+            raise ValueError("❌ Drift baseline was built for a model with different features")
+
+    def to_matrix(self, transactions, loaded=None) -> np.ndarray:
+        """
+        Preallocated float32 matrix in booster feature order, from a list of
+        transaction dicts / TransactionRecords, a TransactionBatch or a DataFrame.
+        bool → 0/1, None → missing, absent features → 0 (as `reindex(fill_value=0)`).
+        `loaded` pins the LoadedModel (default: the live one).
+        """
+        if loaded is None:
+            loaded = self._loaded
+        features = loaded.features
+        if isinstance(transactions, TransactionBatch):
+            return transactions.matrix(features)
+
+        X = np.zeros((len(transactions), len(features)), dtype=np.float32)
+        index = loaded.feature_index
+
+        if isinstance(transactions, pd.DataFrame):
+            for feature in transactions.columns:
+                j = index.get(feature)
+                if j is not None:
+                    X[:, j] = transactions[feature].to_numpy(dtype=np.float32)
+            return X
+
+        for i, transaction in enumerate(transactions):
+            if isinstance(transaction, TransactionRecord) and transaction.schema.model_features == features:
+                X[i] = transaction.vector
+                continue
+            row = X[i]
+            for feature, value in transaction.items():
+                j = index.get(feature)
+                if j is not None:
+                    row[j] = np.nan if value is None else value
+
+        return X
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        return self._loaded.backend.predict(X)
+
+    def decide(self, score: float) -> str:
+        if score >= self.decline_threshold:
+            return "DECLINE"
+        if score >= self.step_up_threshold:
+            return "STEP_UP"
+        return "APPROVE"
+
+    def decide_batch(self, scores: np.ndarray) -> np.ndarray:
+        """Vectorized `decide`."""
+        return np.select(
+            [scores >= self.decline_threshold, scores >= self.step_up_threshold],
+            ["DECLINE", "STEP_UP"],
+            default="APPROVE"
+        )
+
+    def close(self):
+        if self.batcher is not None:
+            self.batcher.close()
 
+    def _result(self, score):
         return {
-            "decision": decision,
+            "decision": self.decide(score),
             "score": round(score, 4),
             "source": "ML"
         }
@@ -0,0 +1,368 @@
+"""
+Time-budgeted Hyperparameter Search
+-----------------------------------
+
+Asynchronous successive halving (ASHA) over SEARCH_SPACE, with boosting
+rounds as the resource:
+- Rungs train to MIN_ROUNDS, MIN_ROUNDS x ETA, ... up to MAX_ROUNDS
+- A trial is promoted to the next rung as soon as it ranks in the top
+  1 / ETA of the trials finished at its rung; otherwise a worker samples
+  a new configuration. Promoted trials continue from their booster.
+- Each rung trains with early stopping on validation AUC; a trial that
+  stopped early is not promoted
+- Trials run on a process pool; cores are split between concurrent trials
+  (`workers`) and XGBoost `nthread` (cores // workers)
+- No new trial starts after `budget_s`; running ones finish
+
+Afterwards the best booster of every trial is timed on single
+transactions (`inplace_predict`, nthread=1, as MLService's booster backend)
+in this process, and the results are reported as a Pareto table of
+validation AUC against p50 latency.
+
+Usage (from 1.CodeGenerator/):
+    python -m run_time.ml_engine.hyperparameter_search \
+        --data taining_data/rule_compatible_fraud_data.csv --budget-s 600 \
+        --latency-budget-us 300 --save-best fraud_xgboost_model.joblib
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import numpy as np
+import pandas as pd
+import xgboost as xgb
+from joblib import dump
+
+from run_time.ml_engine import training_pipeline as pipeline
+
+# --------------------------------------------------
+# CONFIGURATION
+# --------------------------------------------------
+
+# name → ("int" | "uniform" | "log", low, high) or a list of choices
+SEARCH_SPACE = {
+    "max_depth": ("int", 3, 10),
+    "learning_rate": ("log", 0.01, 0.3),
+    "subsample": ("uniform", 0.6, 1.0),
+    "colsample_bytree": ("uniform", 0.5, 1.0),
+    "min_child_weight": ("log", 1, 20),
+    "reg_lambda": ("log", 0.1, 10),
+}
+
+MIN_ROUNDS = 25
+MAX_ROUNDS = 400
+ETA = 3
+EARLY_STOPPING_ROUNDS = 20
+
+BUDGET_S = 600
+MAX_TRIALS = 64
+LATENCY_SAMPLES = 500
+
+# --------------------------------------------------
+# SEARCH SPACE
+# --------------------------------------------------
+
+def sample_params(rng: random.Random, space=SEARCH_SPACE) -> dict:
+    params = {}
+    for name, spec in space.items():
+        if isinstance(spec, list):
+            params[name] = rng.choice(spec)
+            continue
+        kind, low, high = spec
+        if kind == "int":
+            params[name] = rng.randint(low, high)
+        elif kind == "log":
+            params[name] = round(math.exp(rng.uniform(math.log(low), math.log(high))), 5)
+        else:
+            params[name] = round(rng.uniform(low, high), 4)
+    return params
+
+
+def rung_rounds(min_rounds=MIN_ROUNDS, max_rounds=MAX_ROUNDS, eta=ETA):
+    """Boosting rounds per rung: min_rounds x eta^k, capped at max_rounds."""
+    rounds = [min_rounds]
+    while rounds[-1] < max_rounds:
+        rounds.append(min(rounds[-1] * eta, max_rounds))
+    return rounds
+
+# --------------------------------------------------
+# WORKER
+# --------------------------------------------------
+
+# Loaded once per worker process by `_init_worker`
+_data = None
+
+
+def load_split(data_path, chunk_rows=pipeline.CHUNK_ROWS):
+    """(dtrain, dval) from the pipeline's typed chunks and seeded split."""
+    train, val = [], []
+    for chunk, df in enumerate(pipeline.read_chunks(data_path, chunk_rows)):
+        validation = pipeline.split_mask(len(df), chunk)
+        train.append(df[~validation])
+        val.append(df[validation])
+
+    train = pd.concat(train, ignore_index=True)
+    val = pd.concat(val, ignore_index=True)
+    y_train, y_val = train.pop(pipeline.TARGET_COL), val.pop(pipeline.TARGET_COL)
+
+    dtrain = xgb.QuantileDMatrix(train, label=y_train)
+    dval = xgb.QuantileDMatrix(val, label=y_val, ref=dtrain)
+    scale_pos_weight = (len(y_train) - y_train.sum()) / max(int(y_train.sum()), 1)
+    return dtrain, dval, float(scale_pos_weight)
+
+
+def _init_worker(data_path, chunk_rows):
+    global _data
+    _data = load_split(data_path, chunk_rows)
+
+
+def _run_trial(trial_id, params, rounds, nthread, raw_model=None):
+    """Train trial `trial_id` up to `rounds` total trees; returns its rung result."""
+    dtrain, dval, scale_pos_weight = _data
+    train_params = {
+        **pipeline.PARAMS,
+        "scale_pos_weight": scale_pos_weight,
+        **params,
+        "nthread": nthread,
+    }
+
+    booster = None
+    if raw_model is not None:
+        booster = xgb.Booster(model_file=bytearray(raw_model))
+
+    done = booster.num_boosted_rounds() if booster is not None else 0
+    start = time.perf_counter()
+    booster = xgb.train(
+        train_params, dtrain, num_boost_round=rounds - done, xgb_model=booster,
+        evals=[(dval, "validation")], early_stopping_rounds=EARLY_STOPPING_ROUNDS,
+        verbose_eval=False
+    )
+    train_seconds = time.perf_counter() - start
+    # raw_model is saved with save_raw, which drops max_depth & co. from the config
+    pipeline.record_training_params(booster)
+
+    best_rounds = booster.best_iteration + 1
+    return {
+        "trial_id": trial_id,
+        "rounds": rounds,
+        "best_rounds": best_rounds,
+        "stopped_early": best_rounds + EARLY_STOPPING_ROUNDS <= rounds,
+        "auc": round(float(booster.best_score), 6),
+        "train_seconds": round(train_seconds, 2),
+        "raw_model": bytes(booster[:best_rounds].save_raw("ubj")),
+    }
+
+# --------------------------------------------------
+# ASHA
+# --------------------------------------------------
+
+class AshaScheduler:
+    """Decides what a free worker runs next: a promotion, or a new trial."""
+
+    def __init__(self, rungs, eta=ETA, max_trials=MAX_TRIALS, space=SEARCH_SPACE, seed=42):
+        self.rungs = rungs
+        self.eta = eta
+        self.max_trials = max_trials
+        self.space = space
+        self.rng = random.Random(seed)
+        self.trials = {}                             # trial_id → params
+        self.results = [[] for _ in rungs]           # rung → finished results
+        self.promoted = [set() for _ in rungs]       # rung → trial_ids moved up
+
+    def next_job(self):
+        """(trial_id, params, rung, raw_model) or None when nothing is left to run."""
+        for rung in range(len(self.rungs) - 2, -1, -1):
+            finished = sorted(self.results[rung], key=lambda r: r["auc"], reverse=True)
+            for result in finished[:len(finished) // self.eta]:
+                trial_id = result["trial_id"]
+                if trial_id in self.promoted[rung] or result["stopped_early"]:
+                    continue
+                self.promoted[rung].add(trial_id)
+                return trial_id, self.trials[trial_id], rung + 1, result["raw_model"]
+
+        if len(self.trials) < self.max_trials:
+            trial_id = len(self.trials)
+            self.trials[trial_id] = sample_params(self.rng, self.space)
+            return trial_id, self.trials[trial_id], 0, None
+
+        return None
+
+    def record(self, rung, result):
+        self.results[rung].append(result)
+
+    def best_per_trial(self):
+        """Each trial's result at the highest rung it reached."""
+        best = {}
+        for rung_results in self.results:
+            for result in rung_results:
+                best[result["trial_id"]] = result
+        return [best[t] for t in sorted(best)]
+
+
+def search(data_path, budget_s=BUDGET_S, workers=None, nthread=None, max_trials=MAX_TRIALS,
+           min_rounds=MIN_ROUNDS, max_rounds=MAX_ROUNDS, eta=ETA, space=SEARCH_SPACE,
+           chunk_rows=pipeline.CHUNK_ROWS, seed=42, verbose=True):
+    """Run ASHA for up to `budget_s` seconds; returns the per-trial results."""
+    cores = os.cpu_count() or 1
+    workers = workers or max(1, cores // 4)
+    nthread = nthread or max(1, cores // workers)
+
+    rungs = rung_rounds(min_rounds, max_rounds, eta)
+    scheduler = AshaScheduler(rungs, eta, max_trials, space, seed)
+    deadline = time.monotonic() + budget_s
+    running = {}
+
+    if verbose:
+        print(f"🔎 ASHA: rungs {rungs}, {workers} worker(s) x {nthread} thread(s), budget {budget_s}s")
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(data_path, chunk_rows)) as pool:
+        while True:
+            while len(running) < workers and time.monotonic() < deadline:
+                job = scheduler.next_job()
+                if job is None:
+                    break
+                trial_id, params, rung, raw_model = job
+                future = pool.submit(_run_trial, trial_id, params, rungs[rung], nthread, raw_model)
+                running[future] = rung
+
+            if not running:
+                break
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                rung = running.pop(future)
+                result = future.result()
+                scheduler.record(rung, result)
+                if verbose:
+                    print(f"  trial {result['trial_id']:>3} rung {rung} "
+                          f"({result['best_rounds']}/{result['rounds']} trees) AUC {result['auc']:.5f}")
+
+    results = scheduler.best_per_trial()
+    for result in results:
+        result["params"] = scheduler.trials[result["trial_id"]]
+    return results
+
+# --------------------------------------------------
+# LATENCY + PARETO
+# --------------------------------------------------
+
+def sample_rows(data_path, n=LATENCY_SAMPLES):
+    df = next(pipeline.read_chunks(data_path, n))
+    df = df.drop(columns=[pipeline.TARGET_COL], errors="ignore")
+    return df.to_numpy(dtype=np.float32)
+
+
+def inference_latency(raw_model, rows):
+    """Single-transaction p50 / p99 latency in microseconds."""
+    booster = xgb.Booster(model_file=bytearray(raw_model))
+    booster.set_param({"nthread": 1})
+
+    for row in rows[:20]:
+        booster.inplace_predict(row[None, :], validate_features=False)
+
+    latencies = np.empty(len(rows))
+    for i, row in enumerate(rows):
+        start = time.perf_counter()
+        booster.inplace_predict(row[None, :], validate_features=False)
+        latencies[i] = time.perf_counter() - start
+
+    us = latencies * 1e6
+    return round(float(np.percentile(us, 50)), 1), round(float(np.percentile(us, 99)), 1)
+
+
+def pareto_front(results):
+    """trial_ids no other trial beats on both AUC (higher) and p50 latency (lower)."""
+    front = set()
+    for r in results:
+        dominated = any(
+            o["auc"] >= r["auc"] and o["p50_us"] <= r["p50_us"]
+            and (o["auc"] > r["auc"] or o["p50_us"] < r["p50_us"])
+            for o in results
+        )
+        if not dominated:
+            front.add(r["trial_id"])
+    return front
+
+
+def recommend(results, latency_budget_us=None):
+    """Highest AUC within the latency budget (fastest on ties)."""
+    eligible = [r for r in results if latency_budget_us is None or r["p50_us"] <= latency_budget_us]
+    if not eligible:
+        return None
+    return max(eligible, key=lambda r: (r["auc"], -r["p50_us"]))
+
+
+def print_pareto_table(results, front, recommended=None):
+    print(f"\n{'':2} {'trial':>5} {'trees':>6} {'depth':>5} {'lr':>8} "
+          f"{'AUC':>9} {'p50 µs':>8} {'p99 µs':>8}")
+    for r in sorted(results, key=lambda r: r["p50_us"]):
+        mark = "★" if recommended and r["trial_id"] == recommended["trial_id"] else (
+            "✓" if r["trial_id"] in front else "")
+        print(f"{mark:2} {r['trial_id']:>5} {r['best_rounds']:>6} {r['params'].get('max_depth', ''):>5} "
+              f"{r['params'].get('learning_rate', ''):>8} {r['auc']:>9.5f} "
+              f"{r['p50_us']:>8} {r['p99_us']:>8}")
+    print("\n✓ Pareto-optimal (AUC vs p50 latency)   ★ recommended")
+
+# --------------------------------------------------
+# MAIN
+# --------------------------------------------------
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time-budgeted ASHA search for the fraud XGBoost model")
+    parser.add_argument("--data", required=True, help="CSV / Parquet file or directory of part files")
+    parser.add_argument("--budget-s", type=float, default=BUDGET_S)
+    parser.add_argument("--workers", type=int, help="Concurrent trials (default: cores // 4)")
+    parser.add_argument("--nthread", type=int, help="XGBoost threads per trial (default: cores // workers)")
+    parser.add_argument("--max-trials", type=int, default=MAX_TRIALS)
+    parser.add_argument("--min-rounds", type=int, default=MIN_ROUNDS)
+    parser.add_argument("--max-rounds", type=int, default=MAX_ROUNDS)
+    parser.add_argument("--eta", type=int, default=ETA)
+    parser.add_argument("--latency-budget-us", type=float, help="Recommend the best AUC within this p50")
+    parser.add_argument("--output", help="Write the results JSON here")
+    parser.add_argument("--save-best", help="Save the recommended model (.joblib) here")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args(argv)
+
+    results = search(
+        args.data, budget_s=args.budget_s, workers=args.workers, nthread=args.nthread,
+        max_trials=args.max_trials, min_rounds=args.min_rounds, max_rounds=args.max_rounds,
+        eta=args.eta, seed=args.seed
+    )
+
+    rows = sample_rows(args.data)
+    for r in results:
+        r["p50_us"], r["p99_us"] = inference_latency(r["raw_model"], rows)
+
+    front = pareto_front(results)
+    recommended = recommend(results, args.latency_budget_us)
+    print_pareto_table(results, front, recommended)
+
+    if args.output:
+        report = {
+            "trials": [{k: v for k, v in r.items() if k != "raw_model"} for r in results],
+            "pareto": sorted(front),
+            "recommended": recommended["trial_id"] if recommended else None,
+        }
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n💾 Results saved to {args.output}")
+
+    if args.save_best:
+        if recommended is None:
+            print("❌ No trial within the latency budget, nothing saved")
+            return 1
+        booster = xgb.Booster(model_file=bytearray(recommended["raw_model"]))
+        dump(pipeline.to_classifier(booster), args.save_best)
+        print(f"💾 Trial {recommended['trial_id']} saved to {args.save_best}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
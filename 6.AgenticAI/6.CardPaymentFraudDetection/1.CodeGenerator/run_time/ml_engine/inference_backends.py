@@ -0,0 +1,209 @@
+"""
+Inference Backends for the XGBoost fraud model
+----------------------------------------------
+
+Every backend takes the float32 matrix built by `MLService.to_matrix`
+(booster feature order, NaN = missing) and returns P(fraud) per row.
+
+- sklearn : XGBClassifier.predict_proba (original path)
+- booster : native Booster.inplace_predict on NumPy arrays, no DMatrix
+- onnx    : ONNX Runtime session over an onnxmltools export of the model
+            (optional: pip install onnxruntime onnxmltools)
+- numpy   : pure NumPy tree walker generated from the model's JSON dump
+
+An early-stopped model is scored with its first `best_iteration + 1` rounds
+only, like predict_proba (see `iteration_range`).
+"""
+
+import copy
+import json
+import os
+
+import numpy as np
+
+
+def iteration_range(model):
+    """
+    Boosting rounds predict_proba uses: (0, best_iteration + 1) for an
+    early-stopped model, else (0, 0) = every round.
+    """
+    try:
+        return 0, int(model.best_iteration) + 1
+    except AttributeError:
+        return 0, 0
+
+
+class InferenceBackend:
+    name = ""
+
+    def __init__(self, model):
+        self.model = model
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        raise NotImplementedError
+
+
+class SklearnBackend(InferenceBackend):
+    name = "sklearn"
+
+    def predict(self, X):
+        return self.model.predict_proba(X)[:, 1]
+
+
+class BoosterBackend(InferenceBackend):
+    name = "booster"
+
+    def __init__(self, model):
+        super().__init__(model)
+        self.booster = model.get_booster()
+        self.iteration_range = iteration_range(model)
+
+    def predict(self, X):
+        return self.booster.inplace_predict(
+            X, iteration_range=self.iteration_range, validate_features=False
+        )
+
+
+class OnnxBackend(InferenceBackend):
+    name = "onnx"
+
+    def __init__(self, model, onnx_path=None):
+        super().__init__(model)
+        try:
+            import onnxruntime as ort
+        except ImportError:
+            raise ImportError("❌ onnx backend needs: pip install onnxruntime onnxmltools") from None
+
+        if onnx_path and os.path.exists(onnx_path):
+            with open(onnx_path, "rb") as f:
+                serialized = f.read()
+        else:
+            serialized = self._export(model)
+            if onnx_path:
+                with open(onnx_path, "wb") as f:
+                    f.write(serialized)
+
+        options = ort.SessionOptions()
+        options.intra_op_num_threads = 1
+        self.session = ort.InferenceSession(
+            serialized, options, providers=["CPUExecutionProvider"]
+        )
+        self.input_name = self.session.get_inputs()[0].name
+
+    @staticmethod
+    def _export(model) -> bytes:
+        from onnxmltools import convert_xgboost
+        from onnxmltools.convert.common.data_types import FloatTensorType
+
+        n_features = len(model.get_booster().feature_names)
+
+        # onnxmltools only understands the default f0..fN feature names
+        model = copy.deepcopy(model)
+        model.get_booster().feature_names = None
+
+        onnx_model = convert_xgboost(
+            model, initial_types=[("input", FloatTensorType([None, n_features]))]
+        )
+        return onnx_model.SerializeToString()
+
+    def predict(self, X):
+        _, probabilities = self.session.run(None, {self.input_name: X})
+        return probabilities[:, 1]
+
+
+class NumpyTreeBackend(InferenceBackend):
+    """
+    All trees flattened into one set of node arrays. Leaves point to
+    themselves, so walking every row through every tree `max_depth` times
+    lands each (row, tree) pair on its leaf.
+    """
+
+    name = "numpy"
+
+    def __init__(self, model):
+        super().__init__(model)
+        learner = json.loads(model.get_booster().save_raw("json"))["learner"]
+        gbtree = learner["gradient_booster"]["model"]
+
+        objective = learner["objective"]["name"]
+        if objective != "binary:logistic":
+            raise ValueError(f"❌ numpy backend supports binary:logistic only, got {objective}")
+
+        base_score = float(str(learner["learner_model_param"]["base_score"]).strip("[]"))
+        self.base_margin = np.float32(np.log(base_score / (1 - base_score)))
+
+        feature, threshold, left, right, missing, value, roots = [], [], [], [], [], [], []
+        self.max_depth = 0
+        offset = 0
+
+        trees = gbtree["trees"]
+        _, stop = iteration_range(model)
+        if stop:
+            # binary:logistic has one output group: num_parallel_tree trees per round
+            trees = trees[:stop * int(gbtree["gbtree_model_param"]["num_parallel_tree"])]
+
+        for tree in trees:
+            if any(tree.get("split_type", [])):
+                raise ValueError("❌ numpy backend does not support categorical splits")
+
+            lc = np.asarray(tree["left_children"], dtype=np.int32)
+            rc = np.asarray(tree["right_children"], dtype=np.int32)
+            n = len(lc)
+            ids = np.arange(n, dtype=np.int32)
+            is_leaf = lc == -1
+
+            conditions = np.asarray(tree["split_conditions"], dtype=np.float32)
+            default_left = np.asarray(tree["default_left"], dtype=bool)
+
+            feature.append(np.where(is_leaf, 0, tree["split_indices"]).astype(np.int32))
+            threshold.append(np.where(is_leaf, 0, conditions).astype(np.float32))
+            left.append(np.where(is_leaf, ids, lc) + offset)
+            right.append(np.where(is_leaf, ids, rc) + offset)
+            missing.append(np.where(is_leaf, ids, np.where(default_left, lc, rc)) + offset)
+            value.append(np.where(is_leaf, conditions, 0).astype(np.float32))
+            roots.append(offset)
+
+            # Children always have larger ids than their parent
+            depth = np.zeros(n, dtype=np.int32)
+            for node in range(n):
+                if not is_leaf[node]:
+                    depth[lc[node]] = depth[rc[node]] = depth[node] + 1
+            self.max_depth = max(self.max_depth, int(depth.max()))
+
+            offset += n
+
+        self.feature = np.concatenate(feature)
+        self.threshold = np.concatenate(threshold)
+        self.left = np.concatenate(left).astype(np.int32)
+        self.right = np.concatenate(right).astype(np.int32)
+        self.missing = np.concatenate(missing).astype(np.int32)
+        self.value = np.concatenate(value)
+        self.roots = np.asarray(roots, dtype=np.int32)
+
+    def predict(self, X):
+        X = np.asarray(X, dtype=np.float32)
+        rows = np.arange(len(X))[:, None]
+        nodes = np.broadcast_to(self.roots, (len(X), len(self.roots)))
+
+        for _ in range(self.max_depth):
+            x = X[rows, self.feature[nodes]]
+            nodes = np.where(
+                np.isnan(x),
+                self.missing[nodes],
+                np.where(x < self.threshold[nodes], self.left[nodes], self.right[nodes])
+            )
+
+        margin = self.value[nodes].sum(axis=1, dtype=np.float32) + self.base_margin
+        return 1.0 / (1.0 + np.exp(-margin))
+
+
+BACKENDS = {
+    backend.name: backend
+    for backend in [SklearnBackend, BoosterBackend, OnnxBackend, NumpyTreeBackend]
+}
+
+
+def create_backend(name, model, **options) -> InferenceBackend:
+    if name not in BACKENDS:
+        raise ValueError(f"❌ Unknown backend {name!r}, choose from {sorted(BACKENDS)}")
+    return BACKENDS[name](model, **options)
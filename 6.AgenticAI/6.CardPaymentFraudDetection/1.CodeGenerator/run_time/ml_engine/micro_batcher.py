@@ -0,0 +1,112 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+
+class MicroBatcher:
+    """
+    Gathers concurrent single-item calls into one batch call.
+
+    A background thread takes the first waiting item, then keeps collecting
+    until `max_batch_size` items are queued or `max_wait_us` microseconds have
+    passed, and resolves every caller from one `batch_fn(items)` call.
+
+    `close()` processes everything already queued; submitting afterwards
+    raises RuntimeError.
+    """
+
+    def __init__(self, batch_fn, max_batch_size=32, max_wait_us=200):
+        self.batch_fn = batch_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_us / 1_000_000
+        self.batches = 0
+        self.items = 0
+
+        self._queue = queue.SimpleQueue()
+        self._lock = threading.Lock()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="micro-batcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, item):
+        """Blocks until the batch containing `item` has been processed."""
+        return self.submit_async(item).result()
+
+    def submit_async(self, item) -> Future:
+        """Queue `item`; the Future resolves when its batch has been processed."""
+        future = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("❌ MicroBatcher is closed")
+            self._queue.put((item, future))
+        return future
+
+    def close(self):
+        with self._lock:
+            if not self._closed:
+                self._closed = True
+                self._queue.put(None)
+        self._thread.join()
+
+    def _run(self):
+        try:
+            while True:
+                first = self._queue.get()
+                if first is None:
+                    return
+
+                batch, closing = self._collect(first)
+                self._process(batch)
+
+                if closing:
+                    return
+        finally:
+            self._fail_pending()
+
+    def _fail_pending(self):
+        """Nothing is processed once the worker stops: fail whatever is left."""
+        while True:
+            try:
+                entry = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            if entry is not None:
+                entry[1].set_exception(RuntimeError("❌ MicroBatcher is closed"))
+
+    def _collect(self, first):
+        batch = [first]
+        deadline = time.perf_counter() + self.max_wait
+
+        while len(batch) < self.max_batch_size:
+            try:
+                # Drain whatever is already queued before waiting
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+
+            if item is None:
+                return batch, True
+            batch.append(item)
+
+        return batch, False
+
+    def _process(self, batch):
+        self.batches += 1
+        self.items += len(batch)
+
+        try:
+            results = self.batch_fn([item for item, _ in batch])
+        except Exception as e:
+            for _, future in batch:
+                future.set_exception(e)
+            return
+
+        for (_, future), result in zip(batch, results):
+            future.set_result(result)
@@ -0,0 +1,294 @@
+"""
+Fraud Model Compaction
+----------------------
+
+Builds smaller variants of a trained fraud model and reports validation
+AUC against measured `MLService.score` latency for each:
+- truncate : the first k trees (`booster[:k]`); k = the tree count with
+             the best validation AUC, plus TRUNCATE_FRACTIONS of the model
+- prune    : retrained (same PARAMS as training_pipeline) on only the
+             features holding at least PRUNE_THRESHOLDS of total gain;
+             fewer features also means less to compute upstream
+- distill  : shallower students (STUDENT_DEPTHS) trained on the teacher's
+             probabilities over the features the teacher uses
+
+All candidates share the seeded train / validation split of
+training_pipeline; retrained candidates early-stop on the validation
+window, so their AUC is slightly optimistic (as in hyperparameter_search).
+
+Latency is `MLService.score` (any inference backend, `--backend`) on
+single transactions holding only the candidate's features, p50 / p99 over
+LATENCY_SAMPLES validation rows.
+
+Usage (from 1.CodeGenerator/):
+    python -m run_time.ml_engine.model_compaction --model fraud_xgboost_model.joblib \
+        --data taining_data/rule_compatible_fraud_data.csv --max-auc-drop 0.002 \
+        --save-best fraud_xgboost_model.compact.joblib
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+
+import numpy as np
+import xgboost as xgb
+from joblib import dump, load
+from sklearn.metrics import roc_auc_score
+
+from run_time.ml_engine import training_pipeline as pipeline
+from run_time.ml_engine.fraud_detection_service_using_ml import MLService
+from run_time.ml_engine.model_refresh import load_labelled, split_holdout
+
+# --------------------------------------------------
+# CONFIGURATION
+# --------------------------------------------------
+
+TRUNCATE_FRACTIONS = [0.25, 0.5]
+TRUNCATE_STEPS = 40                 # tree counts scanned for the best-AUC prefix
+PRUNE_THRESHOLDS = [0.001, 0.01]    # minimum share of total gain to keep a feature
+STUDENT_DEPTHS = [3, 4]
+STUDENT_LEARNING_RATE = 0.1
+EARLY_STOPPING_ROUNDS = 20
+LATENCY_SAMPLES = 500
+
+# --------------------------------------------------
+# MODEL FACTS
+# --------------------------------------------------
+
+def max_depth(booster: xgb.Booster) -> int:
+    """Deepest tree actually grown (a loaded model does not keep its training max_depth)."""
+    deepest = 0
+    for tree in booster.get_dump(dump_format="json"):
+        stack = [json.loads(tree)]
+        while stack:
+            node = stack.pop()
+            if "children" in node:
+                deepest = max(deepest, node["depth"] + 1)
+                stack.extend(node["children"])
+    return deepest
+
+
+def gain_shares(booster: xgb.Booster) -> dict:
+    """Share of total split gain per feature (0 for features no tree uses)."""
+    gain = booster.get_score(importance_type="total_gain")
+    total = sum(gain.values()) or 1.0
+    return {f: gain.get(f, 0.0) / total for f in booster.feature_names}
+
+
+def auc(booster, X, y, trees=None) -> float:
+    iteration_range = (0, trees) if trees else (0, 0)
+    scores = booster.inplace_predict(X, iteration_range=iteration_range)
+    return float(roc_auc_score(y, scores))
+
+# --------------------------------------------------
+# CANDIDATES
+# --------------------------------------------------
+
+def best_prefix(booster, X_val, y_val, steps=TRUNCATE_STEPS):
+    """(trees, auc) of the best-AUC prefix among `steps` evenly spaced tree counts."""
+    total = booster.num_boosted_rounds()
+    counts = sorted({max(1, round(total * i / steps)) for i in range(1, steps + 1)})
+    curve = [(k, auc(booster, X_val, y_val, k)) for k in counts]
+    # Highest AUC; fewest trees on ties
+    return max(curve, key=lambda point: (point[1], -point[0]))
+
+
+def retrain(X_train, y_train, X_val, y_val, params, rounds):
+    dtrain = xgb.DMatrix(X_train, label=y_train)
+    dval = xgb.DMatrix(X_val, label=y_val)
+    booster = xgb.train(
+        params, dtrain, num_boost_round=rounds, evals=[(dval, "validation")],
+        early_stopping_rounds=EARLY_STOPPING_ROUNDS, verbose_eval=False
+    )
+    return booster[:booster.best_iteration + 1]
+
+
+def distill(teacher, X_train, X_val, y_val, features, depth, rounds):
+    """Student of depth `depth` fitted to the teacher's probabilities on `features`."""
+    soft_labels = teacher.inplace_predict(X_train)
+    params = {
+        **pipeline.PARAMS,
+        "max_depth": depth,
+        "learning_rate": STUDENT_LEARNING_RATE,
+    }
+    return retrain(X_train[features], soft_labels, X_val[features], y_val, params, rounds)
+
+
+def build_candidates(teacher, X_train, y_train, X_val, y_val, truncate_fractions=TRUNCATE_FRACTIONS,
+                     prune_thresholds=PRUNE_THRESHOLDS, student_depths=STUDENT_DEPTHS, verbose=True):
+    """[(name, kind, booster)] starting with the unchanged teacher."""
+    total = teacher.num_boosted_rounds()
+    candidates = [("baseline", "baseline", teacher)]
+
+    best_trees, _ = best_prefix(teacher, X_val, y_val)
+    tree_counts = {best_trees} | {max(1, int(total * f)) for f in truncate_fractions}
+    for k in sorted(tree_counts):
+        if k < total:
+            candidates.append((f"truncate_{k}", "truncate", teacher[:k]))
+
+    scale_pos_weight = (len(y_train) - y_train.sum()) / max(int(y_train.sum()), 1)
+    params = {**pipeline.PARAMS, "scale_pos_weight": float(scale_pos_weight)}
+    shares = gain_shares(teacher)
+
+    for threshold in prune_thresholds:
+        kept = [f for f in teacher.feature_names if shares[f] >= threshold]
+        if verbose:
+            print(f"✂️ prune ≥{threshold:.2%} gain: {len(kept)}/{len(shares)} features")
+        booster = retrain(X_train[kept], y_train, X_val[kept], y_val, params, total)
+        candidates.append((f"prune_{threshold:g}", "prune", booster))
+
+    used = [f for f in teacher.feature_names if shares[f] > 0]
+    for depth in student_depths:
+        if verbose:
+            print(f"🎓 distilling depth-{depth} student on {len(used)} features")
+        booster = distill(teacher, X_train, X_val, y_val, used, depth, total)
+        candidates.append((f"distill_d{depth}", "distill", booster))
+
+    return candidates
+
+# --------------------------------------------------
+# MEASUREMENT
+# --------------------------------------------------
+
+def score_latency(model_path, transactions, backend="booster"):
+    """p50 / p99 microseconds of `MLService.score` over single transactions."""
+    service = MLService(model_path, backend=backend)
+    for t in transactions[:20]:
+        service.score(t)
+
+    latencies = np.empty(len(transactions))
+    for i, t in enumerate(transactions):
+        start = time.perf_counter()
+        service.score(t)
+        latencies[i] = time.perf_counter() - start
+
+    us = latencies * 1e6
+    return round(float(np.percentile(us, 50)), 1), round(float(np.percentile(us, 99)), 1)
+
+
+def measure(candidates, X_val, y_val, samples=LATENCY_SAMPLES, backend="booster", verbose=True):
+    """Report row per candidate: size, AUC and MLService.score latency."""
+    rows = X_val.iloc[:samples]
+    results = []
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, kind, booster in candidates:
+            features = booster.feature_names
+            path = os.path.join(tmp, f"{name}.joblib")
+            dump(pipeline.to_classifier(booster), path)
+
+            p50, p99 = score_latency(path, rows[features].to_dict("records"), backend)
+            result = {
+                "name": name,
+                "kind": kind,
+                "trees": booster.num_boosted_rounds(),
+                "max_depth": max_depth(booster),
+                "features": len(features),
+                "auc": round(auc(booster, X_val[features], y_val), 6),
+                "p50_us": p50,
+                "p99_us": p99,
+                "size_kb": round(os.path.getsize(path) / 1024, 1),
+                "booster": booster,
+            }
+            results.append(result)
+            if verbose:
+                print(f"  {name:<18} AUC {result['auc']:.5f}  p50 {p50}µs")
+
+    return results
+
+
+def compact(model_path, data_path, samples=LATENCY_SAMPLES, backend="booster", verbose=True,
+            **candidate_options):
+    """Build and measure every compaction candidate of the model at `model_path`."""
+    teacher = load(model_path).get_booster()
+    X, y = load_labelled(data_path, teacher.feature_names)
+    X_train, y_train, X_val, y_val = split_holdout(X, y)
+
+    if y_val.nunique() < 2:
+        raise ValueError("❌ Validation window needs both fraud and genuine rows")
+
+    if verbose:
+        print(f"📊 {len(X_train)} train / {len(X_val)} validation rows, "
+              f"{teacher.num_boosted_rounds()} trees over {len(teacher.feature_names)} features")
+
+    candidates = build_candidates(teacher, X_train, y_train, X_val, y_val, verbose=verbose, **candidate_options)
+    return measure(candidates, X_val, y_val, samples, backend, verbose)
+
+# --------------------------------------------------
+# REPORT
+# --------------------------------------------------
+
+def pareto_front(results):
+    """Names no other candidate beats on both AUC (higher) and p50 latency (lower)."""
+    front = set()
+    for r in results:
+        dominated = any(
+            o["auc"] >= r["auc"] and o["p50_us"] <= r["p50_us"]
+            and (o["auc"] > r["auc"] or o["p50_us"] < r["p50_us"])
+            for o in results
+        )
+        if not dominated:
+            front.add(r["name"])
+    return front
+
+
+def recommend(results, max_auc_drop=0.0):
+    """Fastest candidate whose AUC is within `max_auc_drop` of the baseline."""
+    baseline = next(r for r in results if r["kind"] == "baseline")
+    eligible = [r for r in results if r["auc"] >= baseline["auc"] - max_auc_drop]
+    return min(eligible, key=lambda r: (r["p50_us"], -r["auc"]))
+
+
+def print_report(results, front, recommended=None):
+    print(f"\n{'':2} {'candidate':<18} {'trees':>6} {'depth':>5} {'feats':>5} "
+          f"{'AUC':>9} {'p50 µs':>8} {'p99 µs':>8} {'KB':>8}")
+    for r in sorted(results, key=lambda r: r["p50_us"]):
+        mark = "★" if recommended and r["name"] == recommended["name"] else (
+            "✓" if r["name"] in front else "")
+        print(f"{mark:2} {r['name']:<18} {r['trees']:>6} {r['max_depth']:>5} {r['features']:>5} "
+              f"{r['auc']:>9.5f} {r['p50_us']:>8} {r['p99_us']:>8} {r['size_kb']:>8}")
+    print("\n✓ Pareto-optimal (AUC vs p50 latency)   ★ recommended")
+
+# --------------------------------------------------
+# MAIN
+# --------------------------------------------------
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compact the fraud XGBoost model for cheaper inference")
+    parser.add_argument("--model", required=True, help="Trained model (.joblib)")
+    parser.add_argument("--data", required=True, help="Labelled CSV / Parquet file or directory")
+    parser.add_argument("--samples", type=int, default=LATENCY_SAMPLES, help="Transactions timed per candidate")
+    parser.add_argument("--backend", default="booster", help="MLService inference backend to time")
+    parser.add_argument("--max-auc-drop", type=float, default=0.0,
+                        help="Recommend the fastest candidate within this AUC of the baseline")
+    parser.add_argument("--output", help="Write the report JSON here")
+    parser.add_argument("--save-best", help="Save the recommended model (.joblib) here")
+    args = parser.parse_args(argv)
+
+    results = compact(args.model, args.data, samples=args.samples, backend=args.backend)
+    front = pareto_front(results)
+    recommended = recommend(results, args.max_auc_drop)
+    print_report(results, front, recommended)
+
+    if args.output:
+        report = {
+            "candidates": [{k: v for k, v in r.items() if k != "booster"} for r in results],
+            "pareto": sorted(front),
+            "recommended": recommended["name"],
+        }
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n💾 Report saved to {args.output}")
+
+    if args.save_best:
+        dump(pipeline.to_classifier(recommended["booster"]), args.save_best)
+        print(f"💾 {recommended['name']} saved to {args.save_best} "
+              f"({recommended['features']} features: {', '.join(recommended['booster'].feature_names)})")
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
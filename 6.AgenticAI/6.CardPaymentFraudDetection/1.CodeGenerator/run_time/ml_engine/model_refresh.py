@@ -0,0 +1,166 @@
+"""
+Incremental Fraud Model Refresh
+-------------------------------
+
+Updates an existing fraud_xgboost_model.joblib from a new labelled batch
+instead of retraining from scratch:
+- add_trees       : continue boosting, `--rounds` new trees on the new batch
+- refresh_leaves  : keep every tree's structure, recompute leaf values
+                    from the new batch (XGBoost "refresh" updater)
+
+The candidate is scored against the incumbent on a held-out window (a
+separate file, or a seeded share of the new batch) and promoted only if
+its AUC is at least the incumbent's minus `--auc-tolerance`. Promotion
+replaces the model file atomically; the previous model is kept as
+<model>.prev.
+
+Usage (from 1.CodeGenerator/):
+    python -m run_time.ml_engine.model_refresh --model artifacts/model/fraud_xgboost_model.joblib \
+        --data taining_data/new_labels.csv --holdout taining_data/holdout.csv
+"""
+
+import argparse
+import os
+import shutil
+import time
+
+import pandas as pd
+import xgboost as xgb
+from joblib import dump, load
+from sklearn.metrics import roc_auc_score
+
+from run_time.ml_engine import training_pipeline as pipeline
+
+# --------------------------------------------------
+# CONFIGURATION
+# --------------------------------------------------
+
+MODES = ["add_trees", "refresh_leaves"]
+ADD_ROUNDS = 50
+AUC_TOLERANCE = 0.0
+
+# --------------------------------------------------
+# DATA
+# --------------------------------------------------
+
+def load_labelled(path, features):
+    """(X, y) in the booster's feature order; absent features are 0, as in MLService."""
+    df = pd.concat(pipeline.read_chunks(path), ignore_index=True)
+    if pipeline.TARGET_COL not in df.columns:
+        raise ValueError("❌ label column not found")
+    y = df.pop(pipeline.TARGET_COL)
+    return df.reindex(columns=features, fill_value=0), y
+
+
+def split_holdout(X, y, test_size=pipeline.TEST_SIZE):
+    holdout = pipeline.split_mask(len(X), 0, test_size)
+    return X[~holdout], y[~holdout], X[holdout], y[holdout]
+
+# --------------------------------------------------
+# REFRESH
+# --------------------------------------------------
+
+def _train_params(booster: xgb.Booster) -> dict:
+    """
+    The incumbent's own training parameters (depth, learning rate, sampling,
+    class weighting) over the pipeline defaults, so the trees added or
+    refreshed match a searched or distilled model instead of PARAMS.
+    """
+    return {**pipeline.PARAMS, **pipeline.training_params(booster)}
+
+
+def refresh(model_path, data_path, holdout_path=None, mode="add_trees",
+            rounds=ADD_ROUNDS, auc_tolerance=AUC_TOLERANCE, output_path=None):
+    """
+    Build a candidate from `model_path` + the batch at `data_path` and
+    promote it to `output_path` (default: `model_path`) if AUC holds.
+    Returns a report dict.
+    """
+    if mode not in MODES:
+        raise ValueError(f"Unknown refresh mode '{mode}'. Available: {', '.join(MODES)}")
+
+    start = time.perf_counter()
+    incumbent = load(model_path)
+    booster = incumbent.get_booster()
+    features = booster.feature_names
+
+    X, y = load_labelled(data_path, features)
+    if holdout_path:
+        X_holdout, y_holdout = load_labelled(holdout_path, features)
+    else:
+        X, y, X_holdout, y_holdout = split_holdout(X, y)
+
+    if y_holdout.nunique() < 2:
+        raise ValueError("❌ Held-out window needs both fraud and genuine rows")
+
+    dtrain = xgb.DMatrix(X, label=y)
+    params = _train_params(booster)
+
+    if mode == "add_trees":
+        candidate = xgb.train(params, dtrain, num_boost_round=rounds, xgb_model=booster)
+    else:
+        params.pop("tree_method")
+        params.update({"process_type": "update", "updater": "refresh", "refresh_leaf": True})
+        candidate = xgb.train(
+            params, dtrain, num_boost_round=booster.num_boosted_rounds(), xgb_model=booster
+        )
+
+    dholdout = xgb.DMatrix(X_holdout)
+    incumbent_auc = roc_auc_score(y_holdout, booster.predict(dholdout))
+    candidate_auc = roc_auc_score(y_holdout, candidate.predict(dholdout))
+    promoted = candidate_auc >= incumbent_auc - auc_tolerance
+
+    output_path = output_path or model_path
+    if promoted:
+        if os.path.exists(output_path):
+            shutil.copy2(output_path, output_path + ".prev")
+        tmp_path = output_path + ".tmp"
+        dump(pipeline.to_classifier(candidate), tmp_path)
+        os.replace(tmp_path, output_path)
+
+    return {
+        "mode": mode,
+        "rows": len(X),
+        "holdout_rows": len(X_holdout),
+        "trees_before": booster.num_boosted_rounds(),
+        "trees_after": candidate.num_boosted_rounds(),
+        "incumbent_auc": round(float(incumbent_auc), 6),
+        "candidate_auc": round(float(candidate_auc), 6),
+        "promoted": bool(promoted),
+        "wall_seconds": round(time.perf_counter() - start, 2),
+    }
+
+# --------------------------------------------------
+# MAIN
+# --------------------------------------------------
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Incremental fraud model refresh")
+    parser.add_argument("--model", required=True, help="Incumbent model (.joblib)")
+    parser.add_argument("--data", required=True, help="New labelled batch (CSV / Parquet / directory)")
+    parser.add_argument("--holdout", help="Held-out window; default: a seeded share of --data")
+    parser.add_argument("--mode", choices=MODES, default="add_trees")
+    parser.add_argument("--rounds", type=int, default=ADD_ROUNDS, help="Trees added in add_trees mode")
+    parser.add_argument("--auc-tolerance", type=float, default=AUC_TOLERANCE)
+    parser.add_argument("--output", help="Promote to this path instead of replacing --model")
+    args = parser.parse_args(argv)
+
+    report = refresh(
+        args.model, args.data, holdout_path=args.holdout, mode=args.mode, rounds=args.rounds,
+        auc_tolerance=args.auc_tolerance, output_path=args.output
+    )
+
+    print(f"\n🔁 Mode: {report['mode']} ({report['trees_before']} → {report['trees_after']} trees)")
+    print(f"📊 Rows: {report['rows']} train, {report['holdout_rows']} held out")
+    print(f"📈 AUC incumbent: {report['incumbent_auc']}  candidate: {report['candidate_auc']}")
+    print(f"⏱️ {report['wall_seconds']}s")
+
+    if report["promoted"]:
+        print(f"✅ Candidate promoted to {args.output or args.model}")
+    else:
+        print("❌ Candidate rejected: AUC dropped beyond tolerance, incumbent kept")
+    return 0 if report["promoted"] else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
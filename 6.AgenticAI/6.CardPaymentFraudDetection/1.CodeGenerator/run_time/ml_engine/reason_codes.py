@@ -0,0 +1,179 @@
+"""
+ML Reason Codes
+---------------
+
+Top-k feature contributions behind a model score, from XGBoost's native
+TreeSHAP (`Booster.predict(pred_contribs=True)`):
+- Only features pushing the score towards fraud (positive contribution)
+  are reported, largest first
+- Concurrent requests are gathered by a MicroBatcher into one
+  `pred_contribs` call
+- Results are cached (LRU) by model version + the transaction's float32
+  feature vector; every call reads the live model of `ml_service`, so an
+  `MLService.reload` is picked up (and clears the cache)
+- `explain` waits at most `budget_ms`; past that it returns the model's
+  global gain importances instead, and the late result still lands in the
+  cache for the next identical feature vector
+
+`explain_batch` computes contributions for many transactions at once with
+no budget (backtests, offline dispute packs).
+"""
+
+import threading
+from collections import OrderedDict
+from concurrent.futures import TimeoutError
+
+import numpy as np
+import xgboost as xgb
+
+from run_time.ml_engine.inference_backends import iteration_range
+from run_time.ml_engine.micro_batcher import MicroBatcher
+
+# --------------------------------------------------
+# CONFIGURATION
+# --------------------------------------------------
+
+TOP_K = 3
+BUDGET_MS = 2.0
+CACHE_SIZE = 10_000
+MAX_BATCH_SIZE = 64
+MAX_WAIT_US = 0      # batch only what is already queued; never delay a lone request
+
+SOURCE_CONTRIBS = "pred_contribs"
+SOURCE_CACHE = "cache"
+SOURCE_GLOBAL = "global_importance"
+
+
+class ReasonCodeExplainer:
+    def __init__(self, ml_service, top_k=TOP_K, budget_ms=BUDGET_MS, cache_size=CACHE_SIZE,
+                 max_batch_size=MAX_BATCH_SIZE, max_wait_us=MAX_WAIT_US):
+        self.ml_service = ml_service
+        self.top_k = top_k
+        self.budget_s = budget_ms / 1000
+        self.cache_size = cache_size
+
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.fallbacks = 0
+
+        self._global = (None, None)   # (LoadedModel, its global reasons)
+        ml_service.add_listener(self._on_reload)
+
+        self.batcher = MicroBatcher(
+            self._explain_rows, max_batch_size=max_batch_size, max_wait_us=max_wait_us
+        )
+
+    # --------------------------------------------------
+    # PUBLIC
+    # --------------------------------------------------
+
+    @property
+    def global_reasons(self):
+        """Top-k gain importances of the live model."""
+        return self._global_reasons(self.ml_service.loaded)
+
+    def explain(self, transaction: dict):
+        """(reasons, source) for one transaction, within the time budget."""
+        loaded = self.ml_service.loaded
+        row = self.ml_service.to_matrix([transaction], loaded)[0]
+        key = (loaded.version, row.tobytes())
+
+        cached = self._cached(key)
+        if cached is not None:
+            return cached, SOURCE_CACHE
+
+        future = self.batcher.submit_async((loaded, row))
+        try:
+            return future.result(timeout=self.budget_s), SOURCE_CONTRIBS
+        except TimeoutError:
+            self.fallbacks += 1
+            return self._global_reasons(loaded), SOURCE_GLOBAL
+
+    def explain_batch(self, transactions):
+        """Top-k reasons per transaction (list of dicts or DataFrame), no time budget."""
+        loaded = self.ml_service.loaded
+        return self._explain_matrix(loaded, self.ml_service.to_matrix(transactions, loaded))
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "fallbacks": self.fallbacks,
+            "cached": len(self._cache),
+        }
+
+    def close(self):
+        self.batcher.close()
+
+    # --------------------------------------------------
+    # INTERNALS
+    # --------------------------------------------------
+
+    def _on_reload(self, loaded):
+        """MLService reload listener: entries of the previous model can never hit again."""
+        with self._lock:
+            self._cache.clear()
+
+    def _global_reasons(self, loaded):
+        model, reasons = self._global
+        if model is not loaded:
+            gain = loaded.model.get_booster().get_score(importance_type="gain")
+            ranked = sorted(gain.items(), key=lambda item: item[1], reverse=True)
+            reasons = [
+                {"feature": feature, "importance": round(float(value), 4)}
+                for feature, value in ranked[:self.top_k]
+            ]
+            self._global = (loaded, reasons)
+        return reasons
+
+    def _contributions(self, loaded, X: np.ndarray) -> np.ndarray:
+        X = np.asarray(X, dtype=np.float32)
+        contribs = loaded.model.get_booster().predict(
+            xgb.DMatrix(X), pred_contribs=True,
+            iteration_range=iteration_range(loaded.model), validate_features=False,
+        )
+        return contribs[:, :-1]   # last column is the bias
+
+    def _top_k(self, features, row_contribs):
+        order = np.argsort(-row_contribs)[:self.top_k]
+        return [
+            {"feature": features[j], "contribution": round(float(row_contribs[j]), 4)}
+            for j in order if row_contribs[j] > 0
+        ]
+
+    def _explain_matrix(self, loaded, X):
+        reasons = [self._top_k(loaded.features, c) for c in self._contributions(loaded, X)]
+        for row, row_reasons in zip(X, reasons):
+            self._store((loaded.version, row.tobytes()), row_reasons)
+        return reasons
+
+    def _explain_rows(self, items):
+        """MicroBatcher target: (LoadedModel, row) items, one pred_contribs call per model."""
+        reasons = [None] * len(items)
+        groups = {}
+        for i, (loaded, _) in enumerate(items):
+            groups.setdefault(loaded, []).append(i)
+        for loaded, indices in groups.items():
+            X = np.vstack([items[i][1] for i in indices])
+            for i, row_reasons in zip(indices, self._explain_matrix(loaded, X)):
+                reasons[i] = row_reasons
+        return reasons
+
+    def _cached(self, key):
+        with self._lock:
+            reasons = self._cache.get(key)
+            if reasons is None:
+                self.misses += 1
+                return None
+            self._cache.move_to_end(key)
+            self.hits += 1
+            return reasons
+
+    def _store(self, key, reasons):
+        with self._lock:
+            self._cache[key] = reasons
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
@@ -0,0 +1,110 @@
+"""
+Score Cache
+-----------
+
+LRU + TTL cache of `MLService.score` results for retried / duplicated
+authorizations, which send byte-identical feature vectors within seconds.
+
+- Key: the bytes of the float32 model row (booster feature order), so two
+  transactions share an entry only if the model would see exactly the same
+  input; the dict hashes it once (SipHash, cached on the key object)
+- Every entry carries the model version it was scored with and is served
+  only to that version; MLService.reload also invalidates the whole cache
+- Bounded by `max_entries` and by `max_bytes` (key + ENTRY_OVERHEAD_BYTES per
+  entry); the least recently used entry goes first
+- Entries older than `ttl_s` are never served (dropped on lookup)
+
+Usage:
+    ml_service = MLService(model_path, score_cache=ScoreCache(ttl_s=30))
+    ...
+    ml_service.score_cache.stats()
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+# --------------------------------------------------
+# CONFIGURATION
+# --------------------------------------------------
+
+MAX_ENTRIES = 100_000
+MAX_BYTES = 64 * 1024 ** 2
+TTL_S = 30.0
+ENTRY_OVERHEAD_BYTES = 400   # ordered dict node, value tuple, result dict (measured roughly)
+
+
+class ScoreCache:
+    def __init__(self, max_entries=MAX_ENTRIES, max_bytes=MAX_BYTES, ttl_s=TTL_S, clock=time.monotonic):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_s = ttl_s
+        self.clock = clock
+
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.bytes = 0
+
+        self._entries = OrderedDict()   # key → (version, expires_at, result)
+        self._lock = threading.Lock()
+
+    def get(self, version, key: bytes):
+        """Cached result for `key` scored by model `version`, or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            entry_version, expires_at, result = entry
+            if entry_version != version or expires_at <= self.clock():
+                if entry_version == version:
+                    self.expired += 1
+                self._remove(key)
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return result
+
+    def put(self, version, key: bytes, result):
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (version, self.clock() + self.ttl_s, result)
+            self.bytes += len(key) + ENTRY_OVERHEAD_BYTES
+
+            while self._entries and (len(self._entries) > self.max_entries or self.bytes > self.max_bytes):
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def invalidate(self):
+        """Drop every entry (model reload)."""
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+            self.invalidations += 1
+
+    def _remove(self, key):
+        del self._entries[key]
+        self.bytes -= len(key) + ENTRY_OVERHEAD_BYTES
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self.bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "expired": self.expired,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
@@ -0,0 +1,395 @@
+"""
+Out-of-core Fraud Model Training
+--------------------------------
+
+Same model and hyper-parameters as fraud_detection_model_build.py, without
+ever holding the training set in a DataFrame:
+- Columns are read with a compact schema (bool → int8, small ints → int8 /
+  int16 / int32, floats → float32) from CSV, Parquet, or a directory of
+  part files (see taining_data/vectorized_data_generator.py)
+- Chunks feed XGBoost through a DataIter into a QuantileDMatrix, or an
+  ExtMemQuantileDMatrix (pages cached on disk) with --external-memory,
+  so training sets larger than RAM work
+- The input is parsed once into typed chunks pickled in a temporary
+  cache directory; XGBoost's repeated passes read those, not the text
+- Each row goes to train or validation by a per-chunk seeded draw
+  (TEST_SIZE), so the split is reproducible without a full-data shuffle
+
+Missing values are filled with 0 as in the original script; an int or bool
+column holding one is read as float32 for that chunk. SCHEMA int types are
+the usual ranges: a chunk whose values do not fit is widened (int8 → int16
+→ int32 → int64) rather than wrapped.
+
+Output: an XGBClassifier saved with joblib, loadable by MLService.
+
+Usage (from 1.CodeGenerator/):
+    python -m run_time.ml_engine.training_pipeline --data taining_data/rule_compatible_fraud_data.csv
+    python -m run_time.ml_engine.training_pipeline --data taining_data/fraud_100m --external-memory
+"""
+
+import argparse
+import json
+import os
+import resource
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+import xgboost as xgb
+from joblib import dump
+from sklearn.metrics import roc_auc_score
+
+# --------------------------------------------------
+# CONFIGURATION
+# --------------------------------------------------
+
+MODEL_FILE = "fraud_xgboost_model.joblib"
+
+TARGET_COL = "label"
+ID_COLS = ["transaction_id"]
+
+TEST_SIZE = 0.2
+RANDOM_STATE = 42
+CHUNK_ROWS = 250_000
+
+PARAMS = {
+    "objective": "binary:logistic",
+    "eval_metric": "auc",
+    "max_depth": 7,
+    "learning_rate": 0.05,
+    "subsample": 0.8,
+    "colsample_bytree": 0.8,
+    "tree_method": "hist",
+    "seed": RANDOM_STATE,
+}
+NUM_BOOST_ROUND = 400
+
+# Tree-growing parameters kept with a saved model (`training_params`), by type;
+# names as in PARAMS (XGBoost aliases like eta / lambda would not override them)
+TRAIN_PARAM_TYPES = {
+    "max_depth": int, "learning_rate": float, "subsample": float, "colsample_bytree": float,
+    "colsample_bylevel": float, "colsample_bynode": float, "min_child_weight": float,
+    "reg_lambda": float, "reg_alpha": float, "gamma": float, "max_bin": int,
+}
+TRAIN_PARAMS_ATTR = "train_params"
+
+# Value ranges of taining_data/sample_data_generator.py; columns not listed
+# here are read as float32. Int types are the narrowest for those ranges,
+# widened per chunk when the data goes beyond them (see `_typed`)
+SCHEMA = {
+    "time_since_block": "int32",
+    "txn_velocity_5m": "int8",
+    "geo_distance_km": "int16",
+    "hour_of_day": "int8",
+    "otp_result": "bool",
+    "vpn_detected": "bool",
+    "mcc_risk_score": "int8",
+    "sim_swap_days": "int16",
+    "profile_change_recency": "int16",
+    "wallet_age_minutes": "int32",
+    "txn_density": "float32",
+    "is_first_international": "bool",
+    "time_gap": "int16",
+    "wallets_per_card": "int8",
+    "atm_risk_score": "int8",
+    "pos_decline_then_atm": "bool",
+    "cvv_fail_rate": "int8",
+    "expiry_fail_pattern": "int8",
+    "screen_overlay_detected": "bool",
+    "keylogger_detected": "bool",
+    "suspicious_app_usage": "bool",
+    "refund_card_mismatch": "bool",
+    "refund_without_sale": "bool",
+    "refund_latency": "int16",
+    "salary_cycle_deviation": "float32",
+    "mcc_entropy": "float32",
+    "app_inactive_days": "int16",
+    "peer_spend_zscore": "float32",
+    "offline_contactless": "bool",
+    "card_age_days": "int16",
+    "credit_history_length": "int8",
+    "amount_spike_ratio": "float32",
+    TARGET_COL: "int8",
+}
+INT_WIDENING = ["int8", "int16", "int32", "int64"]
+
+# --------------------------------------------------
+# READING
+# --------------------------------------------------
+
+def data_files(path):
+    """`path` itself, or the sorted .csv / .parquet part files of a directory."""
+    if not os.path.isdir(path):
+        return [path]
+    files = sorted(
+        os.path.join(path, f) for f in os.listdir(path)
+        if f.endswith((".csv", ".parquet"))
+    )
+    if not files:
+        raise ValueError(f"❌ No .csv or .parquet files in {path}")
+    return files
+
+
+def _int_dtype(col, values, dtype):
+    """`dtype` or the next wider int type holding every value of the column."""
+    low, high = values.min(), values.max()
+    for candidate in INT_WIDENING[INT_WIDENING.index(dtype):]:
+        info = np.iinfo(candidate)
+        if info.min <= low and high <= info.max:
+            return candidate
+    raise ValueError(f"❌ Column {col}: values {low}..{high} do not fit in int64")
+
+
+def _typed(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Apply SCHEMA in place: bool → int8 (zero copy), ints narrowed without
+    wrapping, missing values → 0 (an int / bool column with one → float32).
+    """
+    for col in df.columns:
+        dtype = SCHEMA.get(col, "float32")
+        values = df[col]
+        if dtype != "float32" and values.isna().any():
+            values = values.astype("boolean") if dtype == "bool" else values
+            dtype = "float32"
+        elif dtype in INT_WIDENING and values.dtype.kind == "f" and (values % 1).any():
+            # Fractional values in an int column: keep them
+            dtype = "float32"
+
+        if dtype == "bool":
+            df[col] = values.to_numpy(dtype=bool).view(np.int8)
+        elif dtype == "float32":
+            df[col] = values.astype(np.float32).fillna(0)
+        else:
+            dtype = _int_dtype(col, values, dtype)
+            if values.dtype != dtype:
+                df[col] = values.astype(dtype)
+    return df
+
+
+def read_chunks(path, chunk_rows=CHUNK_ROWS):
+    """Typed DataFrame chunks of at most `chunk_rows` rows, ID columns dropped."""
+    for file in data_files(path):
+        if file.endswith(".parquet"):
+            try:
+                import pyarrow.parquet as pq
+            except ImportError:
+                raise ImportError("❌ Parquet input needs: pip install pyarrow") from None
+
+            parquet = pq.ParquetFile(file)
+            columns = [c for c in parquet.schema_arrow.names if c not in ID_COLS]
+            for batch in parquet.iter_batches(batch_size=chunk_rows, columns=columns):
+                yield _typed(batch.to_pandas())
+        else:
+            header = pd.read_csv(file, nrows=0).columns
+            columns = [c for c in header if c not in ID_COLS]
+            # Int / bool columns are parsed at full width and narrowed by _typed
+            dtype = {c: "float32" for c in columns if SCHEMA.get(c, "float32") == "float32"}
+            yield from (
+                _typed(chunk) for chunk in
+                pd.read_csv(file, usecols=columns, dtype=dtype, chunksize=chunk_rows)
+            )
+
+# --------------------------------------------------
+# XGBOOST DATA ITERATOR
+# --------------------------------------------------
+
+def split_mask(n, chunk, test_size=TEST_SIZE, seed=RANDOM_STATE):
+    """True for validation rows; depends only on (seed, chunk number)."""
+    return np.random.default_rng([seed, chunk]).random(n) < test_size
+
+
+def spill_chunks(data_path, cache_dir, chunk_rows=CHUNK_ROWS, test_size=TEST_SIZE):
+    """
+    Parse `data_path` once into typed, already split chunks pickled under
+    `cache_dir`, so the repeated passes XGBoost makes never re-parse text.
+    Returns (train_files, validation_files).
+    """
+    files = ([], [])
+    for chunk, df in enumerate(read_chunks(data_path, chunk_rows)):
+        if TARGET_COL not in df.columns:
+            raise ValueError("❌ label column not found")
+
+        validation = split_mask(len(df), chunk, test_size)
+        for side, part in enumerate((df[~validation], df[validation])):
+            if part.empty:
+                continue
+            path = os.path.join(cache_dir, f"{('train', 'val')[side]}-{chunk:06d}.pkl")
+            part.to_pickle(path)
+            files[side].append(path)
+
+    return files
+
+
+class ChunkIter(xgb.DataIter):
+    """
+    Streams spilled chunks (see `spill_chunks`) to XGBoost one at a time.
+    Counts rows and positives of the last full pass.
+    """
+
+    def __init__(self, chunk_files, cache_prefix=None):
+        self.chunk_files = chunk_files
+        self.rows = 0
+        self.positives = 0
+        self._counts = [0, 0]
+        self._next = 0
+        super().__init__(cache_prefix=cache_prefix)
+
+    def reset(self):
+        self._next = 0
+        self._counts = [0, 0]
+
+    def next(self, input_data):
+        if self._next == len(self.chunk_files):
+            self.rows, self.positives = self._counts
+            return False
+
+        df = pd.read_pickle(self.chunk_files[self._next])
+        self._next += 1
+
+        label = df.pop(TARGET_COL)
+        self._counts[0] += len(label)
+        self._counts[1] += int(label.sum())
+        input_data(data=df, label=label)
+        return True
+
+# --------------------------------------------------
+# TRAINING
+# --------------------------------------------------
+
+def peak_rss_mb():
+    """Peak resident set size of this process so far."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # bytes on macOS, kilobytes on Linux
+    return peak / 1024 ** 2 if sys.platform == "darwin" else peak / 1024
+
+
+def training_params(booster: xgb.Booster) -> dict:
+    """
+    Parameters `booster` was trained with (TRAIN_PARAM_TYPES, tree_method,
+    scale_pos_weight). Saving drops them from `save_config()`, so a model
+    written by `to_classifier` carries them as the TRAIN_PARAMS_ATTR booster
+    attribute; otherwise they are read from the config, which is only
+    accurate for a booster trained in this process.
+    """
+    stored = booster.attr(TRAIN_PARAMS_ATTR)
+    if stored:
+        return json.loads(stored)
+
+    config = json.loads(booster.save_config())["learner"]
+    tree_params = config["gradient_booster"]["tree_train_param"]
+    params = {name: cast(float(tree_params[name])) for name, cast in TRAIN_PARAM_TYPES.items()}
+    # float32 round trip (0.05 → 0.0500000007)
+    params = {name: round(value, 6) if isinstance(value, float) else value for name, value in params.items()}
+    params["tree_method"] = config["gradient_booster"]["gbtree_train_param"]["tree_method"]
+    params["scale_pos_weight"] = float(config["objective"]["reg_loss_param"]["scale_pos_weight"])
+    return params
+
+
+def record_training_params(booster: xgb.Booster):
+    """
+    Stamp the parameters of the booster's live config as TRAIN_PARAMS_ATTR,
+    replacing any inherited stamp. Call right after `xgb.train`, before
+    `save_raw` drops them from the config.
+    """
+    booster.set_attr(**{TRAIN_PARAMS_ATTR: None})
+    booster.set_attr(**{TRAIN_PARAMS_ATTR: json.dumps(training_params(booster))})
+
+
+def to_classifier(booster: xgb.Booster) -> xgb.XGBClassifier:
+    """
+    Wrap a trained Booster so it saves and loads like the original model,
+    recording its training parameters (see `training_params`) on the way.
+    """
+    if booster.attr(TRAIN_PARAMS_ATTR) is None:
+        booster.set_attr(**{TRAIN_PARAMS_ATTR: json.dumps(training_params(booster))})
+    model = xgb.XGBClassifier()
+    model.load_model(bytearray(booster.save_raw("ubj")))
+    return model
+
+
+def train(data_path, num_boost_round=NUM_BOOST_ROUND, params=None,
+          chunk_rows=CHUNK_ROWS, external_memory=False, cache_dir=None, verbose=True):
+    """
+    Train on `data_path` without loading it whole.
+
+    Returns (XGBClassifier, report) where report holds rows, fraud counts,
+    validation AUC, wall_seconds and peak_rss_mb.
+    """
+    start = time.perf_counter()
+
+    with tempfile.TemporaryDirectory(dir=cache_dir) as cache:
+        train_files, val_files = spill_chunks(data_path, cache, chunk_rows)
+
+        if external_memory:
+            train_iter = ChunkIter(train_files, cache_prefix=os.path.join(cache, "train"))
+            val_iter = ChunkIter(val_files, cache_prefix=os.path.join(cache, "val"))
+            dtrain = xgb.ExtMemQuantileDMatrix(train_iter)
+            dval = xgb.ExtMemQuantileDMatrix(val_iter, ref=dtrain)
+        else:
+            train_iter = ChunkIter(train_files)
+            val_iter = ChunkIter(val_files)
+            dtrain = xgb.QuantileDMatrix(train_iter)
+            dval = xgb.QuantileDMatrix(val_iter, ref=dtrain)
+
+        if train_iter.positives == 0:
+            raise ValueError("❌ No fraud samples found")
+
+        genuine = train_iter.rows - train_iter.positives
+        params = {**PARAMS, "scale_pos_weight": genuine / train_iter.positives, **(params or {})}
+
+        if verbose:
+            print(f"🧪 Train rows: {train_iter.rows}, validation rows: {val_iter.rows}")
+            print(f"⚖️ scale_pos_weight = {params['scale_pos_weight']:.2f}")
+            print("🚀 Training XGBoost fraud model...")
+
+        booster = xgb.train(
+            params, dtrain, num_boost_round=num_boost_round,
+            evals=[(dval, "validation")], verbose_eval=verbose
+        )
+        auc = roc_auc_score(dval.get_label(), booster.predict(dval))
+        # Release the page cache before its directory is removed
+        del dtrain, dval
+
+    report = {
+        "rows": train_iter.rows + val_iter.rows,
+        "train_rows": train_iter.rows,
+        "validation_rows": val_iter.rows,
+        "fraud_rows": train_iter.positives + val_iter.positives,
+        "auc": round(float(auc), 6),
+        "wall_seconds": round(time.perf_counter() - start, 2),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+    }
+    return to_classifier(booster), report
+
+# --------------------------------------------------
+# MAIN
+# --------------------------------------------------
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Out-of-core XGBoost fraud model training")
+    parser.add_argument("--data", required=True, help="CSV / Parquet file or directory of part files")
+    parser.add_argument("--output", default=MODEL_FILE)
+    parser.add_argument("--rounds", type=int, default=NUM_BOOST_ROUND)
+    parser.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS)
+    parser.add_argument("--external-memory", action="store_true",
+                        help="Cache quantized pages on disk instead of RAM")
+    parser.add_argument("--cache-dir", help="Where spilled chunks and external memory pages go (default: system temp)")
+    args = parser.parse_args(argv)
+
+    model, report = train(
+        args.data, num_boost_round=args.rounds, chunk_rows=args.chunk_rows,
+        external_memory=args.external_memory, cache_dir=args.cache_dir
+    )
+
+    print(f"\n📈 ROC AUC: {report['auc']}")
+    print(f"⏱️ Wall time: {report['wall_seconds']}s")
+    print(f"🧠 Peak RSS: {report['peak_rss_mb']} MB")
+
+    dump(model, args.output)
+    print(f"\n💾 Model saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
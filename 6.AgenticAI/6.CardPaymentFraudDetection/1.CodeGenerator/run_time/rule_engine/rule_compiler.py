@@ -0,0 +1,311 @@
+"""
+Rule Condition Compiler
+-----------------------
+
+Turns the `condition` strings of the rule book into checked, precompiled
+predicates once, instead of re-parsing them with `eval` per transaction.
+
+Supported syntax:
+- Feature names, numbers, strings, True/False/None (and JSON true/false/null)
+- Comparisons: <, <=, >, >=, ==, !=   (chained comparisons too)
+- Arithmetic: +, -, *, /
+- Boolean logic: and, or, not
+
+Runtime semantics match the original `eval(condition, {}, transaction)`:
+a missing feature, an incompatible value type or a division by zero makes
+the rule not match.
+"""
+
+import ast
+import copy
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+# LLM generated rule books use JSON literals in conditions
+JSON_LITERALS = {"true": True, "false": False, "null": None}
+
+COMPARE_OPS = {
+    ast.Lt: np.less,
+    ast.LtE: np.less_equal,
+    ast.Gt: np.greater,
+    ast.GtE: np.greater_equal,
+    ast.Eq: np.equal,
+    ast.NotEq: np.not_equal,
+}
+
+BIN_OPS = {
+    ast.Add: np.add,
+    ast.Sub: np.subtract,
+    ast.Mult: np.multiply,
+    ast.Div: np.divide,
+}
+
+# Errors raised by a well-formed condition on unexpected data → no match
+RUNTIME_ERRORS = (KeyError, TypeError, ZeroDivisionError)
+
+# Compiled conditions kept across rule book reloads (LRU)
+CONDITION_CACHE_SIZE = 4096
+
+
+class _JsonLiterals(ast.NodeTransformer):
+    def visit_Name(self, node):
+        if node.id in JSON_LITERALS:
+            return ast.copy_location(ast.Constant(JSON_LITERALS[node.id]), node)
+        return node
+
+
+class _FeatureLookup(ast.NodeTransformer):
+    """Rewrites `feature` → `_t["feature"]` so the predicate is a plain lambda."""
+
+    def visit_Name(self, node):
+        lookup = ast.Subscript(
+            value=ast.Name(id="_t", ctx=ast.Load()),
+            slice=ast.Constant(node.id),
+            ctx=ast.Load(),
+        )
+        return ast.copy_location(lookup, node)
+
+
+class _FeatureAttribute(ast.NodeTransformer):
+    """Rewrites `feature` → `_t.feature` (slot access on a TransactionRecord)."""
+
+    def visit_Name(self, node):
+        lookup = ast.Attribute(value=ast.Name(id="_t", ctx=ast.Load()), attr=node.id, ctx=ast.Load())
+        return ast.copy_location(lookup, node)
+
+
+def _lambda(tree, transformer, condition):
+    body = transformer.visit(copy.deepcopy(tree)).body
+    fn_tree = ast.Expression(
+        body=ast.Lambda(
+            args=ast.arguments(
+                posonlyargs=[], args=[ast.arg(arg="_t")], kwonlyargs=[],
+                kw_defaults=[], defaults=[]
+            ),
+            body=body,
+        )
+    )
+    ast.fix_missing_locations(fn_tree)
+    return eval(compile(fn_tree, f"<condition {condition!r}>", "eval"), {"__builtins__": {}})
+
+
+def _required_features(node):
+    """Features read on every evaluation path, in evaluation order (a missing one means no match)."""
+    if isinstance(node, ast.Expression):
+        return _required_features(node.body)
+    if isinstance(node, ast.Name):
+        return [node.id]
+    if isinstance(node, ast.Compare):
+        return _required_features(node.left) + _required_features(node.comparators[0])
+    if isinstance(node, ast.BinOp):
+        return _required_features(node.left) + _required_features(node.right)
+    if isinstance(node, ast.BoolOp):
+        # Later operands may be short-circuited away
+        return _required_features(node.values[0])
+    if isinstance(node, ast.UnaryOp):
+        return _required_features(node.operand)
+    return []
+
+
+def _check(node):
+    if isinstance(node, ast.Expression):
+        return _check(node.body)
+    if isinstance(node, ast.Constant):
+        if not isinstance(node.value, (bool, int, float, str, type(None))):
+            raise ValueError(f"unsupported literal {node.value!r}")
+        return
+    if isinstance(node, ast.Name):
+        return
+    if isinstance(node, ast.Compare):
+        for op in node.ops:
+            if type(op) not in COMPARE_OPS:
+                raise ValueError(f"unsupported comparison {type(op).__name__}")
+        for child in [node.left, *node.comparators]:
+            _check(child)
+        return
+    if isinstance(node, ast.BinOp):
+        if type(node.op) not in BIN_OPS:
+            raise ValueError(f"unsupported operator {type(node.op).__name__}")
+        _check(node.left)
+        _check(node.right)
+        return
+    if isinstance(node, ast.BoolOp):
+        for child in node.values:
+            _check(child)
+        return
+    if isinstance(node, ast.UnaryOp):
+        if not isinstance(node.op, (ast.Not, ast.USub, ast.UAdd)):
+            raise ValueError(f"unsupported operator {type(node.op).__name__}")
+        _check(node.operand)
+        return
+    raise ValueError(f"unsupported expression {type(node).__name__}")
+
+
+class CompiledCondition:
+    """A rule condition parsed and validated once, callable per transaction or per batch."""
+
+    __slots__ = ("source", "features", "required", "_tree", "_fn", "_record_fn")
+
+    def __init__(self, source, tree, fn, record_fn):
+        self.source = source
+        self.features = frozenset(
+            n.id for n in ast.walk(tree) if isinstance(n, ast.Name)
+        )
+        self.required = tuple(dict.fromkeys(_required_features(tree)))
+        self._tree = tree
+        self._fn = fn
+        self._record_fn = record_fn
+
+    def __call__(self, transaction) -> bool:
+        try:
+            return bool(self._fn(transaction))
+        except RUNTIME_ERRORS:
+            return False
+
+    def on_record(self, record) -> bool:
+        """
+        `__call__` for a TransactionRecord, reading features as slots. An
+        unset slot (or a feature outside the record's schema) falls back to
+        the mapping lookup.
+        """
+        try:
+            return bool(self._record_fn(record))
+        except AttributeError:
+            return self(record)
+        except RUNTIME_ERRORS:
+            return False
+
+    def value(self, transaction):
+        """Raw value of the expression; runtime errors (RUNTIME_ERRORS) propagate."""
+        return self._fn(transaction)
+
+    def __repr__(self):
+        return f"CompiledCondition({self.source!r})"
+
+    # --------------------------------------------------
+    # VECTORIZED EVALUATION
+    # --------------------------------------------------
+
+    def mask(self, df: pd.DataFrame, columns=None, present=None) -> np.ndarray:
+        """
+        Boolean match mask over every row of `df`, identical to calling the
+        condition row by row: a feature missing from `df` (or unset in a row,
+        per the optional `present` dict of per-row bool arrays) makes the
+        operations reading it invalid, and `and` / `or` skip an invalid
+        operand the way Python's short-circuit does.
+
+        `columns` is an optional dict cache of column arrays shared between
+        conditions of the same batch.
+        """
+        n = len(df)
+        if columns is None:
+            columns = {}
+
+        try:
+            with np.errstate(divide="ignore", invalid="ignore"):
+                value, valid = self._eval(self._tree.body, df, columns, present)
+                result = np.asarray(value, dtype=bool) & valid
+        except RUNTIME_ERRORS:
+            # Mixed / object columns (element-wise Python ops raise instead of
+            # yielding inf / nan): fall back to the row-wise predicate
+            return np.fromiter(
+                (self(row) for row in df.to_dict("records")), dtype=bool, count=n
+            )
+
+        return np.broadcast_to(result, (n,)).copy()
+
+    def _eval(self, node, df, columns, present=None):
+        """Returns (values, valid) where `valid` marks rows without runtime errors."""
+        if isinstance(node, ast.Constant):
+            return node.value, True
+
+        if isinstance(node, ast.Name):
+            if node.id not in df.columns:
+                # Every row raises KeyError on this feature
+                return np.zeros(len(df)), np.zeros(len(df), dtype=bool)
+            if node.id not in columns:
+                columns[node.id] = df[node.id].to_numpy()
+            if present is not None and node.id in present:
+                return columns[node.id], present[node.id]
+            return columns[node.id], True
+
+        if isinstance(node, ast.Compare):
+            left, valid = self._eval(node.left, df, columns, present)
+            result = True
+            for op, comparator in zip(node.ops, node.comparators):
+                right, right_valid = self._eval(comparator, df, columns, present)
+                result = result & COMPARE_OPS[type(op)](left, right)
+                valid = valid & right_valid
+                left = right
+            return result, valid
+
+        if isinstance(node, ast.BinOp):
+            left, left_valid = self._eval(node.left, df, columns, present)
+            right, right_valid = self._eval(node.right, df, columns, present)
+            valid = left_valid & right_valid
+            if isinstance(node.op, ast.Div):
+                valid = valid & (np.asarray(right) != 0)
+            return BIN_OPS[type(node.op)](left, right), valid
+
+        if isinstance(node, ast.BoolOp):
+            result, valid = self._eval(node.values[0], df, columns, present)
+            result = np.asarray(result, dtype=bool)
+            for child in node.values[1:]:
+                value, child_valid = self._eval(child, df, columns, present)
+                value = np.asarray(value, dtype=bool)
+                if isinstance(node.op, ast.And):
+                    # `a and b` only evaluates b where a is true
+                    valid = valid & (~result | child_valid)
+                    result = result & value
+                else:
+                    valid = valid & (result | child_valid)
+                    result = result | value
+            return result, valid
+
+        if isinstance(node, ast.UnaryOp):
+            value, valid = self._eval(node.operand, df, columns, present)
+            if isinstance(node.op, ast.Not):
+                return ~np.asarray(value, dtype=bool), valid
+            if isinstance(node.op, ast.USub):
+                return np.negative(value), valid
+            return value, valid
+
+        raise ValueError(f"unsupported expression {type(node).__name__}")
+
+
+@lru_cache(maxsize=CONDITION_CACHE_SIZE)
+def compile_condition(condition: str) -> CompiledCondition:
+    """Parse, validate and compile one condition string (cached by source)."""
+    if not isinstance(condition, str) or not condition.strip():
+        raise ValueError("empty condition")
+
+    try:
+        tree = ast.parse(condition.strip(), mode="eval")
+    except SyntaxError as e:
+        raise ValueError(f"invalid syntax: {e.msg}") from None
+
+    tree = ast.fix_missing_locations(_JsonLiterals().visit(tree))
+    _check(tree)
+
+    fn = _lambda(tree, _FeatureLookup(), condition)
+    record_fn = _lambda(tree, _FeatureAttribute(), condition)
+
+    return CompiledCondition(condition, tree, fn, record_fn)
+
+
+class RuleCompiler:
+    @staticmethod
+    def compile_rule(rule: dict) -> CompiledCondition:
+        try:
+            return compile_condition(rule["condition"])
+        except ValueError as e:
+            raise ValueError(
+                f"Rule {rule.get('rule_id')} has invalid condition "
+                f"{rule.get('condition')!r}: {e}"
+            ) from None
+
+    @staticmethod
+    def compile_rules(rules):
+        return [RuleCompiler.compile_rule(r) for r in rules]
@@ -1,10 +1,16 @@
 import json
 
+from run_time.rule_engine.rule_compiler import RuleCompiler
+
 class RuleLoader:
     @staticmethod
     def load_rules(path: str):
-        with open(path, "r") as f:
-            rules = json.load(f)
+        with open(path, "rb") as f:
+            return RuleLoader.parse_rules(f.read())
+
+    @staticmethod
+    def parse_rules(data):
+        rules = json.loads(data)
 
         # Basic validation
         required_fields = {"rule_id", "condition", "action", "use_case"}
@@ -14,4 +20,7 @@ class RuleLoader:
             if missing:
                 raise ValueError(f"Rule {r.get('rule_id')} missing fields: {missing}")
 
+        # Parse + validate every condition once (compiled predicates are cached)
+        RuleCompiler.compile_rules(rules)
+
         return rules
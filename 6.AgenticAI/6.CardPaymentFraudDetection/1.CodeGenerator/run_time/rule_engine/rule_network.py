@@ -0,0 +1,533 @@
+"""
+Shared-predicate Rule Network
+-----------------------------
+
+Compiles a rule book into a network of atomic predicates shared between
+rules (Rete-style alpha nodes):
+- Each condition is split into atoms (one comparison, or any other
+  non-boolean sub-expression) joined by and / or / not
+- Identical atoms are one node, whichever rule uses them
+  (`amount_spike_ratio > 2` in three rules is evaluated once)
+- Threshold atoms on the same feature are linked by implication edges:
+  once `cvv_fail_rate > 3` is False, `cvv_fail_rate > 5` is known False;
+  once `hour_of_day > 22` is True, `hour_of_day > 20` is known True
+- A missing feature (or a value of the wrong type for ordering
+  comparisons) resolves every dependent atom to "error" at once
+
+`RuleNetwork.evaluate` returns exactly what `RuleService.evaluate` returns;
+atoms are evaluated lazily, once per transaction, so predicate
+evaluations drop with the overlap between rules.
+
+`analyze` is the design-time report: shared atoms, duplicate rules, rules
+subsumed by another rule of at least the same severity (they can never
+change a decision) and dead rules (unsatisfiable, or reading features no
+data source supplies).
+
+Usage (from 1.CodeGenerator/):
+    python -m run_time.rule_engine.rule_network artifacts/rule_book.json \
+        artifacts/rule_engine_rules.json artifacts/ml_rules.json \
+        --known-features taining_data/rule_compatible_fraud_data.csv
+"""
+
+import argparse
+import ast
+import json
+import math
+import operator
+import os
+from collections import defaultdict
+
+from run_time.rule_engine.rule_compiler import RUNTIME_ERRORS, compile_condition
+from run_time.rule_engine.rule_loader import RuleLoader
+from run_time.rule_engine.rule_service import CompiledRuleSet
+
+# --------------------------------------------------
+# CONFIGURATION
+# --------------------------------------------------
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+RULE_FILES = [
+    os.path.join(BASE_DIR, "artifacts", "rule_book.json"),
+    os.path.join(BASE_DIR, "artifacts", "rule_engine_rules.json"),
+    os.path.join(BASE_DIR, "artifacts", "ml_rules.json"),
+]
+
+COMPARE_SYMBOLS = {
+    ast.Gt: ">", ast.GtE: ">=", ast.Lt: "<", ast.LtE: "<=", ast.Eq: "==", ast.NotEq: "!=",
+}
+FLIPPED = {">": "<", ">=": "<=", "<": ">", "<=": ">=", "==": "==", "!=": "!="}
+OPERATORS = {
+    ">": operator.gt, ">=": operator.ge, "<": operator.lt,
+    "<=": operator.le, "==": operator.eq, "!=": operator.ne,
+}
+ORDERING = {">", ">=", "<", "<="}
+
+SEVERITY = {"DECLINE": 2, "STEP_UP": 1, "MONITOR": 0}
+
+# Atom value when evaluating it raised (missing feature, type mismatch, ...):
+# the enclosing rule does not match, as with the compiled lambda
+ERROR = object()
+
+# --------------------------------------------------
+# ATOMS
+# --------------------------------------------------
+
+def _constant(node):
+    """Literal value of `node` (folding unary +/-), or raise ValueError."""
+    if isinstance(node, ast.Constant):
+        return node.value
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.USub, ast.UAdd)):
+        value = _constant(node.operand)
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            return -value if isinstance(node.op, ast.USub) else value
+    raise ValueError("not a constant")
+
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not (isinstance(value, float) and math.isnan(value))
+
+
+class Atom:
+    """
+    One shared predicate. Threshold atoms (`feature <op> constant`) are
+    evaluated inline; any other expression through its compiled condition.
+    """
+
+    __slots__ = ("id", "key", "source", "feature", "op", "constant",
+                 "condition", "implies", "implied_by", "rules")
+
+    def __init__(self, atom_id, key, source, feature=None, op=None, constant=None, condition=None):
+        self.id = atom_id
+        self.key = key
+        self.source = source
+        self.feature = feature
+        self.op = op
+        self.constant = constant
+        self.condition = condition
+        self.implies = []       # atoms that are True whenever this one is
+        self.implied_by = []    # atoms that are False whenever this one is
+        self.rules = []         # rule_ids using this atom
+
+    @property
+    def numeric_ordering(self):
+        return self.op in ORDERING and _is_number(self.constant)
+
+    def compute(self, transaction):
+        if self.condition is not None:
+            try:
+                return bool(self.condition.value(transaction))
+            except RUNTIME_ERRORS:
+                return ERROR
+
+        try:
+            return OPERATORS[self.op](transaction[self.feature], self.constant)
+        except RUNTIME_ERRORS:
+            return ERROR
+
+    def __repr__(self):
+        return f"Atom({self.source!r})"
+
+
+def _threshold_implies(a: Atom, b: Atom) -> bool:
+    """`a` True ⇒ `b` True, for numeric threshold atoms on the same feature (NaN-safe)."""
+    if a.feature != b.feature or not (a.numeric_ordering and b.numeric_ordering):
+        return False
+    x, y = a.constant, b.constant
+    if a.op in (">", ">=") and b.op in (">", ">="):
+        return x > y or (x == y and (a.op == ">" or b.op == ">="))
+    if a.op in ("<", "<=") and b.op in ("<", "<="):
+        return x < y or (x == y and (a.op == "<" or b.op == "<="))
+    return False
+
+# --------------------------------------------------
+# NETWORK
+# --------------------------------------------------
+
+class RuleNetwork:
+    def __init__(self, rules):
+        if not isinstance(rules, CompiledRuleSet):
+            rules = CompiledRuleSet(rules)
+        self.ruleset = rules
+        self.atoms = []
+        self._atom_ids = {}
+        self.feature_atoms = defaultdict(list)   # feature → threshold atom ids
+
+        self.programs = [
+            self._program(condition._tree.body, rule["rule_id"])
+            for rule, condition in zip(rules.rules, rules.conditions)
+        ]
+        self._link_implications()
+
+        self.evaluations = 0
+        self.atom_requests = 0       # what evaluating every condition separately costs
+        self.atom_evaluations = 0    # what the network actually computed
+
+    @property
+    def rules(self):
+        return self.ruleset.rules
+
+    # --------------------------------------------------
+    # COMPILATION
+    # --------------------------------------------------
+
+    def _program(self, node, rule_id):
+        """Condition as nested ("and" | "or", [children]) / ("not", child) / ("atom", id)."""
+        if isinstance(node, ast.BoolOp):
+            kind = "and" if isinstance(node.op, ast.And) else "or"
+            return kind, [self._program(child, rule_id) for child in node.values]
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.Not):
+            return "not", self._program(node.operand, rule_id)
+
+        atom = self._atom(node)
+        if rule_id not in atom.rules:
+            atom.rules.append(rule_id)
+        return "atom", atom.id
+
+    def _atom(self, node):
+        threshold = self._threshold(node)
+        key = threshold or ("expr", ast.dump(node))
+
+        atom_id = self._atom_ids.get(key)
+        if atom_id is not None:
+            return self.atoms[atom_id]
+
+        atom_id = len(self.atoms)
+        source = ast.unparse(node)
+        if threshold:
+            _, feature, op, constant = threshold
+            atom = Atom(atom_id, key, source, feature=feature, op=op, constant=constant)
+            self.feature_atoms[feature].append(atom_id)
+        else:
+            atom = Atom(atom_id, key, source, condition=compile_condition(source))
+
+        self.atoms.append(atom)
+        self._atom_ids[key] = atom_id
+        return atom
+
+    @staticmethod
+    def _threshold(node):
+        """("threshold", feature, op, constant) for `feature <op> constant` (either side)."""
+        if not (isinstance(node, ast.Compare) and len(node.ops) == 1):
+            return None
+        symbol = COMPARE_SYMBOLS.get(type(node.ops[0]))
+        left, right = node.left, node.comparators[0]
+
+        if isinstance(right, ast.Name):
+            left, right, symbol = right, left, FLIPPED[symbol]
+        if not isinstance(left, ast.Name):
+            return None
+        try:
+            constant = _constant(right)
+        except ValueError:
+            return None
+        return "threshold", left.id, symbol, constant
+
+    def _link_implications(self):
+        for atom_ids in self.feature_atoms.values():
+            for a in atom_ids:
+                for b in atom_ids:
+                    if a != b and _threshold_implies(self.atoms[a], self.atoms[b]):
+                        self.atoms[a].implies.append(b)
+                        self.atoms[b].implied_by.append(a)
+
+    # --------------------------------------------------
+    # EVALUATION
+    # --------------------------------------------------
+
+    def evaluate(self, transaction):
+        """Same result as `RuleService.evaluate` over the same rules."""
+        ruleset = self.ruleset
+        self.evaluations += 1
+
+        slots = list(ruleset.unindexed)
+        for feature in transaction:
+            indexed = ruleset.feature_index.get(feature)
+            if indexed:
+                slots.extend(indexed)
+        slots.sort()
+
+        values = [None] * len(self.atoms)
+        matched = []
+        decision = "APPROVE"
+
+        for slot in slots:
+            i = ruleset.schedule[slot]
+            result = self._run(self.programs[i], transaction, values)
+            if result is ERROR or not result:
+                continue
+
+            rule = ruleset.rules[i]
+            if rule["action"] == "DECLINE":
+                return {
+                    "decision": "DECLINE",
+                    "matched_rules": [rule],
+                    "source": "RULE_ENGINE"
+                }
+
+            matched.append(i)
+            if rule["action"] == "STEP_UP":
+                decision = "STEP_UP"
+
+        matched.sort()
+
+        return {
+            "decision": decision,
+            "matched_rules": [ruleset.rules[i] for i in matched],
+            "source": "RULE_ENGINE"
+        }
+
+    def _run(self, program, transaction, values):
+        """Python and / or / not semantics, with ERROR propagating like an exception."""
+        kind, arg = program
+        if kind == "atom":
+            return self._value(arg, transaction, values)
+
+        if kind == "not":
+            value = self._run(arg, transaction, values)
+            return value if value is ERROR else not value
+
+        for child in arg:
+            value = self._run(child, transaction, values)
+            if value is ERROR:
+                return ERROR
+            if (kind == "and") != bool(value):
+                return value
+        return value
+
+    def _value(self, atom_id, transaction, values):
+        self.atom_requests += 1
+        value = values[atom_id]
+        if value is not None:
+            return value
+
+        self.atom_evaluations += 1
+        atom = self.atoms[atom_id]
+        value = values[atom_id] = atom.compute(transaction)
+
+        if atom.feature is None:
+            return value
+
+        if value is ERROR:
+            if atom.feature not in transaction:
+                # Missing feature: every atom on it raises KeyError
+                for other in self.feature_atoms[atom.feature]:
+                    values[other] = ERROR
+            elif atom.numeric_ordering:
+                # Unorderable value: every numeric ordering atom raises TypeError
+                for other in self.feature_atoms[atom.feature]:
+                    if self.atoms[other].numeric_ordering:
+                        values[other] = ERROR
+        elif value:
+            for other in atom.implies:
+                if values[other] is None:
+                    values[other] = True
+        else:
+            for other in atom.implied_by:
+                if values[other] is None:
+                    values[other] = False
+
+        return value
+
+    def stats(self):
+        saved = 1 - self.atom_evaluations / self.atom_requests if self.atom_requests else 0.0
+        return {
+            "evaluations": self.evaluations,
+            "atom_requests": self.atom_requests,
+            "atom_evaluations": self.atom_evaluations,
+            "saved": round(saved, 4),
+        }
+
+# --------------------------------------------------
+# DESIGN-TIME ANALYSIS
+# --------------------------------------------------
+
+def _conjunction(program):
+    """Atom ids of an `a and b and ...` condition, or None for any other shape."""
+    kind, arg = program
+    if kind == "atom":
+        return [arg]
+    if kind == "and":
+        atoms = []
+        for child in arg:
+            child_atoms = _conjunction(child)
+            if child_atoms is None:
+                return None
+            atoms.extend(child_atoms)
+        return atoms
+    return None
+
+
+def _unsatisfiable(network, atom_ids):
+    """Reason a conjunction of atoms can never hold, or None."""
+    by_feature = defaultdict(list)
+    for atom_id in atom_ids:
+        atom = network.atoms[atom_id]
+        if atom.feature is not None and atom.op != "!=":
+            by_feature[atom.feature].append(atom)
+
+    for feature, atoms in by_feature.items():
+        low, low_open, high, high_open = -math.inf, False, math.inf, False
+        others = set()
+
+        for atom in atoms:
+            c = atom.constant
+            if atom.op == "==" and not _is_number(c):
+                others.add(c)
+            elif not _is_number(c):
+                continue
+            elif atom.op in (">", ">=") and (c > low or (c == low and atom.op == ">")):
+                low, low_open = c, atom.op == ">"
+            elif atom.op in ("<", "<=") and (c < high or (c == high and atom.op == "<")):
+                high, high_open = c, atom.op == "<"
+            elif atom.op == "==":
+                if c > low:
+                    low, low_open = c, False
+                if c < high:
+                    high, high_open = c, False
+
+        numeric = low > -math.inf or high < math.inf
+        if low > high or (low == high and (low_open or high_open)):
+            return f"no value of {feature} satisfies every bound"
+        if len(others) > 1:
+            return f"{feature} cannot equal {sorted(map(repr, others))} at once"
+        if others and numeric:
+            return f"{feature} cannot equal {next(iter(others))!r} and satisfy numeric bounds"
+
+    return None
+
+
+def analyze(rules, known_features=None):
+    """Design-time report for one rule book (see module docstring)."""
+    network = RuleNetwork(rules)
+    rules = network.rules
+    conditions = network.ruleset.conditions
+    conjunctions = [_conjunction(p) for p in network.programs]
+
+    def implies(a, b):
+        return a == b or b in network.atoms[a].implies
+
+    def condition_implies(i, j):
+        if conjunctions[i] is None or conjunctions[j] is None:
+            return False
+        return all(any(implies(a, b) for a in conjunctions[i]) for b in conjunctions[j])
+
+    dead = {}
+    for i, rule in enumerate(rules):
+        if conjunctions[i] is not None:
+            reason = _unsatisfiable(network, conjunctions[i])
+            if reason:
+                dead[i] = reason
+        if known_features is not None and i not in dead:
+            missing = sorted(conditions[i].features - set(known_features))
+            if missing:
+                dead[i] = f"features never supplied: {', '.join(missing)}"
+
+    duplicates = defaultdict(list)
+    for i, rule in enumerate(rules):
+        if conjunctions[i] is not None:
+            duplicates[frozenset(conjunctions[i])].append(rule["rule_id"])
+
+    subsumed = []
+    for i, rule in enumerate(rules):
+        if i in dead:
+            continue
+        for j, other in enumerate(rules):
+            if i == j or j in dead or SEVERITY[other["action"]] < SEVERITY[rule["action"]]:
+                continue
+            if not condition_implies(i, j):
+                continue
+            # Equivalent rules of equal severity: only the later one is redundant
+            if condition_implies(j, i) and SEVERITY[other["action"]] == SEVERITY[rule["action"]] and j > i:
+                continue
+            subsumed.append({
+                "rule_id": rule["rule_id"],
+                "action": rule["action"],
+                "condition": rule["condition"],
+                "by": other["rule_id"],
+                "by_action": other["action"],
+                "by_condition": other["condition"],
+            })
+            break
+
+    occurrences = sum(len(a.rules) for a in network.atoms)
+    return {
+        "rules": len(rules),
+        "atom_occurrences": occurrences,
+        "distinct_atoms": len(network.atoms),
+        "implications": sum(len(a.implies) for a in network.atoms),
+        "shared_atoms": [
+            {"atom": a.source, "rules": a.rules} for a in network.atoms if len(a.rules) > 1
+        ],
+        "duplicates": [ids for ids in duplicates.values() if len(ids) > 1],
+        "subsumed": subsumed,
+        "dead": [
+            {"rule_id": rules[i]["rule_id"], "condition": rules[i]["condition"], "reason": reason}
+            for i, reason in dead.items()
+        ],
+    }
+
+
+def print_report(path, report):
+    print(f"\n📘 {path}")
+    print(f"  Rules: {report['rules']}   atoms: {report['atom_occurrences']} → "
+          f"{report['distinct_atoms']} distinct   implication edges: {report['implications']}")
+
+    for shared in report["shared_atoms"]:
+        print(f"  🔗 {shared['atom']:<40} shared by rules {', '.join(map(str, shared['rules']))}")
+    for ids in report["duplicates"]:
+        print(f"  ♊ Duplicate conditions: rules {', '.join(map(str, ids))}")
+    for s in report["subsumed"]:
+        print(f"  ⚠️ Rule {s['rule_id']} ({s['action']}: {s['condition']}) subsumed by "
+              f"rule {s['by']} ({s['by_action']}: {s['by_condition']})")
+    for d in report["dead"]:
+        print(f"  ❌ Rule {d['rule_id']} is dead ({d['condition']}): {d['reason']}")
+
+    if not (report["duplicates"] or report["subsumed"] or report["dead"]):
+        print("  ✅ No duplicate, subsumed or dead rules")
+
+# --------------------------------------------------
+# MAIN
+# --------------------------------------------------
+
+def _data_columns(path):
+    import pandas as pd
+    if path.endswith(".parquet"):
+        return list(pd.read_parquet(path).columns)
+    return list(pd.read_csv(path, nrows=0).columns)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Shared-predicate rule network analysis")
+    parser.add_argument("rule_files", nargs="*", default=RULE_FILES)
+    parser.add_argument("--known-features", help="CSV / Parquet whose columns are the available features")
+    parser.add_argument("--data", help="CSV of transactions to measure predicate evaluations on")
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--output", help="Write the reports JSON here")
+    args = parser.parse_args(argv)
+
+    known_features = _data_columns(args.known_features) if args.known_features else None
+    reports = {}
+
+    for path in args.rule_files:
+        rules = RuleLoader.load_rules(path)
+        reports[path] = analyze(rules, known_features)
+        print_report(path, reports[path])
+
+        if args.data:
+            import pandas as pd
+            network = RuleNetwork(rules)
+            for transaction in pd.read_csv(args.data, nrows=args.rows).to_dict("records"):
+                network.evaluate(transaction)
+            stats = reports[path]["evaluation"] = network.stats()
+            print(f"  ⚡ Predicate evaluations on {stats['evaluations']} transactions: "
+                  f"{stats['atom_requests']} → {stats['atom_evaluations']} ({stats['saved']:.1%} saved)")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(reports, f, indent=2, default=str)
+        print(f"\n💾 Report saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
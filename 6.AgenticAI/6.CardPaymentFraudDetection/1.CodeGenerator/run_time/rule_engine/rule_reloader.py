@@ -0,0 +1,121 @@
+"""
+Rule Book Hot Reload
+--------------------
+
+- RuleSetCache    : compiled rule sets keyed by the SHA-256 of the rule book
+                    bytes, so redeploying an already-seen file costs a hash
+- RuleBookWatcher : background thread polling the rule book; on change it
+                    parses, validates and compiles the new rules off the
+                    request path and swaps them into a live RuleService
+
+A rule book that fails validation is never swapped in: the service keeps
+the previous rules and the error is kept in `last_error`. Reloads and
+failures are reported through the `run_time.rule_engine.rule_reloader`
+logger, never on stdout from the watcher thread.
+"""
+
+import hashlib
+import logging
+import os
+import threading
+from collections import OrderedDict
+
+from run_time.rule_engine.rule_loader import RuleLoader
+from run_time.rule_engine.rule_service import CompiledRuleSet
+
+logger = logging.getLogger(__name__)
+
+
+class RuleSetCache:
+    def __init__(self, max_entries=8):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_compile(self, data: bytes) -> CompiledRuleSet:
+        content_hash = hashlib.sha256(data).hexdigest()
+
+        with self._lock:
+            ruleset = self._entries.get(content_hash)
+            if ruleset is not None:
+                self._entries.move_to_end(content_hash)
+                self.hits += 1
+                return ruleset
+
+        ruleset = CompiledRuleSet(RuleLoader.parse_rules(data), content_hash=content_hash)
+
+        with self._lock:
+            self.misses += 1
+            self._entries[content_hash] = ruleset
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+        return ruleset
+
+    def load(self, path: str) -> CompiledRuleSet:
+        with open(path, "rb") as f:
+            return self.get_or_compile(f.read())
+
+
+class RuleBookWatcher:
+    def __init__(self, path, rule_service, interval_s=1.0, cache=None):
+        self.path = path
+        self.rule_service = rule_service
+        self.interval_s = interval_s
+        self.cache = cache or RuleSetCache()
+
+        self.reloads = 0
+        self.last_error = None
+
+        self._last_stat = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def check(self) -> bool:
+        """Poll once; returns True if a new rule set was swapped in."""
+        try:
+            stat = os.stat(self.path)
+        except OSError as e:
+            self.last_error = e
+            return False
+
+        signature = (stat.st_mtime_ns, stat.st_size)
+        if signature == self._last_stat:
+            return False
+
+        self._last_stat = signature
+
+        try:
+            ruleset = self.cache.load(self.path)
+        except (OSError, ValueError) as e:
+            # Keep serving the previous rules (json.JSONDecodeError is a ValueError)
+            self.last_error = e
+            logger.warning("Rule book reload failed, keeping previous rules: %s", e)
+            return False
+
+        self.last_error = None
+
+        if ruleset.content_hash == self.rule_service.ruleset.content_hash:
+            return False
+
+        self.rule_service.swap(ruleset)
+        self.reloads += 1
+        logger.info("Rule book reloaded: %d rules (%s)", len(ruleset.rules), ruleset.content_hash[:12])
+        return True
+
+    def start(self):
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="rule-book-watcher", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval_s):
+            self.check()
@@ -1,33 +1,204 @@
-class RuleService:
-    def __init__(self, rules):
+from time import perf_counter_ns
+
+import numpy as np
+import pandas as pd
+
+from run_time.feature_engine.transaction_schema import TransactionBatch, TransactionRecord
+from run_time.rule_engine.rule_compiler import CompiledCondition, RuleCompiler
+
+
+class CompiledRuleSet:
+    """
+    Rules + compiled conditions + dispatch index. Never mutated once built,
+    so it can be swapped into a live RuleService in one assignment.
+    """
+
+    def __init__(self, rules, content_hash=None):
         self.rules = rules
+        self.conditions = RuleCompiler.compile_rules(rules)
+        self.content_hash = content_hash
+        self._build_dispatch_index()
+
+        # Latency label per condition (rules sharing a condition string share its timing)
+        self.rule_labels = {}
+        for rule, condition in zip(rules, self.conditions):
+            label = self.rule_labels.get(condition)
+            rule_id = str(rule.get("rule_id"))
+            self.rule_labels[condition] = rule_id if label is None else f"{label},{rule_id}"
+
+    def _build_dispatch_index(self):
+        """
+        Schedule DECLINE rules before STEP_UP / MONITOR (file order kept within
+        a severity) and index each rule under one feature its condition always
+        reads. A transaction without that feature can never match the rule.
+        """
+        self.schedule = sorted(
+            range(len(self.rules)),
+            key=lambda i: (self.rules[i]["action"] != "DECLINE", i)
+        )
+        self.feature_index = {}
+        self.unindexed = []
+
+        for slot, i in enumerate(self.schedule):
+            required = self.conditions[i].required
+            if not required:
+                self.unindexed.append(slot)
+                continue
+
+            feature = self.rules[i].get("primary_feature")
+            if feature not in required:
+                feature = required[0]
+            self.feature_index.setdefault(feature, []).append(slot)
+
+
+def _timed(matches, labels, metrics):
+    """`matches` recording each condition's evaluation time under its rule id."""
+    def timed(condition, transaction):
+        start = perf_counter_ns()
+        matched = matches(condition, transaction)
+        metrics.record_rule(labels[condition], perf_counter_ns() - start)
+        return matched
+    return timed
+
+
+class RuleService:
+    def __init__(self, rules, metrics=None):
+        if not isinstance(rules, CompiledRuleSet):
+            rules = CompiledRuleSet(rules)
+        self._ruleset = rules
+        self._listeners = []
+
+        # Optional per-pass / sampled per-rule latency (see latency_metrics.py)
+        self.metrics = metrics
+
+    @property
+    def ruleset(self):
+        return self._ruleset
+
+    @property
+    def rules(self):
+        return self._ruleset.rules
+
+    @property
+    def conditions(self):
+        return self._ruleset.conditions
+
+    def swap(self, ruleset: CompiledRuleSet):
+        """
+        Atomically replace the live rules. Evaluations already running keep
+        the rule set they started with. Returns the previous rule set.
+        """
+        previous = self._ruleset
+        self._ruleset = ruleset
+        for listener in self._listeners:
+            listener(ruleset)
+        return previous
+
+    def add_listener(self, listener):
+        """`listener(ruleset)` is called after every swap (e.g. to rebuild derived state)."""
+        self._listeners.append(listener)
 
     def evaluate(self, transaction):
-        matched_rules = []
+        """
+        Only rules indexed under a feature present in `transaction` are
+        evaluated. Decisions are identical to a full pass in file order; on
+        DECLINE, `matched_rules` holds the declining rule only.
+        A TransactionRecord is read through its slots.
+        """
+        metrics = self.metrics
+        if metrics is None:
+            return self._evaluate(transaction, None)
+
+        # A sampled pass times each rule instead, so its own total is left out
+        if metrics.sample_rules():
+            return self._evaluate(transaction, metrics)
+        start = perf_counter_ns()
+        result = self._evaluate(transaction, None)
+        metrics.record("rules.pass", perf_counter_ns() - start)
+        return result
+
+    def _evaluate(self, transaction, rule_metrics):
+        ruleset = self._ruleset
+        if isinstance(transaction, TransactionRecord):
+            matches = CompiledCondition.on_record
+        else:
+            matches = CompiledCondition.__call__
+        if rule_metrics is not None:
+            matches = _timed(matches, ruleset.rule_labels, rule_metrics)
+
+        slots = list(ruleset.unindexed)
+        for feature in transaction:
+            indexed = ruleset.feature_index.get(feature)
+            if indexed:
+                slots.extend(indexed)
+        slots.sort()
+
+        matched = []
         decision = "APPROVE"
 
-        for rule in self.rules:
-            if self._evaluate_rule(rule, transaction):
-                matched_rules.append(rule)
+        for slot in slots:
+            i = ruleset.schedule[slot]
+            if matches(ruleset.conditions[i], transaction):
+                rule = ruleset.rules[i]
 
                 if rule["action"] == "DECLINE":
                     return {
                         "decision": "DECLINE",
-                        "matched_rules": matched_rules,
+                        "matched_rules": [rule],
                         "source": "RULE_ENGINE"
                     }
 
+                matched.append(i)
+
                 if rule["action"] == "STEP_UP":
                     decision = "STEP_UP"
 
+        matched.sort()
+
         return {
             "decision": decision,
-            "matched_rules": matched_rules,
+            "matched_rules": [ruleset.rules[i] for i in matched],
             "source": "RULE_ENGINE"
         }
 
-    def _evaluate_rule(self, rule, transaction):
-        try:
-            return eval(rule["condition"], {}, transaction)
-        except Exception:
-            return False
+    def evaluate_batch(self, df):
+        """
+        Vectorized `evaluate` over a whole DataFrame (or TransactionBatch) of
+        transactions. For a TransactionBatch, a row without a feature the
+        condition always reads does not match, as in `evaluate`.
+
+        Returns:
+            decision : Series of APPROVE / STEP_UP / DECLINE per row
+                       (identical to calling `evaluate` row by row)
+            hits     : bool DataFrame (rows x rule_id) of every matching rule,
+                       not cut short at the first DECLINE
+        """
+        ruleset = self._ruleset
+        rules = ruleset.rules
+
+        if isinstance(df, TransactionBatch):
+            mask = df.mask
+            df = df.frame()
+        else:
+            mask = lambda condition, columns: condition.mask(df, columns)
+
+        columns = {}
+        hits = np.zeros((len(df), len(rules)), dtype=bool)
+        for i, condition in enumerate(ruleset.conditions):
+            hits[:, i] = mask(condition, columns)
+
+        actions = np.array([r["action"] for r in rules], dtype=object)
+        declined = hits[:, actions == "DECLINE"].any(axis=1)
+        stepped_up = hits[:, actions == "STEP_UP"].any(axis=1)
+
+        decision = np.select(
+            [declined, stepped_up], ["DECLINE", "STEP_UP"], default="APPROVE"
+        )
+
+        return {
+            "decision": pd.Series(decision, index=df.index, name="decision"),
+            "hits": pd.DataFrame(
+                hits, index=df.index, columns=[r["rule_id"] for r in rules]
+            ),
+            "source": "RULE_ENGINE"
+        }
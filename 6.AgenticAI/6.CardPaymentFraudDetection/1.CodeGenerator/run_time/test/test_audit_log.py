@@ -0,0 +1,124 @@
+import math
+import tempfile
+import unittest
+
+from run_time.decision_engine.audit_log import AuditLog, read_audit_log, iter_audit_frames, segment_files
+from run_time.decision_engine.fraud_decision_engine import FraudDecisionEngine
+from run_time.rule_engine.rule_service import RuleService
+from run_time.test.test_decision_cascade import StubMLService
+
+class TestAuditLog(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_round_trip(self):
+        log = AuditLog(self.tmp.name)
+        log.record(
+            {"amount_spike_ratio": 3.5, "new_merchant_flag": True, "country": "GB", "device_id": None},
+            {"decision": "DECLINE", "reasons": ["x"], "source": "RULE_ENGINE"},
+            rule_ids=["5"], timings={"rules": 12.5, "total": 20.0},
+        )
+        log.record(
+            {"amount_spike_ratio": 1.0},
+            {"decision": "STEP_UP", "fraud_score": 0.7, "source": "RULE_ENGINE + ML"},
+        )
+        log.close()
+
+        df = read_audit_log(self.tmp.name)
+        self.assertEqual(len(df), 2)
+        self.assertEqual(list(df["decision"]), ["DECLINE", "STEP_UP"])
+        self.assertEqual(df.loc[0, "rule_ids"], ["5"])
+        self.assertEqual(df.loc[1, "rule_ids"], [])
+        self.assertEqual(df.loc[0, "t_rules_us"], 12.5)
+        self.assertEqual(df.loc[0, "country"], "GB")
+        self.assertTrue(df.loc[0, "new_merchant_flag"])
+        self.assertTrue(math.isnan(df.loc[0, "score"]))
+        self.assertAlmostEqual(df.loc[1, "score"], 0.7, places=4)
+        self.assertEqual(df.loc[1, "amount_spike_ratio"], 1.0)
+        self.assertEqual(log.stats()["written"], 2)
+
+    def test_size_rotation(self):
+        log = AuditLog(self.tmp.name, max_segment_bytes=200)
+        for i in range(20):
+            log.record({"amount": float(i)}, {"decision": "APPROVE", "source": "RULE_ENGINE"}, ["7"])
+        log.close()
+
+        self.assertGreater(len(segment_files(self.tmp.name)), 1)
+        self.assertEqual(log.stats()["segments"], len(segment_files(self.tmp.name)))
+
+        # Every segment carries its own string table
+        df = read_audit_log(self.tmp.name)
+        self.assertEqual(list(df["amount"]), [float(i) for i in range(20)])
+        self.assertTrue(all(ids == ["7"] for ids in df["rule_ids"]))
+        self.assertEqual(sum(len(f) for f in iter_audit_frames(self.tmp.name, chunk_rows=6)), 20)
+
+    def test_full_queue_drops_instead_of_blocking(self):
+        log = AuditLog(self.tmp.name, capacity=0)
+        self.assertFalse(log.record({"amount": 1.0}, {"decision": "APPROVE"}))
+        log.close()
+
+        self.assertEqual(log.stats()["dropped"], 1)
+        self.assertEqual(log.stats()["written"], 0)
+
+    def test_torn_tail_is_skipped(self):
+        log = AuditLog(self.tmp.name)
+        for i in range(3):
+            log.record({"amount": float(i)}, {"decision": "APPROVE"})
+        log.close()
+
+        with open(segment_files(self.tmp.name)[-1], "ab") as f:
+            f.write(b"\x40\x00\x00\x00R\x01\x02")
+
+        df = read_audit_log(self.tmp.name)
+        self.assertEqual(list(df["amount"]), [0.0, 1.0, 2.0])
+
+    def test_failed_record_leaves_segment_readable(self):
+        log = AuditLog(self.tmp.name)
+        log.record({"note": "x" * 70000}, {"decision": "APPROVE"})
+        log.record({"merchant": "m1"}, {"decision": "DECLINE", "fraud_score": "high"})
+        log.record({"merchant": "m2", "amount": 5.0}, {"decision": "REVIEW", "source": "MANUAL"}, ["9"])
+        log.close()
+
+        self.assertEqual(log.stats()["written"], 2)
+        self.assertEqual(log.stats()["dropped"], 1)
+        self.assertIsNotNone(log.last_error)
+
+        df = read_audit_log(self.tmp.name)
+        self.assertEqual(len(df.loc[0, "note"]), 0xFFFF)
+        self.assertEqual(df.loc[1, "merchant"], "m2")
+        self.assertEqual(df.loc[1, "amount"], 5.0)
+        self.assertEqual(df.loc[1, "rule_ids"], ["9"])
+        self.assertEqual((df.loc[1, "decision"], df.loc[1, "source"]), ("UNKNOWN", "UNKNOWN"))
+
+class TestEngineAuditLog(unittest.TestCase):
+    def test_engine_records_every_decision(self):
+        rules = [
+            {'rule_id': '5', 'use_case': 'High-value purchase after theft', 'primary_feature': 'amount_spike_ratio', 'condition': 'amount_spike_ratio > 2', 'action': 'DECLINE'},
+            {'rule_id': '24', 'use_case': 'Card used at odd hours', 'primary_feature': 'hour_of_day', 'condition': 'hour_of_day > 20', 'action': 'STEP_UP'},
+        ]
+        transactions = [
+            {'amount_spike_ratio': 3},
+            {'hour_of_day': 23, 'stub_score': 0.1},
+            {'amount_spike_ratio': 1.0, 'stub_score': 0.9},
+        ]
+
+        with tempfile.TemporaryDirectory() as tmp:
+            log = AuditLog(tmp)
+            audited = FraudDecisionEngine(RuleService(rules), StubMLService(), audit_log=log)
+            plain = FraudDecisionEngine(RuleService(rules), StubMLService())
+
+            for t in transactions:
+                self.assertEqual(audited.evaluate(t), plain.evaluate(t))
+            log.close()
+
+            df = read_audit_log(tmp)
+
+        self.assertEqual(list(df["decision"]), ["DECLINE", "STEP_UP", "DECLINE"])
+        self.assertEqual(list(df["rule_ids"]), [["5"], ["24"], []])
+        self.assertTrue(math.isnan(df.loc[0, "t_ml_us"]))
+        self.assertGreater(df.loc[2, "t_ml_us"], 0)
+        self.assertTrue((df["t_total_us"] >= df["t_rules_us"]).all())
+        self.assertAlmostEqual(df.loc[2, "score"], 0.9, places=4)
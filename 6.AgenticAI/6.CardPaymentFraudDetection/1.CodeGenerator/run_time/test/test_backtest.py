@@ -0,0 +1,49 @@
+import json
+import os
+import tempfile
+import unittest
+
+import pandas as pd
+
+from backtest.rule_model_backtest import run_backtest
+
+class TestRuleModelBacktest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        rules = [
+            {'rule_id': '1', 'use_case': 'Card used immediately after reported stolen', 'condition': 'time_since_block < 5', 'action': 'DECLINE'},
+            {'rule_id': '24', 'use_case': 'Card used at odd hours', 'condition': 'hour_of_day > 20', 'action': 'STEP_UP'},
+        ]
+        rows = [
+            {'transaction_id': 'txn_0', 'time_since_block': 2, 'hour_of_day': 10, 'label': 1},
+            {'transaction_id': 'txn_1', 'time_since_block': 900, 'hour_of_day': 22, 'label': 1},
+            {'transaction_id': 'txn_2', 'time_since_block': 900, 'hour_of_day': 23, 'label': 0},
+            {'transaction_id': 'txn_3', 'time_since_block': 900, 'hour_of_day': 9, 'label': 0},
+            {'transaction_id': 'txn_4', 'time_since_block': 1, 'hour_of_day': 23, 'label': 0},
+        ]
+        self.rules_path = os.path.join(self.tmp.name, 'rule_book.json')
+        self.data_path = os.path.join(self.tmp.name, 'data.csv')
+        with open(self.rules_path, 'w') as f:
+            json.dump(rules, f)
+        pd.DataFrame(rows).to_csv(self.data_path, index=False)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_rules_only_report(self):
+        for workers in (1, 2):
+            report = run_backtest(self.data_path, self.rules_path, model_path=None, chunk_size=2, workers=workers)
+
+            self.assertEqual(report['rows'], 5)
+            self.assertEqual(report['decision_mix'], {'DECLINE': 2, 'STEP_UP': 2, 'APPROVE': 1})
+            self.assertEqual([r['hits'] for r in report['rule_hits']], [2, 3])
+            self.assertEqual([r['fraud_hits'] for r in report['rule_hits']], [1, 1])
+
+            decline = report['metrics']['decision']['decline']
+            self.assertEqual((decline['precision'], decline['recall']), (0.5, 0.5))
+            flagged = report['metrics']['decision']['flagged']
+            self.assertEqual((flagged['precision'], flagged['recall']), (0.5, 1.0))
+            self.assertIn('rules', report['rows_per_second'])
+
+if __name__ == '__main__':
+    unittest.main()
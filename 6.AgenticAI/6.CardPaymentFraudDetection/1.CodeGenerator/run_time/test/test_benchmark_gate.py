@@ -0,0 +1,34 @@
+import unittest
+
+from benchmarks.run_benchmarks import compare, sparsify, synthetic_rules, generate_rows
+from run_time.rule_engine.rule_service import RuleService
+
+class TestBenchmarkGate(unittest.TestCase):
+    def setUp(self):
+        self.baseline = {
+            "rules.evaluate[rules=10,sparsity=1.0]": {"p50_us": 10.0, "p99_us": 20.0, "throughput": 1000.0},
+        }
+
+    def test_within_tolerance_passes(self):
+        results = {"rules.evaluate[rules=10,sparsity=1.0]": {"p50_us": 11.0, "p99_us": 23.0, "throughput": 850.0}}
+        self.assertEqual(compare(results, self.baseline, tolerance=0.2), [])
+
+    def test_latency_and_throughput_regressions(self):
+        results = {
+            "rules.evaluate[rules=10,sparsity=1.0]": {"p50_us": 10.0, "p99_us": 30.0, "throughput": 700.0},
+            "new_case": {"p50_us": 1.0, "p99_us": 1.0, "throughput": 1.0},
+        }
+        regressions = compare(results, self.baseline, tolerance=0.2)
+        self.assertEqual([(name, metric) for name, metric, _, _ in regressions], [
+            ("rules.evaluate[rules=10,sparsity=1.0]", "p99_us"),
+            ("rules.evaluate[rules=10,sparsity=1.0]", "throughput"),
+        ])
+
+    def test_synthetic_rules_compile_and_run_on_sparse_rows(self):
+        rows = generate_rows(200)
+        service = RuleService(synthetic_rules(50, rows))
+        for row in sparsify(rows, 0.3):
+            self.assertIn(service.evaluate(row)["decision"], {"APPROVE", "STEP_UP", "DECLINE"})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+import json
+import math
+import os
+import tempfile
+import unittest
+
+import pandas as pd
+from joblib import dump
+
+from backtest import bulk_rescore
+from run_time.ml_engine import training_pipeline
+from taining_data import vectorized_data_generator as generator
+
+class TestBulkRescore(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.TemporaryDirectory()
+        cls.data_path = os.path.join(cls.tmp.name, "data.csv")
+        generator.generate_dataset(total_rows=2_000, output=cls.data_path, fraud_rate=0.1, seed=4, workers=1)
+
+        model, _ = training_pipeline.train(cls.data_path, num_boost_round=10, params={"max_depth": 3}, verbose=False)
+        cls.model_path = os.path.join(cls.tmp.name, "model.joblib")
+        dump(model, cls.model_path)
+
+        rules = [
+            {'rule_id': '1', 'use_case': 'Card used immediately after reported stolen', 'condition': 'time_since_block < 5', 'action': 'DECLINE'},
+            {'rule_id': '24', 'use_case': 'Card used at odd hours', 'condition': 'hour_of_day > 20', 'action': 'STEP_UP'},
+        ]
+        cls.rules_path = os.path.join(cls.tmp.name, "rule_book.json")
+        with open(cls.rules_path, "w") as f:
+            json.dump(rules, f)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp.cleanup()
+
+    def _rescore(self, workers):
+        output = os.path.join(self.tmp.name, f"scores_{workers}.csv")
+        stats = bulk_rescore.rescore(self.data_path, output, self.rules_path, self.model_path,
+                                     workers=workers, chunk_size=300)
+        return stats, pd.read_csv(output)
+
+    def test_pool_matches_single_process_in_order(self):
+        single_stats, single = self._rescore(1)
+        pool_stats, pooled = self._rescore(2)
+
+        self.assertEqual(single_stats["rows"], 2_000)
+        self.assertEqual(pool_stats["rows"], 2_000)
+        self.assertEqual(single_stats["start_method"], "in-process")
+        self.assertEqual(list(single.columns), ["transaction_id", "decision", "fraud_score"])
+
+        transaction_ids = pd.read_csv(self.data_path, usecols=["transaction_id"])["transaction_id"]
+        self.assertEqual(pooled["transaction_id"].tolist(), transaction_ids.tolist())
+        pd.testing.assert_frame_equal(single, pooled)
+
+    def test_scores_match_engine_evaluate(self):
+        _, scored = self._rescore(1)
+        engine = bulk_rescore.load_engine(self.rules_path, self.model_path)
+        rows = pd.read_csv(self.data_path, nrows=200).to_dict("records")
+
+        for row, (_, out) in zip(rows, scored.iterrows()):
+            expected = engine.evaluate(row)
+            self.assertEqual(out["decision"], expected["decision"])
+            if "fraud_score" in expected:
+                self.assertAlmostEqual(out["fraud_score"], expected["fraud_score"], places=4)
+            else:
+                self.assertTrue(math.isnan(out["fraud_score"]))
+
+    def test_scaling_report(self):
+        report = bulk_rescore.scaling(self.data_path, self.rules_path, self.model_path,
+                                      max_workers=2, chunk_size=500)
+        runs = report["runs"]
+        self.assertEqual([r["workers"] for r in runs], [1, 2])
+        self.assertEqual(runs[0]["speedup"], 1.0)
+        for run in runs:
+            self.assertEqual(run["rows"], 2_000)
+            self.assertGreater(run["rows_per_second"], 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+import unittest
+
+from run_time.decision_engine.fraud_decision_engine import FraudDecisionEngine
+from run_time.rule_engine.rule_service import RuleService
+
+class StubMLService:
+    def __init__(self):
+        self.calls = 0
+
+    def score(self, transaction):
+        self.calls += 1
+        score = transaction.get("stub_score", 0.1)
+        decision = "DECLINE" if score >= 0.85 else "STEP_UP" if score >= 0.65 else "APPROVE"
+        return {"decision": decision, "score": score, "source": "ML"}
+
+class TestDecisionCascade(unittest.TestCase):
+    def setUp(self):
+        self.rules = [
+            {'rule_id': '3', 'use_case': 'First transaction after long inactivity', 'primary_feature': 'new_merchant_flag', 'condition': 'new_merchant_flag == true', 'action': 'STEP_UP'},
+            {'rule_id': '5', 'use_case': 'High-value purchase after theft', 'primary_feature': 'amount_spike_ratio', 'condition': 'amount_spike_ratio > 2', 'action': 'DECLINE'},
+            {'rule_id': '24', 'use_case': 'Card used at odd hours', 'primary_feature': 'hour_of_day', 'condition': 'hour_of_day > 20', 'action': 'STEP_UP'},
+            {'rule_id': '59', 'use_case': 'New card + high spend immediately', 'primary_feature': 'card_age_days', 'condition': 'card_age_days < 30', 'action': 'DECLINE'},
+        ]
+        self.transactions = [
+            {'amount_spike_ratio': 3, 'new_merchant_flag': True},
+            {'card_age_days': 5},
+            {'new_merchant_flag': True, 'hour_of_day': 23, 'card_age_days': 400},
+            {'card_age_days': 4000, 'amount_spike_ratio': 1.0},
+            {'card_age_days': 4000, 'amount_spike_ratio': 1.0, 'stub_score': 0.9},
+            {'hour_of_day': 10, 'stub_score': 0.7},
+        ]
+
+    def _engine(self, **cascade):
+        return FraudDecisionEngine(RuleService(self.rules), StubMLService(), **cascade)
+
+    def test_hot_rules_keep_decisions_and_reasons(self):
+        plain = self._engine()
+        cascade = self._engine(hot_rule_ids=['59'])
+
+        for t in self.transactions:
+            self.assertEqual(cascade.evaluate(t), plain.evaluate(t))
+
+        self.assertEqual(cascade.stage_exits['hot_rules'], 1)
+        self.assertEqual(cascade.stage_exits['rules'], 1)
+        self.assertEqual(cascade.stage_exits['ml'], 4)
+        self.assertEqual(plain.stage_exits['rules'], 2)
+
+    def test_overlapping_declines_report_first_rule_in_file_order(self):
+        plain = self._engine()
+        cascade = self._engine(hot_rule_ids=['59', '24'])
+
+        # Rules 5 and 59 both decline; 5 comes first in the rule book
+        transaction = {'amount_spike_ratio': 3, 'card_age_days': 5}
+        self.assertEqual(plain.evaluate(transaction)['reasons'], ['High-value purchase after theft'])
+        self.assertEqual(cascade.evaluate(transaction), plain.evaluate(transaction))
+        self.assertEqual(cascade.stage_exits['hot_rules'], 1)
+
+        # STEP_UP rules keep file order with a hot one among them
+        transaction = {'new_merchant_flag': True, 'hour_of_day': 23}
+        self.assertEqual(cascade.evaluate(transaction), plain.evaluate(transaction))
+
+    def test_trusted_profile_skips_ml(self):
+        engine = self._engine(trusted_profiles=[
+            {'name': 'seasoned_card_normal_spend', 'condition': 'card_age_days > 1000 and amount_spike_ratio < 1.2'}
+        ])
+
+        result = engine.evaluate(self.transactions[3])
+        self.assertEqual(result['decision'], 'APPROVE')
+        self.assertEqual(result['trusted_profile'], 'seasoned_card_normal_spend')
+        self.assertEqual(engine.ml_service.calls, 0)
+
+        # Rule STEP_UP never short-circuits the model
+        engine.evaluate(self.transactions[2])
+        self.assertEqual(engine.ml_service.calls, 1)
+
+        stats = engine.stage_stats()
+        self.assertEqual(stats['trusted_profile'], {'count': 1, 'share': 0.5})
+
+if __name__ == '__main__':
+    unittest.main()
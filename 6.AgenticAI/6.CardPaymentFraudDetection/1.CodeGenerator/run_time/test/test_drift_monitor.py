@@ -0,0 +1,130 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from run_time.ml_engine.drift_monitor import DriftBaseline, DriftMonitor, ks, psi
+from run_time.ml_engine.fraud_detection_service_using_ml import MLService
+from run_time.test.test_ml_service import _train_model
+
+def _traffic(n, seed):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "txn_density": rng.uniform(0, 3, n),
+        "amount_spike_ratio": rng.uniform(0.8, 6, n),
+        "vpn_detected": rng.integers(0, 2, n),
+        "card_age_days": rng.integers(1, 5000, n),
+    })
+
+class TestDriftMath(unittest.TestCase):
+    def test_psi_and_ks(self):
+        self.assertAlmostEqual(psi([0.5, 0.5], [0.5, 0.5]), 0.0)
+        self.assertGreater(psi([0.5, 0.5], [0.9, 0.1]), 0.25)
+        self.assertAlmostEqual(ks([0.5, 0.5], [0.9, 0.1]), 0.4)
+
+class TestDriftMonitor(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.TemporaryDirectory()
+        cls.model_path = os.path.join(cls.tmp.name, "model.joblib")
+        _train_model(cls.model_path)
+        cls.baseline = DriftBaseline.from_frame(_traffic(5000, 1), MLService(cls.model_path))
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp.cleanup()
+
+    def _service(self, **kwargs):
+        monitor = DriftMonitor(self.baseline, sample_rate=1.0, seed=0, **kwargs)
+        return MLService(self.model_path, drift_monitor=monitor), monitor
+
+    def test_baseline_sketch_kinds_and_round_trip(self):
+        sketches = self.baseline.sketches
+        self.assertEqual(sketches["vpn_detected"]["kind"], "categorical")
+        self.assertEqual(sketches["txn_density"]["kind"], "numeric")
+        self.assertIn("__score__", sketches)
+
+        path = os.path.join(self.tmp.name, "baseline.json")
+        self.baseline.save(path)
+        loaded = DriftBaseline.load(path)
+        self.assertEqual(loaded.features, self.baseline.features)
+        self.assertEqual(loaded.sketches, self.baseline.sketches)
+
+    def test_healthy_traffic_has_no_alerts(self):
+        service, monitor = self._service()
+        traffic = _traffic(2000, 2)
+        service.score_batch(traffic)
+        for transaction in traffic.head(300).to_dict("records"):
+            service.score(transaction)
+
+        report = monitor.report()
+        self.assertEqual(report["rows"], 2300)
+        self.assertEqual(report["alerts"], [])
+        self.assertEqual(report["features"]["txn_density"]["status"], "ok")
+
+    def test_fractional_categories_match_float32_rows(self):
+        training = _traffic(3000, 6)
+        training["txn_density"] = np.random.default_rng(6).choice([0.1, 0.3, 0.7], 3000)
+        service = MLService(self.model_path)
+        baseline = DriftBaseline.from_frame(training, service)
+        self.assertEqual(baseline.sketches["txn_density"]["kind"], "categorical")
+
+        # Replaying the training frame itself is no drift
+        for rebuilt in (baseline, DriftBaseline(baseline.features, {
+            name: {**sketch, "values": [0.1, 0.3, 0.7]} if name == "txn_density" else sketch
+            for name, sketch in baseline.sketches.items()
+        })):
+            monitor = DriftMonitor(rebuilt, sample_rate=1.0)
+            MLService(self.model_path, drift_monitor=monitor).score_batch(training)
+            report = monitor.report()
+            self.assertEqual(report["alerts"], [])
+            self.assertLess(report["features"]["txn_density"]["psi"], 0.01)
+
+    def test_absent_feature_is_a_missing_rate_alert(self):
+        service, monitor = self._service()
+        records = _traffic(1000, 3).drop(columns=["txn_density"]).to_dict("records")
+        service.score_batch(records)
+
+        report = monitor.report()
+        self.assertIn("txn_density", report["alerts"])
+        self.assertEqual(report["features"]["txn_density"]["missing_rate"], 1.0)
+        self.assertEqual(report["features"]["txn_density"]["observed"], 0)
+        self.assertEqual(report["features"]["card_age_days"]["missing_rate"], 0.0)
+
+    def test_zero_filled_feature_is_a_distribution_alert(self):
+        service, monitor = self._service()
+        traffic = _traffic(1000, 4)
+        traffic["amount_spike_ratio"] = 0.0
+        service.score_batch(traffic)
+
+        report = monitor.report()
+        self.assertIn("amount_spike_ratio", report["alerts"])
+        self.assertGreaterEqual(report["features"]["amount_spike_ratio"]["psi"], 0.25)
+        self.assertEqual(report["features"]["amount_spike_ratio"]["missing_rate"], 0.0)
+
+    def test_sampling_and_reset(self):
+        monitor = DriftMonitor(self.baseline, sample_rate=0.0)
+        service = MLService(self.model_path, drift_monitor=monitor)
+        service.score_batch(_traffic(100, 5))
+        self.assertEqual((monitor.offered, monitor.sampled), (100, 0))
+        self.assertEqual(monitor.report()["features"]["score"]["status"], "insufficient")
+
+        service, monitor = self._service()
+        service.score_batch(_traffic(100, 5))
+        monitor.reset()
+        self.assertEqual(monitor.report()["rows"], 0)
+
+        with self.assertRaises(ValueError):
+            DriftMonitor(self.baseline, sample_rate=1.5)
+
+    def test_feature_mismatch_raises(self):
+        # Same sketches, different booster feature order
+        baseline = DriftBaseline(self.baseline.features[::-1], self.baseline.sketches)
+        monitor = DriftMonitor(baseline)
+        with self.assertRaises(ValueError):
+            MLService(self.model_path, drift_monitor=monitor)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+import os
+import random
+import tempfile
+import unittest
+
+import xgboost as xgb
+from joblib import dump, load
+
+from run_time.ml_engine import hyperparameter_search as hs
+from run_time.ml_engine import model_compaction, model_refresh, training_pipeline
+from taining_data import vectorized_data_generator as generator
+
+class TestHyperparameterSearch(unittest.TestCase):
+    def test_rung_rounds(self):
+        self.assertEqual(hs.rung_rounds(25, 400, 3), [25, 75, 225, 400])
+        self.assertEqual(hs.rung_rounds(10, 10, 3), [10])
+
+    def test_sample_params_within_space(self):
+        rng = random.Random(0)
+        space = {"max_depth": ("int", 3, 5), "learning_rate": ("log", 0.01, 0.3),
+                 "subsample": ("uniform", 0.6, 1.0), "grow_policy": ["depthwise", "lossguide"]}
+        for _ in range(100):
+            params = hs.sample_params(rng, space)
+            self.assertIn(params["max_depth"], (3, 4, 5))
+            self.assertTrue(0.01 <= params["learning_rate"] <= 0.3)
+            self.assertTrue(0.6 <= params["subsample"] <= 1.0)
+            self.assertIn(params["grow_policy"], ("depthwise", "lossguide"))
+
+    def test_scheduler_promotes_top_trials(self):
+        scheduler = hs.AshaScheduler([10, 30], eta=3, max_trials=3)
+        jobs = [scheduler.next_job() for _ in range(3)]
+        self.assertEqual([j[2] for j in jobs], [0, 0, 0])
+
+        for trial_id, auc in [(0, 0.90), (1, 0.95), (2, 0.80)]:
+            scheduler.record(0, {"trial_id": trial_id, "auc": auc, "stopped_early": False,
+                                 "raw_model": b"model-%d" % trial_id})
+
+        trial_id, _, rung, raw_model = scheduler.next_job()
+        self.assertEqual((trial_id, rung, raw_model), (1, 1, b"model-1"))
+        self.assertIsNone(scheduler.next_job())
+
+    def test_pareto_front_and_recommendation(self):
+        results = [
+            {"trial_id": 0, "auc": 0.99, "p50_us": 300},
+            {"trial_id": 1, "auc": 0.98, "p50_us": 100},
+            {"trial_id": 2, "auc": 0.97, "p50_us": 200},   # dominated by 1
+            {"trial_id": 3, "auc": 0.99, "p50_us": 400},   # dominated by 0
+        ]
+        self.assertEqual(hs.pareto_front(results), {0, 1})
+        self.assertEqual(hs.recommend(results)["trial_id"], 0)
+        self.assertEqual(hs.recommend(results, latency_budget_us=250)["trial_id"], 1)
+        self.assertIsNone(hs.recommend(results, latency_budget_us=50))
+
+    def test_search_end_to_end(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            data_path = os.path.join(tmp, "data.csv")
+            generator.generate_dataset(total_rows=3_000, output=data_path, fraud_rate=0.1, workers=1)
+
+            results = hs.search(data_path, budget_s=60, workers=1, nthread=1, max_trials=4,
+                                min_rounds=5, max_rounds=15, verbose=False)
+            self.assertEqual(sorted(r["trial_id"] for r in results), [0, 1, 2, 3])
+
+            rows = hs.sample_rows(data_path, 50)
+            p50, p99 = hs.inference_latency(results[0]["raw_model"], rows)
+            self.assertTrue(0 < p50 <= p99)
+
+            # A saved trial keeps its own parameters, so a refresh grows matching trees
+            best = results[0]
+            model_path = os.path.join(tmp, "searched.joblib")
+            dump(training_pipeline.to_classifier(xgb.Booster(model_file=bytearray(best["raw_model"]))), model_path)
+            params = training_pipeline.training_params(load(model_path).get_booster())
+            self.assertEqual(params["max_depth"], best["params"]["max_depth"])
+            self.assertAlmostEqual(params["learning_rate"], best["params"]["learning_rate"], places=5)
+
+            refreshed = os.path.join(tmp, "refreshed.joblib")
+            report = model_refresh.refresh(model_path, data_path, rounds=5, auc_tolerance=0.05, output_path=refreshed)
+            self.assertTrue(report["promoted"])
+            self.assertEqual(report["trees_after"], report["trees_before"] + 5)
+            added = load(refreshed).get_booster()[report["trees_before"]:]
+            self.assertLessEqual(model_compaction.max_depth(added), best["params"]["max_depth"])
@@ -0,0 +1,92 @@
+import importlib.util
+import os
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+import xgboost as xgb
+from joblib import dump
+
+from run_time.ml_engine.fraud_detection_service_using_ml import MLService
+from run_time.test.test_ml_service import _train_model
+
+HAS_ONNX = all(importlib.util.find_spec(m) for m in ("onnxruntime", "onnxmltools"))
+
+def _train_early_stopped_model(path):
+    # Noisy labels + a high learning rate: validation loss bottoms out early
+    rng = np.random.default_rng(7)
+    X = pd.DataFrame({
+        "txn_density": rng.uniform(0, 3, 800),
+        "amount_spike_ratio": rng.uniform(0.8, 6, 800),
+        "vpn_detected": rng.integers(0, 2, 800),
+        "card_age_days": rng.integers(1, 5000, 800),
+    })
+    y = ((X["txn_density"] > 1.5) ^ (rng.random(800) < 0.3)).astype(int)
+    model = xgb.XGBClassifier(
+        n_estimators=100, max_depth=4, learning_rate=0.5, tree_method="hist",
+        early_stopping_rounds=5, eval_metric="logloss",
+    )
+    model.fit(X[:600], y[:600], eval_set=[(X[600:], y[600:])], verbose=False)
+    dump(model, path)
+    return X
+
+class TestInferenceBackends(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.TemporaryDirectory()
+        cls.model_path = os.path.join(cls.tmp.name, "model.joblib")
+        X = _train_model(cls.model_path)
+        cls.reference = MLService(cls.model_path, backend="sklearn")
+        cls.X = cls.reference.to_matrix(X)
+        cls.X[::5, 0] = np.nan  # exercise missing-value routing
+        cls.expected = cls.reference.predict(cls.X)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp.cleanup()
+
+    def _assert_parity(self, backend, **options):
+        service = MLService(self.model_path, backend=backend, backend_options=options)
+        np.testing.assert_allclose(service.predict(self.X), self.expected, atol=1e-6)
+        np.testing.assert_allclose(service.predict(self.X[:1]), self.expected[:1], atol=1e-6)
+
+        transaction = {"txn_density": 2.1, "amount_spike_ratio": 1.7, "vpn_detected": True}
+        self.assertEqual(service.score(transaction), self.reference.score(transaction))
+
+    def test_booster_parity(self):
+        self._assert_parity("booster")
+
+    def test_numpy_tree_walker_parity(self):
+        self._assert_parity("numpy")
+
+    @unittest.skipUnless(HAS_ONNX, "onnxruntime / onnxmltools not installed")
+    def test_onnx_parity_and_export_cache(self):
+        onnx_path = os.path.join(self.tmp.name, "model.onnx")
+        self._assert_parity("onnx", onnx_path=onnx_path)
+        self.assertTrue(os.path.exists(onnx_path))
+        self._assert_parity("onnx", onnx_path=onnx_path)
+
+    def test_unknown_backend(self):
+        with self.assertRaises(ValueError):
+            MLService(self.model_path, backend="gpu")
+
+class TestEarlyStoppedModel(unittest.TestCase):
+    def test_backends_stop_at_best_iteration(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            model_path = os.path.join(tmp, "model.joblib")
+            X = _train_early_stopped_model(model_path)
+            reference = MLService(model_path, backend="sklearn")
+            booster = reference.model.get_booster()
+            self.assertLess(reference.model.best_iteration + 1, booster.num_boosted_rounds())
+
+            X = reference.to_matrix(X)
+            expected = reference.predict(X)
+            self.assertGreater(np.abs(booster.inplace_predict(X, validate_features=False) - expected).max(), 1e-3)
+
+            for backend in ("booster", "numpy"):
+                service = MLService(model_path, backend=backend)
+                np.testing.assert_allclose(service.predict(X), expected, atol=1e-6)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+import os
+import random
+import re
+import tempfile
+import threading
+import unittest
+
+from run_time.decision_engine.fraud_decision_engine import FraudDecisionEngine
+from run_time.decision_engine.latency_metrics import LatencyHistogram, LatencyMetrics, bucket_bounds, bucket_index
+from run_time.ml_engine.fraud_detection_service_using_ml import MLService
+from run_time.rule_engine.rule_service import RuleService
+from run_time.test.test_ml_service import _train_model
+
+class TestLatencyMetrics(unittest.TestCase):
+    def test_buckets_cover_values_within_resolution(self):
+        rng = random.Random(0)
+        for value in [0, 1, 63, 64, 127, 128, 129, 10**6, 2**63] + [rng.randrange(10**12) for _ in range(5_000)]:
+            lower, upper = bucket_bounds(bucket_index(value))
+            self.assertTrue(lower <= value < upper)
+            self.assertLessEqual(upper - lower, max(1, lower / 64))
+
+    def test_histogram_quantiles(self):
+        histogram = LatencyHistogram()
+        for us in range(1, 1001):
+            histogram.record(us * 1000)
+
+        self.assertEqual(histogram.count, 1000)
+        self.assertAlmostEqual(histogram.quantile(0.5), 500_000, delta=500_000 * 0.02)
+        self.assertAlmostEqual(histogram.quantile(0.99), 990_000, delta=990_000 * 0.02)
+        summary = histogram.summary()
+        self.assertAlmostEqual(summary["mean_us"], 500.5)
+        self.assertEqual(sum(c for _, _, c in summary["buckets"]), 1000)
+
+    def test_threads_record_into_merged_snapshot(self):
+        metrics = LatencyMetrics()
+
+        def work():
+            for i in range(1000):
+                metrics.record("rules.pass", 1000 + i)
+
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(metrics.snapshot()["stages"]["rules.pass"]["count"], 4000)
+        metrics.reset()
+        self.assertEqual(metrics.snapshot()["stages"], {})
+
+    def test_engine_stages_rules_sinks_and_prometheus(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            model_path = os.path.join(tmp, "model.joblib")
+            _train_model(model_path)
+            ml_service = MLService(model_path)
+
+        rules = [
+            {'rule_id': '5', 'use_case': 'High-value purchase after theft', 'primary_feature': 'amount_spike_ratio', 'condition': 'amount_spike_ratio > 2', 'action': 'DECLINE'},
+            {'rule_id': '24', 'use_case': 'Card used at odd hours', 'primary_feature': 'hour_of_day', 'condition': 'hour_of_day > 20', 'action': 'STEP_UP'},
+        ]
+        metrics = LatencyMetrics(rule_sample_every=2)
+        events = []
+        metrics.add_sink(lambda stage, ns, rule_id: events.append((stage, rule_id)))
+        engine = FraudDecisionEngine(RuleService(rules), ml_service, metrics=metrics)
+        self.assertIs(engine.rule_service.metrics, metrics)
+        self.assertIs(ml_service.metrics, metrics)
+
+        for i in range(20):
+            engine.evaluate({"amount_spike_ratio": 3 if i % 4 == 0 else 1, "hour_of_day": 22, "txn_density": 0.5})
+
+        snapshot = metrics.snapshot()
+        stages = snapshot["stages"]
+        self.assertEqual(stages["engine.total"]["count"], 20)
+        self.assertEqual(stages["engine.ml"]["count"], 15)
+        for stage in ["engine.rules", "engine.combine", "ml.features", "ml.predict"]:
+            self.assertIn(stage, stages)
+        # Every second pass times each rule and is left out of rules.pass
+        self.assertEqual(stages["rules.pass"]["count"], 10)
+        self.assertEqual(set(snapshot["rules"]), {"5", "24"})
+        self.assertIn(("rules.rule", "24"), events)
+        self.assertIn(("engine.total", None), events)
+
+        text = metrics.prometheus()
+        self.assertIn('# TYPE fraud_engine_stage_latency_seconds histogram', text)
+        self.assertIn('fraud_engine_stage_latency_seconds_count{stage="engine.total"} 20', text)
+        self.assertIn('fraud_engine_stage_latency_seconds_bucket{stage="engine.total",le="+Inf"} 20', text)
+        self.assertIn('{stage="rules.rule",rule_id="24",quantile="0.99"}', text)
+
+        buckets = [int(v) for v in re.findall(r'_bucket\{stage="engine.total",le="[^"]+"\} (\d+)', text)]
+        self.assertEqual(buckets, sorted(buckets))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+import json
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+from benchmarks import load_generator as lg
+
+class SleepTarget:
+    """Serves one request at a time in `service_s` seconds."""
+
+    def __init__(self, service_s):
+        self.service_s = service_s
+        self.lock = threading.Lock()
+
+    def __call__(self, transaction):
+        with self.lock:
+            time.sleep(self.service_s)
+
+class EchoHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        status = 500 if body.get("fail") else 200
+        payload = json.dumps({"decision": "APPROVE"}).encode()
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+class TestLoadGenerator(unittest.TestCase):
+    def test_arrival_profiles(self):
+        constant = lg.arrivals("constant", 100, 2.0)
+        self.assertEqual(len(constant), 200)
+
+        poisson = lg.arrivals("poisson", 1000, 5.0, seed=1)
+        self.assertTrue(np.all(np.diff(poisson) >= 0))
+        self.assertAlmostEqual(len(poisson) / 5.0, 1000, delta=100)
+        np.testing.assert_array_equal(poisson, lg.arrivals("poisson", 1000, 5.0, seed=1))
+
+        burst = lg.arrivals("burst", 1000, 10.0, seed=1, burst_factor=4, burst_period_s=1.0, burst_duty=0.2)
+        self.assertAlmostEqual(len(burst) / 10.0, 1000, delta=100)
+        in_burst = np.mod(burst, 1.0) < 0.2
+        # 80% of the traffic in 20% of the time
+        self.assertAlmostEqual(in_burst.mean(), 0.8, delta=0.05)
+
+        with self.assertRaises(ValueError):
+            lg.arrivals("burst", 100, 1.0, burst_factor=10, burst_duty=0.5)
+
+    def test_queueing_delay_is_counted_past_saturation(self):
+        target = SleepTarget(0.004)   # capacity ~250/s
+        transactions = [{"i": i} for i in range(10)]
+
+        below = lg.summarize(50, *lg.run(target, transactions, lg.arrivals("constant", 50, 1.0)), warmup_s=0)
+        above = lg.summarize(400, *lg.run(target, transactions, lg.arrivals("constant", 400, 1.0)), warmup_s=0)
+
+        self.assertEqual(below["errors"], 0)
+        self.assertLess(below["latency_ms"]["p99"], 50)
+        # Service time looks the same; corrected latency shows the backlog
+        self.assertLess(above["service_ms"]["p99"], 50)
+        self.assertGreater(above["latency_ms"]["p99"], 300)
+        self.assertLess(above["achieved_rps"], 0.8 * 400)
+
+    def test_sweep_finds_saturation(self):
+        report = lg.sweep(SleepTarget(0.004), [{}], [50, 100, 600], duration_s=1.0, profile="constant",
+                          slo_ms=50, warmup_s=0, verbose=False)
+        self.assertEqual([p["offered_rps"] for p in report["curve"]], [50, 100, 600])
+        self.assertEqual(report["saturation_rps"], 100)
+        self.assertFalse(report["curve"][-1]["keeps_up"])
+
+    def test_http_target(self):
+        server = ThreadingHTTPServer(("127.0.0.1", 0), EchoHandler)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            target = lg.HttpTarget(f"http://127.0.0.1:{server.server_address[1]}/evaluate")
+            self.assertEqual(json.loads(target({"amount_spike_ratio": 1.0})), {"decision": "APPROVE"})
+
+            transactions = [{"amount_spike_ratio": 1.0}, {"fail": True}]
+            point = lg.summarize(100, *lg.run(target, transactions, lg.arrivals("constant", 100, 0.2), concurrency=2),
+                                 warmup_s=0)
+            self.assertEqual(point["requests"], 20)
+            self.assertEqual(point["errors"], 10)
+        finally:
+            server.shutdown()
+            server.server_close()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+import threading
+import time
+import unittest
+from concurrent.futures import Future
+
+from run_time.ml_engine.micro_batcher import MicroBatcher
+
+class TestMicroBatcher(unittest.TestCase):
+    def test_batches_concurrent_calls(self):
+        batcher = MicroBatcher(lambda items: [i * 2 for i in items], max_batch_size=4, max_wait_us=1000)
+        futures = [batcher.submit_async(i) for i in range(10)]
+        self.assertEqual([f.result(timeout=5) for f in futures], [i * 2 for i in range(10)])
+        batcher.close()
+        self.assertEqual(batcher.items, 10)
+
+    def test_submit_after_close_raises(self):
+        batcher = MicroBatcher(lambda items: items)
+        batcher.close()
+        batcher.close()
+        with self.assertRaises(RuntimeError):
+            batcher.submit(1)
+
+    def test_close_resolves_queued_and_fails_leftover_items(self):
+        release = threading.Event()
+
+        def slow(items):
+            release.wait(5)
+            return items
+
+        batcher = MicroBatcher(slow, max_batch_size=1)
+        first = batcher.submit_async("first")
+        queued = batcher.submit_async("queued")
+
+        # An item that slipped in behind the shutdown sentinel
+        leftover = Future()
+        closer = threading.Thread(target=batcher.close)
+        closer.start()
+        while not batcher._closed:
+            time.sleep(0.001)
+        with batcher._lock:   # sentinel is queued once close() releases the lock
+            batcher._queue.put(("late", leftover))
+        release.set()
+        closer.join(5)
+
+        self.assertEqual((first.result(timeout=5), queued.result(timeout=5)), ("first", "queued"))
+        with self.assertRaises(RuntimeError):
+            leftover.result(timeout=5)
+
+if __name__ == '__main__':
+    unittest.main()
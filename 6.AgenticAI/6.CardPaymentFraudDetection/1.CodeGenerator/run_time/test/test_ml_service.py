@@ -0,0 +1,85 @@
+import os
+import tempfile
+import threading
+import unittest
+
+import numpy as np
+import pandas as pd
+import xgboost as xgb
+from joblib import dump
+
+from run_time.ml_engine.fraud_detection_service_using_ml import MLService
+
+def _train_model(path):
+    rng = np.random.default_rng(42)
+    X = pd.DataFrame({
+        "txn_density": rng.uniform(0, 3, 500),
+        "amount_spike_ratio": rng.uniform(0.8, 6, 500),
+        "vpn_detected": rng.integers(0, 2, 500),
+        "card_age_days": rng.integers(1, 5000, 500),
+    })
+    y = ((X["txn_density"] > 1.5) | (X["amount_spike_ratio"] > 2)).astype(int)
+    model = xgb.XGBClassifier(n_estimators=20, max_depth=3, tree_method="hist")
+    model.fit(X, y)
+    dump(model, path)
+    return X
+
+class TestMLService(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.TemporaryDirectory()
+        cls.model_path = os.path.join(cls.tmp.name, "model.joblib")
+        cls.X = _train_model(cls.model_path)
+        cls.service = MLService(cls.model_path)
+        cls.transactions = [
+            {"txn_density": 2.1, "amount_spike_ratio": 1.7, "merchant_risk_score": "medium"},
+            {"vpn_detected": True, "card_age_days": 5},
+            {"txn_density": 0.2, "amount_spike_ratio": 1.0, "vpn_detected": False, "card_age_days": 1200},
+            {},
+        ]
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp.cleanup()
+
+    def _dataframe_score(self, transaction):
+        df = pd.DataFrame([transaction])
+        for col in df.select_dtypes(include=["bool"]).columns:
+            df[col] = df[col].astype(int)
+        df = df.reindex(columns=self.service.features, fill_value=0)
+        return round(float(self.service.model.predict_proba(df)[0][1]), 4)
+
+    def test_score_matches_dataframe_path(self):
+        for t in self.transactions:
+            self.assertEqual(self.service.score(t)["score"], self._dataframe_score(t))
+
+    def test_score_batch_matches_score(self):
+        batch = self.service.score_batch(self.transactions)
+        self.assertEqual(batch, [self.service.score(t) for t in self.transactions])
+
+    def test_to_matrix_from_dataframe(self):
+        records = self.X.head(50).to_dict("records")
+        np.testing.assert_array_equal(
+            self.service.to_matrix(self.X.head(50)), self.service.to_matrix(records)
+        )
+
+    def test_micro_batched_concurrent_score(self):
+        service = MLService(self.model_path, micro_batch_size=8, micro_batch_wait_us=1000)
+        transactions = self.X.head(40).to_dict("records")
+        results = [None] * len(transactions)
+
+        def call(i):
+            results[i] = service.score(transactions[i])
+
+        threads = [threading.Thread(target=call, args=(i,)) for i in range(len(transactions))]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        service.close()
+
+        self.assertEqual(results, self.service.score_batch(transactions))
+        self.assertEqual(service.batcher.items, len(transactions))
+
+if __name__ == '__main__':
+    unittest.main()
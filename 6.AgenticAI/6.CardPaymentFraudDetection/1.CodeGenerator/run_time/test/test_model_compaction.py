@@ -0,0 +1,77 @@
+import json
+import os
+import tempfile
+import unittest
+
+from joblib import dump, load
+
+from run_time.ml_engine import model_compaction as mc
+from run_time.ml_engine import training_pipeline
+from run_time.ml_engine.fraud_detection_service_using_ml import MLService
+from taining_data import vectorized_data_generator as generator
+
+class TestModelCompaction(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.TemporaryDirectory()
+        cls.data_path = os.path.join(cls.tmp.name, "data.csv")
+        generator.generate_dataset(total_rows=3_000, output=cls.data_path, fraud_rate=0.1, seed=1, workers=1)
+
+        model, _ = training_pipeline.train(
+            cls.data_path, num_boost_round=20, params={"max_depth": 3}, verbose=False
+        )
+        cls.model_path = os.path.join(cls.tmp.name, "model.joblib")
+        dump(model, cls.model_path)
+        cls.booster = model.get_booster()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp.cleanup()
+
+    def test_model_facts(self):
+        self.assertEqual(mc.max_depth(self.booster), 3)
+
+        shares = mc.gain_shares(self.booster)
+        self.assertEqual(set(shares), set(self.booster.feature_names))
+        self.assertAlmostEqual(sum(shares.values()), 1.0, places=6)
+
+    def test_pareto_front_and_recommendation(self):
+        results = [
+            {"name": "baseline", "kind": "baseline", "auc": 0.990, "p50_us": 300},
+            {"name": "truncate_5", "kind": "truncate", "auc": 0.985, "p50_us": 100},
+            {"name": "prune_0.01", "kind": "prune", "auc": 0.980, "p50_us": 200},   # dominated
+            {"name": "distill_d3", "kind": "distill", "auc": 0.990, "p50_us": 250},
+        ]
+        self.assertEqual(mc.pareto_front(results), {"truncate_5", "distill_d3"})
+        self.assertEqual(mc.recommend(results)["name"], "distill_d3")
+        self.assertEqual(mc.recommend(results, max_auc_drop=0.01)["name"], "truncate_5")
+
+    def test_compact_end_to_end(self):
+        results = mc.compact(self.model_path, self.data_path, samples=30, verbose=False,
+                             truncate_fractions=[0.5], prune_thresholds=[0.05], student_depths=[2])
+        by_name = {r["name"]: r for r in results}
+
+        self.assertEqual(by_name["baseline"]["trees"], 20)
+        self.assertIn("truncate_10", by_name)
+        self.assertEqual({r["kind"] for r in results}, {"baseline", "truncate", "prune", "distill"})
+        self.assertLessEqual(by_name["distill_d2"]["max_depth"], 2)
+        self.assertLess(by_name["prune_0.05"]["features"], by_name["baseline"]["features"])
+        for r in results:
+            self.assertTrue(0.5 <= r["auc"] <= 1.0)
+            self.assertTrue(0 < r["p50_us"] <= r["p99_us"])
+
+    def test_main_saves_recommended_model(self):
+        output = os.path.join(self.tmp.name, "report.json")
+        best = os.path.join(self.tmp.name, "best.joblib")
+        code = mc.main(["--model", self.model_path, "--data", self.data_path, "--samples", "20",
+                        "--max-auc-drop", "1", "--output", output, "--save-best", best])
+        self.assertEqual(code, 0)
+
+        with open(output) as f:
+            report = json.load(f)
+        recommended = next(c for c in report["candidates"] if c["name"] == report["recommended"])
+        booster = load(best).get_booster()
+        self.assertEqual(booster.num_boosted_rounds(), recommended["trees"])
+
+        service = MLService(best)
+        self.assertTrue(0.0 <= service.score({f: 0 for f in service.features})["score"] <= 1.0)
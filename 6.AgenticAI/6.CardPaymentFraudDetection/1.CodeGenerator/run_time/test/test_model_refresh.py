@@ -0,0 +1,90 @@
+import os
+import tempfile
+import unittest
+
+from joblib import dump, load
+
+from run_time.ml_engine import model_compaction, model_refresh, training_pipeline
+from run_time.ml_engine.fraud_detection_service_using_ml import MLService
+from taining_data import vectorized_data_generator as generator
+
+class TestModelRefresh(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.TemporaryDirectory()
+        cls.base_data = os.path.join(cls.tmp.name, "base.csv")
+        cls.new_data = os.path.join(cls.tmp.name, "new.csv")
+        cls.holdout = os.path.join(cls.tmp.name, "holdout.csv")
+        generator.generate_dataset(total_rows=3_000, output=cls.base_data, fraud_rate=0.1, seed=1, workers=1)
+        generator.generate_dataset(total_rows=2_000, output=cls.new_data, fraud_rate=0.1, seed=2, workers=1)
+        generator.generate_dataset(total_rows=2_000, output=cls.holdout, fraud_rate=0.1, seed=3, workers=1)
+
+        # Shallow incumbent so the refreshed model has room to improve
+        model, _ = training_pipeline.train(
+            cls.base_data, num_boost_round=3, params={"max_depth": 1}, verbose=False
+        )
+        cls.incumbent_path = os.path.join(cls.tmp.name, "incumbent.joblib")
+        dump(model, cls.incumbent_path)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp.cleanup()
+
+    def test_add_trees_promotes_candidate(self):
+        output = os.path.join(self.tmp.name, "added.joblib")
+        report = model_refresh.refresh(
+            self.incumbent_path, self.new_data, holdout_path=self.holdout,
+            rounds=20, output_path=output
+        )
+        self.assertTrue(report["promoted"])
+        self.assertEqual(report["trees_before"], 3)
+        self.assertEqual(report["trees_after"], 23)
+        self.assertGreaterEqual(report["candidate_auc"], report["incumbent_auc"])
+        self.assertEqual(load(output).get_booster().num_boosted_rounds(), 23)
+        MLService(output)
+
+        # New trees grown with the incumbent's parameters, not the PARAMS defaults
+        candidate = load(output).get_booster()
+        self.assertEqual(model_compaction.max_depth(candidate), 1)
+        params = training_pipeline.training_params(candidate)
+        self.assertEqual(params["max_depth"], 1)
+        self.assertEqual(params["learning_rate"], training_pipeline.PARAMS["learning_rate"])
+
+    def test_refresh_leaves_keeps_tree_count(self):
+        output = os.path.join(self.tmp.name, "refreshed.joblib")
+        report = model_refresh.refresh(
+            self.incumbent_path, self.new_data, mode="refresh_leaves",
+            auc_tolerance=0.01, output_path=output
+        )
+        self.assertEqual(report["trees_before"], report["trees_after"])
+        self.assertEqual(report["holdout_rows"] + report["rows"], 2_000)
+        # Same splits, refitted leaves: ranking within the tolerance, so promoted
+        self.assertGreaterEqual(report["candidate_auc"], report["incumbent_auc"] - 0.01)
+        self.assertTrue(report["promoted"])
+        self.assertTrue(os.path.exists(output))
+        self.assertEqual(model_compaction.max_depth(load(output).get_booster()), 1)
+
+    def test_rejected_candidate_leaves_incumbent_untouched(self):
+        noisy = os.path.join(self.tmp.name, "noisy.csv")
+        df = generator.generate_chunk(0, 2_000, seed=4, shard=0, chunk=0, fraud_rate=0.5)
+        df["label"] = df["label"].sample(frac=1, random_state=0).to_numpy()
+        df.to_csv(noisy, index=False)
+
+        output = os.path.join(self.tmp.name, "rejected.joblib")
+        report = model_refresh.refresh(
+            self.incumbent_path, noisy, holdout_path=self.holdout,
+            rounds=50, output_path=output
+        )
+        self.assertFalse(report["promoted"])
+        self.assertFalse(os.path.exists(output))
+
+    def test_training_params_survive_save(self):
+        booster = load(self.incumbent_path).get_booster()
+        params = training_pipeline.training_params(booster)
+        self.assertEqual(params["max_depth"], 1)
+        self.assertEqual(params["tree_method"], "hist")
+        self.assertGreater(params["scale_pos_weight"], 1)
+
+    def test_unknown_mode(self):
+        with self.assertRaises(ValueError):
+            model_refresh.refresh(self.incumbent_path, self.new_data, mode="retrain")
@@ -0,0 +1,140 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+import xgboost as xgb
+
+from run_time.decision_engine.fraud_decision_engine import FraudDecisionEngine
+from run_time.ml_engine.fraud_detection_service_using_ml import MLService
+from run_time.ml_engine.reason_codes import ReasonCodeExplainer
+from run_time.rule_engine.rule_service import RuleService
+from run_time.test.test_decision_cascade import StubMLService
+from run_time.test.test_inference_backends import _train_early_stopped_model
+from run_time.test.test_ml_service import _train_model
+from run_time.test.test_score_cache import _train_reversed_model
+
+class StubExplainer:
+    def __init__(self):
+        self.calls = 0
+
+    def explain(self, transaction):
+        self.calls += 1
+        return [{"feature": "txn_density", "contribution": 1.0}], "pred_contribs"
+
+class TestReasonCodeExplainer(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.TemporaryDirectory()
+        model_path = os.path.join(cls.tmp.name, "model.joblib")
+        _train_model(model_path)
+        cls.service = MLService(model_path)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp.cleanup()
+
+    def setUp(self):
+        self.explainer = ReasonCodeExplainer(self.service, top_k=2, budget_ms=1000)
+
+    def tearDown(self):
+        self.explainer.close()
+
+    def test_top_k_positive_contributions(self):
+        transaction = {"txn_density": 2.5, "amount_spike_ratio": 1.0, "card_age_days": 900}
+        reasons, source = self.explainer.explain(transaction)
+        self.assertEqual(source, "pred_contribs")
+
+        X = self.service.to_matrix([transaction])
+        contribs = self.service.model.get_booster().predict(
+            xgb.DMatrix(X), pred_contribs=True, validate_features=False
+        )[0, :-1]
+        expected = [self.service.features[j] for j in np.argsort(-contribs)[:2] if contribs[j] > 0]
+
+        self.assertEqual([r["feature"] for r in reasons], expected)
+        self.assertEqual(reasons[0]["feature"], "txn_density")
+        self.assertTrue(all(r["contribution"] > 0 for r in reasons))
+
+    def test_repeated_feature_vector_served_from_cache(self):
+        transaction = {"amount_spike_ratio": 4.0}
+        first, _ = self.explainer.explain(transaction)
+        second, source = self.explainer.explain(dict(transaction))
+        self.assertEqual(source, "cache")
+        self.assertEqual(first, second)
+        self.assertEqual(self.explainer.stats()["hits"], 1)
+
+    def test_budget_exceeded_falls_back_to_global_importance(self):
+        explainer = ReasonCodeExplainer(self.service, budget_ms=0)
+        try:
+            reasons, source = explainer.explain({"txn_density": 2.9})
+            self.assertEqual(source, "global_importance")
+            self.assertEqual(reasons, explainer.global_reasons)
+            self.assertIn("importance", reasons[0])
+            self.assertEqual(explainer.stats()["fallbacks"], 1)
+        finally:
+            explainer.close()
+
+    def test_reload_explains_the_new_model(self):
+        model_path = os.path.join(self.tmp.name, "model.joblib")
+        reversed_path = os.path.join(self.tmp.name, "reversed.joblib")
+        _train_reversed_model(reversed_path)
+        service = MLService(model_path)
+        explainer = ReasonCodeExplainer(service, top_k=1, budget_ms=1000)
+        try:
+            transaction = {"txn_density": 2.5, "amount_spike_ratio": 1.0, "card_age_days": 4000}
+            self.assertEqual(explainer.explain(transaction)[0][0]["feature"], "txn_density")
+            before = explainer.global_reasons
+
+            service.reload(reversed_path)
+            self.assertEqual(explainer.stats()["cached"], 0)
+            reasons, source = explainer.explain(transaction)
+            self.assertEqual(source, "pred_contribs")
+            self.assertEqual(reasons[0]["feature"], "card_age_days")
+            self.assertEqual(explainer.global_reasons[0]["feature"], "card_age_days")
+            self.assertNotEqual(explainer.global_reasons, before)
+        finally:
+            explainer.close()
+
+    def test_explain_batch_matches_single(self):
+        transactions = [{"txn_density": 2.5}, {"amount_spike_ratio": 5.0}, {"card_age_days": 3}]
+        batch = self.explainer.explain_batch(transactions)
+        for transaction, reasons in zip(transactions, batch):
+            self.assertEqual(self.explainer.explain(transaction), (reasons, "cache"))
+
+    def test_early_stopped_model_contributions_match_its_score(self):
+        model_path = os.path.join(self.tmp.name, "early_stopped.joblib")
+        X = _train_early_stopped_model(model_path)
+        service = MLService(model_path)
+        explainer = ReasonCodeExplainer(service, budget_ms=1000)
+        try:
+            X = service.to_matrix(X.head(200))
+            p = service.model.predict_proba(X)[:, 1].astype(np.float64)
+            margin = np.log(p / (1 - p))
+            # Contributions + the (constant) bias add up to predict_proba's margin
+            offset = explainer._contributions(service.loaded, X).sum(axis=1) - margin
+            self.assertLess(np.ptp(offset), 1e-3)
+        finally:
+            explainer.close()
+
+class TestEngineReasonCodes(unittest.TestCase):
+    def test_ml_reasons_only_on_step_up_and_decline(self):
+        rules = [
+            {'rule_id': '5', 'use_case': 'High-value purchase after theft', 'primary_feature': 'amount_spike_ratio', 'condition': 'amount_spike_ratio > 2', 'action': 'DECLINE'},
+        ]
+        explainer = StubExplainer()
+        engine = FraudDecisionEngine(RuleService(rules), StubMLService(), explainer=explainer)
+
+        approved = engine.evaluate({"stub_score": 0.1})
+        self.assertNotIn("ml_reasons", approved)
+
+        rule_declined = engine.evaluate({"amount_spike_ratio": 3})
+        self.assertNotIn("ml_reasons", rule_declined)
+
+        stepped_up = engine.evaluate({"stub_score": 0.7})
+        self.assertEqual(stepped_up["decision"], "STEP_UP")
+        self.assertEqual(stepped_up["ml_reasons"][0]["feature"], "txn_density")
+        self.assertEqual(stepped_up["ml_reasons_source"], "pred_contribs")
+
+        declined = engine.evaluate({"stub_score": 0.9})
+        self.assertIn("ml_reasons", declined)
+        self.assertEqual(explainer.calls, 2)
@@ -0,0 +1,90 @@
+import unittest
+
+import pandas as pd
+
+from run_time.feature_engine.transaction_schema import TransactionSchema
+from run_time.rule_engine.rule_compiler import CONDITION_CACHE_SIZE, RuleCompiler, compile_condition
+from run_time.rule_engine.rule_service import RuleService
+
+class TestRuleCompiler(unittest.TestCase):
+    def setUp(self):
+        self.rules = [
+            {'rule_id': '1', 'use_case': 'Card used immediately after reported stolen', 'primary_feature': 'time_since_block', 'secondary_feature': 'txn_velocity_5m', 'condition': 'time_since_block < 5', 'action': 'DECLINE'},
+            {'rule_id': '3', 'use_case': 'First transaction after long inactivity', 'primary_feature': 'new_merchant_flag', 'secondary_feature': 'merchant_risk_score', 'condition': 'new_merchant_flag == true', 'action': 'STEP_UP'},
+            {'rule_id': '24', 'use_case': 'Card used at odd hours', 'primary_feature': 'hour_of_day', 'secondary_feature': 'txn_density', 'condition': 'hour_of_day > 20', 'action': 'STEP_UP'},
+            {'rule_id': '27', 'use_case': 'Card used in different city within minutes', 'primary_feature': 'geo_distance / time_gap', 'secondary_feature': 'last_txn_country', 'condition': 'geo_distance / time_gap > 100', 'action': 'DECLINE'},
+        ]
+        self.service = RuleService(self.rules)
+
+    def test_json_literals_are_supported(self):
+        condition = compile_condition('new_merchant_flag == true')
+        self.assertTrue(condition({'new_merchant_flag': True}))
+        self.assertFalse(condition({'new_merchant_flag': False}))
+        self.assertEqual(condition.features, {'new_merchant_flag'})
+
+    def test_missing_feature_and_runtime_errors_do_not_match(self):
+        condition = compile_condition('geo_distance / time_gap > 100')
+        self.assertFalse(condition({'geo_distance': 500}))
+        self.assertFalse(condition({'geo_distance': 500, 'time_gap': 0}))
+        self.assertFalse(condition({'geo_distance': 'far', 'time_gap': 1}))
+        self.assertTrue(condition({'geo_distance': 500, 'time_gap': 1}))
+
+    def test_condition_cache_is_bounded(self):
+        self.assertEqual(compile_condition.cache_info().maxsize, CONDITION_CACHE_SIZE)
+        for i in range(CONDITION_CACHE_SIZE + 10):
+            compile_condition(f'amount > {i}')
+        self.assertEqual(compile_condition.cache_info().currsize, CONDITION_CACHE_SIZE)
+
+    def test_invalid_condition_rejected_at_load(self):
+        for bad in ['__import__("os").system("ls")', 'txn_count_5m >', 'x.attr > 1', '']:
+            with self.assertRaises(ValueError):
+                RuleCompiler.compile_rule({'rule_id': 'X', 'condition': bad})
+
+    def test_evaluate_batch_matches_row_by_row(self):
+        transactions = [
+            {'time_since_block': 3, 'new_merchant_flag': False, 'hour_of_day': 10, 'geo_distance': 5, 'time_gap': 60},
+            {'time_since_block': 900, 'new_merchant_flag': True, 'hour_of_day': 10, 'geo_distance': 5, 'time_gap': 60},
+            {'time_since_block': 900, 'new_merchant_flag': False, 'hour_of_day': 23, 'geo_distance': 5, 'time_gap': 60},
+            {'time_since_block': 900, 'new_merchant_flag': False, 'hour_of_day': 10, 'geo_distance': 5000, 'time_gap': 0},
+            {'time_since_block': 900, 'new_merchant_flag': False, 'hour_of_day': 10, 'geo_distance': 5000, 'time_gap': 2},
+            {'time_since_block': 900, 'new_merchant_flag': False, 'hour_of_day': 10, 'geo_distance': 5, 'time_gap': 60},
+        ]
+        result = self.service.evaluate_batch(pd.DataFrame(transactions))
+
+        expected = [self.service.evaluate(t)['decision'] for t in transactions]
+        self.assertEqual(list(result['decision']), expected)
+        self.assertEqual(expected, ['DECLINE', 'STEP_UP', 'STEP_UP', 'APPROVE', 'DECLINE', 'APPROVE'])
+        self.assertEqual(int(result['hits']['27'].sum()), 1)
+
+    def test_evaluate_batch_missing_column(self):
+        result = self.service.evaluate_batch(pd.DataFrame([{'hour_of_day': 23}, {'hour_of_day': 1}]))
+        self.assertEqual(list(result['decision']), ['STEP_UP', 'APPROVE'])
+
+    def test_evaluate_batch_or_rule_with_absent_feature(self):
+        service = RuleService([
+            {'rule_id': 'A', 'condition': 'a > 1 or b > 1', 'action': 'DECLINE'},
+            {'rule_id': 'B', 'condition': 'a > 1 and b > 1', 'action': 'STEP_UP'},
+        ])
+        transactions = [{'a': 5}, {'a': 0}, {'b': 5}, {'a': 0, 'b': 5}]
+        expected = [service.evaluate(t)['decision'] for t in transactions]
+        self.assertEqual(expected, ['DECLINE', 'APPROVE', 'APPROVE', 'DECLINE'])
+
+        # Column absent from the whole frame
+        self.assertEqual(list(service.evaluate_batch(pd.DataFrame([{'a': 5}]))['decision']), ['DECLINE'])
+        # Feature absent from some rows only
+        self.assertEqual(list(service.evaluate_batch(TransactionSchema(['a', 'b']).batch(transactions))['decision']), expected)
+        for t, decision in zip(transactions, expected):
+            self.assertEqual(service.evaluate_batch(pd.DataFrame([t]))['decision'][0], decision)
+
+    def test_evaluate_batch_object_column_division_by_zero(self):
+        service = RuleService([{'rule_id': 'A', 'condition': 'amount / time_gap > 2', 'action': 'DECLINE'}])
+        transactions = [{'amount': 10, 'time_gap': 0}, {'amount': 10, 'time_gap': 2}, {'amount': 10, 'time_gap': 'n/a'}]
+        expected = [service.evaluate(t)['decision'] for t in transactions]
+        self.assertEqual(expected, ['APPROVE', 'DECLINE', 'APPROVE'])
+
+        df = pd.DataFrame(transactions[:2], dtype=object)
+        self.assertEqual(list(service.evaluate_batch(df)['decision']), expected[:2])
+        self.assertEqual(list(service.evaluate_batch(pd.DataFrame(transactions))['decision']), expected)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import os
+import random
+import unittest
+
+from run_time.rule_engine.rule_loader import RuleLoader
+from run_time.rule_engine.rule_network import RuleNetwork, analyze
+from run_time.rule_engine.rule_service import RuleService
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+RULE_BOOK_PATH = os.path.join(BASE_DIR, "artifacts", "rule_book.json")
+
+def _ids(result):
+    return result["decision"], [r["rule_id"] for r in result["matched_rules"]]
+
+class TestRuleNetwork(unittest.TestCase):
+    def setUp(self):
+        self.rules = [
+            {'rule_id': '37', 'use_case': 'BIN attack CVV failures', 'primary_feature': 'cvv_fail_rate', 'condition': 'cvv_fail_rate > 3', 'action': 'DECLINE'},
+            {'rule_id': '39', 'use_case': 'Repeated CVV failures', 'primary_feature': 'cvv_fail_rate', 'condition': 'cvv_fail_rate > 5', 'action': 'DECLINE'},
+            {'rule_id': '24', 'use_case': 'Card used at odd hours', 'primary_feature': 'hour_of_day', 'condition': 'hour_of_day > 20', 'action': 'STEP_UP'},
+            {'rule_id': '9', 'use_case': 'Usage outside customer home location', 'primary_feature': 'hour_of_day', 'condition': 'hour_of_day > 22', 'action': 'STEP_UP'},
+            {'rule_id': '30', 'use_case': 'Compromised device', 'primary_feature': 'device_compromised_flag', 'condition': 'device_compromised_flag == true', 'action': 'STEP_UP'},
+            {'rule_id': '41', 'use_case': 'Compromised device decline', 'primary_feature': 'device_compromised_flag', 'condition': 'device_compromised_flag == true', 'action': 'DECLINE'},
+            {'rule_id': '61', 'use_case': 'Night spike', 'primary_feature': 'amount_spike_ratio', 'condition': 'amount_spike_ratio > 2 and not hour_of_day < 6', 'action': 'STEP_UP'},
+            {'rule_id': '62', 'use_case': 'Impossible hour', 'primary_feature': 'hour_of_day', 'condition': 'hour_of_day > 30 and hour_of_day < 10', 'action': 'DECLINE'},
+            {'rule_id': '27', 'use_case': 'Impossible travel', 'primary_feature': 'geo_distance', 'condition': 'geo_distance / time_gap > 100', 'action': 'DECLINE'},
+            {'rule_id': '63', 'use_case': 'Spike or velocity', 'primary_feature': 'amount_spike_ratio', 'condition': 'amount_spike_ratio > 3 or txn_velocity_5m >= 5', 'action': 'MONITOR'},
+        ]
+
+    def _random_transactions(self, features, n, seed=7):
+        rng = random.Random(seed)
+        values = [None, "high", True, False, float("nan"), 0, -1, 0.5]
+        transactions = []
+        for _ in range(n):
+            t = {}
+            for feature in features:
+                if rng.random() < 0.6:
+                    t[feature] = rng.choice(values) if rng.random() < 0.15 else rng.uniform(-2, 40)
+            transactions.append(t)
+        return transactions
+
+    def test_matches_rule_service(self):
+        for rules in (self.rules, RuleLoader.load_rules(RULE_BOOK_PATH)):
+            service, network = RuleService(rules), RuleNetwork(rules)
+            features = sorted({f for c in service.conditions for f in c.features})
+
+            for t in self._random_transactions(features, 3000):
+                self.assertEqual(_ids(network.evaluate(t)), _ids(service.evaluate(t)), t)
+
+    def test_shared_and_implied_atoms_evaluated_once(self):
+        network = RuleNetwork(self.rules)
+        network.evaluate({"cvv_fail_rate": 1, "hour_of_day": 23, "device_compromised_flag": False})
+        stats = network.stats()
+        # cvv > 5 inferred from cvv > 3, hour > 20 from hour > 22, the flag atom shared
+        self.assertLess(stats["atom_evaluations"], stats["atom_requests"])
+        self.assertGreater(stats["saved"], 0)
+
+    def test_analysis_report(self):
+        report = analyze(self.rules, known_features=[
+            "cvv_fail_rate", "hour_of_day", "device_compromised_flag",
+            "amount_spike_ratio", "txn_velocity_5m", "time_gap",
+        ])
+        self.assertEqual(report["rules"], 10)
+        self.assertIn(["30", "41"], report["duplicates"])
+
+        subsumed = {s["rule_id"]: s["by"] for s in report["subsumed"]}
+        self.assertEqual(subsumed, {"39": "37", "9": "24", "30": "41"})
+
+        dead = {d["rule_id"]: d["reason"] for d in report["dead"]}
+        self.assertEqual(set(dead), {"62", "27"})
+        self.assertIn("geo_distance", dead["27"])
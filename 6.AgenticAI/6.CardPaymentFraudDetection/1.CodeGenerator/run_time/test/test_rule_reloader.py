@@ -0,0 +1,94 @@
+import json
+import os
+import tempfile
+import threading
+import time
+import unittest
+
+from run_time.decision_engine.fraud_decision_engine import FraudDecisionEngine
+from run_time.rule_engine.rule_reloader import RuleBookWatcher, RuleSetCache
+from run_time.rule_engine.rule_service import RuleService
+from run_time.test.test_decision_cascade import StubMLService
+
+RULES_V1 = [
+    {'rule_id': '5', 'use_case': 'High-value purchase after theft', 'primary_feature': 'amount_spike_ratio', 'condition': 'amount_spike_ratio > 2', 'action': 'DECLINE'},
+]
+RULES_V2 = RULES_V1 + [
+    {'rule_id': '24', 'use_case': 'Card used at odd hours', 'primary_feature': 'hour_of_day', 'condition': 'hour_of_day > 20', 'action': 'STEP_UP'},
+]
+
+class TestRuleBookHotReload(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'rule_book.json')
+        self._write(RULES_V1)
+
+        self.cache = RuleSetCache()
+        self.service = RuleService(self.cache.load(self.path))
+        self.watcher = RuleBookWatcher(self.path, self.service, interval_s=0.01, cache=self.cache)
+
+    def tearDown(self):
+        self.watcher.stop()
+        self.tmp.cleanup()
+
+    def _write(self, rules, mtime_offset=0):
+        with open(self.path, 'w') as f:
+            f.write(rules if isinstance(rules, str) else json.dumps(rules))
+        # Make every write visible to the mtime check
+        stat = os.stat(self.path)
+        os.utime(self.path, ns=(stat.st_atime_ns, stat.st_mtime_ns + mtime_offset))
+
+    def test_same_content_is_not_swapped(self):
+        self.assertFalse(self.watcher.check())
+        self.assertEqual(self.watcher.reloads, 0)
+
+    def test_change_is_swapped_and_redeploy_hits_cache(self):
+        self._write(RULES_V2, mtime_offset=10**9)
+        with self.assertLogs('run_time.rule_engine.rule_reloader', 'INFO') as logs:
+            self.assertTrue(self.watcher.check())
+        self.assertIn('Rule book reloaded', logs.output[0])
+        self.assertEqual(self.service.evaluate({'hour_of_day': 23})['decision'], 'STEP_UP')
+
+        self._write(RULES_V1, mtime_offset=2 * 10**9)
+        self.assertTrue(self.watcher.check())
+        self.assertEqual(self.service.evaluate({'hour_of_day': 23})['decision'], 'APPROVE')
+        self.assertEqual((self.cache.misses, self.cache.hits), (2, 1))
+
+    def test_invalid_rule_book_keeps_previous_rules(self):
+        previous = self.service.ruleset
+        self._write('[{"rule_id": "9", "condition": "x >", "action": "DECLINE", "use_case": "u"}]', mtime_offset=10**9)
+        with self.assertLogs('run_time.rule_engine.rule_reloader', 'WARNING'):
+            self.assertFalse(self.watcher.check())
+        self.assertIsInstance(self.watcher.last_error, ValueError)
+        self.assertIs(self.service.ruleset, previous)
+
+    def test_background_swap_under_load(self):
+        engine = FraudDecisionEngine(self.service, StubMLService(), hot_rule_ids=['5'])
+        errors = []
+        stop = threading.Event()
+
+        def evaluate_forever():
+            while not stop.is_set():
+                try:
+                    decision = engine.evaluate({'amount_spike_ratio': 3, 'hour_of_day': 23})['decision']
+                    self.assertEqual(decision, 'DECLINE')
+                except Exception as e:
+                    errors.append(e)
+
+        worker = threading.Thread(target=evaluate_forever)
+        worker.start()
+        self.watcher.start()
+        self._write(RULES_V2, mtime_offset=10**9)
+
+        deadline = time.time() + 5
+        while self.watcher.reloads == 0 and time.time() < deadline:
+            time.sleep(0.01)
+        stop.set()
+        worker.join()
+
+        self.assertEqual(self.watcher.reloads, 1)
+        self.assertEqual(errors, [])
+        self.assertEqual(len(engine.cascade.rest_service.rules), 1)
+
+if __name__ == '__main__':
+    unittest.main()
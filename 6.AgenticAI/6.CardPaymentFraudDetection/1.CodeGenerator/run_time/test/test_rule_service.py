@@ -41,6 +41,21 @@ class TestRuleService(unittest.TestCase):
         self.assertEqual(len(result['matched_rules']), 1)
         self.assertEqual(result['matched_rules'][0]['rule_id'], '5')
 
+    def test_decline_scheduled_before_earlier_step_up(self):
+        transaction = {'new_merchant_flag': True, 'amount_spike_ratio': 3}
+        result = self.service.evaluate(transaction)
+        self.assertEqual(result['decision'], 'DECLINE')
+        self.assertEqual([r['rule_id'] for r in result['matched_rules']], ['5'])
+
+    def test_only_rules_for_present_features_are_dispatched(self):
+        rules = self.rules + [
+            {'rule_id': '6', 'use_case': 'Odd hours or VPN', 'primary_feature': 'hour_of_day', 'condition': 'hour_of_day > 22 or vpn_detected == True', 'action': 'STEP_UP'},
+        ]
+        service = RuleService(rules)
+        self.assertEqual(service.evaluate({'vpn_detected': True})['decision'], 'APPROVE')
+        self.assertEqual(service.evaluate({'hour_of_day': 1, 'vpn_detected': True})['decision'], 'STEP_UP')
+        self.assertEqual(service.evaluate({'unrelated_feature': 1})['matched_rules'], [])
+
     # Add more tests to cover all FEATURE_MAP combinations
 
 if __name__ == '__main__':
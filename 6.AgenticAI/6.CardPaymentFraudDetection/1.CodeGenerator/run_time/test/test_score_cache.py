@@ -0,0 +1,148 @@
+import os
+import tempfile
+import threading
+import unittest
+
+import numpy as np
+import pandas as pd
+import xgboost as xgb
+from joblib import dump, load
+
+from run_time.ml_engine.fraud_detection_service_using_ml import MLService
+from run_time.ml_engine.score_cache import ENTRY_OVERHEAD_BYTES, ScoreCache
+from run_time.ml_engine.training_pipeline import to_classifier
+from run_time.test.test_ml_service import _train_model
+
+def _train_reversed_model(path):
+    """Same features as _train_model in reverse booster order, scoring old cards as fraud."""
+    rng = np.random.default_rng(7)
+    X = pd.DataFrame({
+        "card_age_days": rng.integers(1, 5000, 500),
+        "vpn_detected": rng.integers(0, 2, 500),
+        "amount_spike_ratio": rng.uniform(0.8, 6, 500),
+        "txn_density": rng.uniform(0, 3, 500),
+    })
+    model = xgb.XGBClassifier(n_estimators=20, max_depth=3, tree_method="hist")
+    model.fit(X, (X["card_age_days"] > 2500).astype(int))
+    dump(model, path)
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+class TestScoreCache(unittest.TestCase):
+    def test_lru_ttl_and_version(self):
+        clock = FakeClock()
+        cache = ScoreCache(max_entries=2, ttl_s=10, clock=clock)
+
+        cache.put("v1", b"a", {"score": 0.1})
+        cache.put("v1", b"b", {"score": 0.2})
+        self.assertEqual(cache.get("v1", b"a"), {"score": 0.1})
+        cache.put("v1", b"c", {"score": 0.3})           # evicts b, the least recently used
+        self.assertIsNone(cache.get("v1", b"b"))
+        self.assertEqual(cache.evictions, 1)
+
+        self.assertIsNone(cache.get("v2", b"a"))         # never served to another model version
+        self.assertIsNone(cache.get("v1", b"a"))         # and dropped
+
+        clock.now = 11
+        self.assertIsNone(cache.get("v1", b"c"))
+        self.assertEqual(cache.expired, 1)
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(cache.bytes, 0)
+        self.assertEqual(cache.stats()["hits"], 1)
+
+    def test_memory_cap(self):
+        key_bytes = 16
+        cache = ScoreCache(max_bytes=3 * (key_bytes + ENTRY_OVERHEAD_BYTES))
+        for i in range(10):
+            cache.put("v1", bytes([i]) * key_bytes, {"score": i})
+        self.assertEqual(len(cache), 3)
+        self.assertLessEqual(cache.bytes, cache.max_bytes)
+
+        cache.invalidate()
+        self.assertEqual((len(cache), cache.bytes, cache.invalidations), (0, 0, 1))
+
+class TestMLServiceScoreCache(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.TemporaryDirectory()
+        cls.model_path = os.path.join(cls.tmp.name, "model.joblib")
+        _train_model(cls.model_path)
+        # Same features, different scores
+        cls.other_path = os.path.join(cls.tmp.name, "other.joblib")
+        dump(to_classifier(load(cls.model_path).get_booster()[:3]), cls.other_path)
+
+        cls.transactions = [
+            {"txn_density": 2.1, "amount_spike_ratio": 1.7},
+            {"vpn_detected": True, "card_age_days": 5},
+            {"txn_density": 0.2, "amount_spike_ratio": 1.0, "vpn_detected": False, "card_age_days": 1200},
+        ]
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp.cleanup()
+
+    def test_cached_scores_match_and_hit(self):
+        plain = MLService(self.model_path)
+        cache = ScoreCache()
+        cached = MLService(self.model_path, score_cache=cache)
+
+        for _ in range(3):
+            for t in self.transactions:
+                self.assertEqual(cached.score(t), plain.score(t))
+        self.assertEqual((cache.misses, cache.hits), (3, 6))
+
+        # Callers get their own dict
+        cached.score(self.transactions[0])["score"] = -1
+        self.assertEqual(cached.score(self.transactions[0]), plain.score(self.transactions[0]))
+
+    def test_reload_never_serves_previous_model(self):
+        cache = ScoreCache()
+        service = MLService(self.model_path, score_cache=cache)
+        other = MLService(self.other_path)
+        before = [service.score(t) for t in self.transactions]
+
+        service.reload(self.other_path)
+        self.assertEqual(service.model_version, other.model_version)
+        self.assertEqual(cache.invalidations, 1)
+        after = [service.score(t) for t in self.transactions]
+
+        self.assertEqual(after, [other.score(t) for t in self.transactions])
+        self.assertNotEqual(after, before)
+        self.assertEqual(cache.hits, 0)
+
+    def test_concurrent_reload_scores_with_one_model(self):
+        reversed_path = os.path.join(self.tmp.name, "reversed.joblib")
+        _train_reversed_model(reversed_path)
+        expected = {
+            tuple(r["score"] for r in MLService(path).score_batch(self.transactions))
+            for path in (self.model_path, reversed_path)
+        }
+        self.assertEqual(len(expected), 2)
+
+        service = MLService(self.model_path, score_cache=ScoreCache())
+        seen, stop = set(), threading.Event()
+
+        def score():
+            while not stop.is_set():
+                seen.add(tuple(r["score"] for r in service.score_batch(self.transactions)))
+
+        thread = threading.Thread(target=score)
+        thread.start()
+        try:
+            for i in range(200):
+                previous = service.reload(reversed_path if i % 2 == 0 else self.model_path)
+                self.assertIsNot(previous, service.loaded)
+        finally:
+            stop.set()
+            thread.join()
+
+        # Never old feature order with the new backend (or the reverse)
+        self.assertLessEqual(seen, expected)
+
+if __name__ == '__main__':
+    unittest.main()
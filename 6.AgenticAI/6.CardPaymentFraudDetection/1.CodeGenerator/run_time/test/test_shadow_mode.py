@@ -0,0 +1,116 @@
+import json
+import os
+import tempfile
+import threading
+import unittest
+
+from run_time.decision_engine.fraud_decision_engine import FraudDecisionEngine
+from run_time.decision_engine.shadow_mode import ShadowEvaluator
+from run_time.rule_engine.rule_service import RuleService
+from run_time.test.test_decision_cascade import StubMLService
+from run_time.test.test_ml_service import _train_model
+
+class BlockingEngine:
+    def __init__(self):
+        self.release = threading.Event()
+
+    def evaluate(self, transaction):
+        self.release.wait()
+        return {"decision": "APPROVE", "reasons": [], "source": "RULE_ENGINE"}
+
+class FailingEngine:
+    def evaluate(self, transaction):
+        raise ValueError("boom")
+
+class TestShadowMode(unittest.TestCase):
+    def setUp(self):
+        self.production_rules = [
+            {'rule_id': '5', 'use_case': 'High-value purchase after theft', 'primary_feature': 'amount_spike_ratio', 'condition': 'amount_spike_ratio > 2', 'action': 'DECLINE'},
+        ]
+        self.candidate_rules = [
+            {'rule_id': '5', 'use_case': 'High-value purchase after theft', 'primary_feature': 'amount_spike_ratio', 'condition': 'amount_spike_ratio > 4', 'action': 'DECLINE'},
+            {'rule_id': '24', 'use_case': 'Card used at odd hours', 'primary_feature': 'hour_of_day', 'condition': 'hour_of_day > 20', 'action': 'STEP_UP'},
+        ]
+        self.transactions = [
+            {'amount_spike_ratio': 3},                    # DECLINE → APPROVE
+            {'amount_spike_ratio': 5},                    # DECLINE in both
+            {'hour_of_day': 23},                          # APPROVE → STEP_UP
+            {'hour_of_day': 10, 'stub_score': 0.9},       # DECLINE in both (ML)
+        ]
+
+    def _candidate(self):
+        return FraudDecisionEngine(RuleService(self.candidate_rules), StubMLService())
+
+    def test_production_results_unchanged_and_disagreements_counted(self):
+        shadow = ShadowEvaluator(self._candidate(), sample_rate=1.0)
+        engine = FraudDecisionEngine(RuleService(self.production_rules), StubMLService(), shadow=shadow)
+        plain = FraudDecisionEngine(RuleService(self.production_rules), StubMLService())
+
+        for t in self.transactions:
+            self.assertEqual(engine.evaluate(t), plain.evaluate(t))
+        shadow.close()
+
+        report = shadow.report()
+        self.assertEqual(report["evaluated"], 4)
+        self.assertEqual(report["agreement_rate"], 0.5)
+        self.assertEqual(
+            sorted((d["production"], d["candidate"], d["count"]) for d in report["disagreements"]),
+            [("APPROVE", "STEP_UP", 1), ("DECLINE", "APPROVE", 1)],
+        )
+        self.assertIsNotNone(report["latency_delta_us"]["p99"])
+        self.assertEqual(report["score_delta"]["mean"], 0.0)
+
+    def test_sample_rate(self):
+        shadow = ShadowEvaluator(self._candidate(), sample_rate=0.25, seed=7)
+        for _ in range(2000):
+            shadow.offer({'hour_of_day': 1}, {"decision": "APPROVE"}, 10.0)
+        shadow.close()
+
+        report = shadow.report()
+        self.assertEqual(report["offered"], 2000)
+        self.assertGreater(report["sampled"], 400)
+        self.assertLess(report["sampled"], 600)
+        self.assertEqual(report["evaluated"] + report["dropped"], report["sampled"])
+
+        with self.assertRaises(ValueError):
+            ShadowEvaluator(self._candidate(), sample_rate=1.5)
+
+    def test_full_queue_drops_instead_of_blocking(self):
+        candidate = BlockingEngine()
+        shadow = ShadowEvaluator(candidate, sample_rate=1.0, workers=1, queue_size=2)
+
+        results = [shadow.offer({'amount': i}, {"decision": "APPROVE"}, 10.0) for i in range(10)]
+        candidate.release.set()
+        shadow.close()
+
+        report = shadow.report()
+        self.assertFalse(all(results))
+        self.assertGreaterEqual(report["dropped"], 7)
+        self.assertEqual(report["evaluated"] + report["dropped"], 10)
+        self.assertEqual(report["agreement_rate"], 1.0)
+
+    def test_candidate_errors_are_counted(self):
+        shadow = ShadowEvaluator(FailingEngine(), sample_rate=1.0)
+        shadow.offer({'amount': 1}, {"decision": "APPROVE"}, 10.0)
+        shadow.close()
+
+        report = shadow.report()
+        self.assertEqual(report["errors"], 1)
+        self.assertIsNone(report["agreement_rate"])
+        self.assertIsInstance(shadow.last_error, ValueError)
+
+    def test_from_files(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            rule_book = os.path.join(tmp, "rule_book.json")
+            with open(rule_book, "w") as f:
+                json.dump(self.candidate_rules, f)
+            model_path = os.path.join(tmp, "model.joblib")
+            _train_model(model_path)
+
+            shadow = ShadowEvaluator.from_files(rule_book, model_path, sample_rate=1.0)
+            shadow.offer({'hour_of_day': 23}, {"decision": "STEP_UP", "fraud_score": 0.5}, 10.0)
+            shadow.close()
+
+        report = shadow.report()
+        self.assertEqual(report["evaluated"], 1)
+        self.assertEqual(report["agreement_rate"], 1.0)
@@ -0,0 +1,45 @@
+import os
+import unittest
+
+from design_time.agents.table_parser import parse_table
+
+USE_CASES = os.path.join(
+    os.path.dirname(__file__), "..", "..", "design_time", "docs", "UseCases.md"
+)
+
+class TestTableParser(unittest.TestCase):
+    def test_use_cases_markdown(self):
+        with open(USE_CASES) as f:
+            rows = parse_table(f.read())
+
+        self.assertEqual(len(rows), 100)
+        self.assertTrue(all(list(row) == ["Category", "Use Case", "Risk"] for row in rows))
+        self.assertEqual(rows[0], {
+            "Category": "Stolen Card",
+            "Use Case": "Card used immediately after reported stolen",
+            "Risk": "High",
+        })
+
+    def test_escaped_pipes_and_alignment_row(self):
+        rows = parse_table("| Sr. | Rule | Note |\n|:--|:-:|--:|\n| 1 | a \\| b | x |")
+        self.assertEqual(rows, [{"Rule": "a | b", "Note": "x"}])
+
+    def test_csv(self):
+        rows = parse_table('Sr., Category ,Use Case,Risk\n1, Lost Card ,"Declined, then success",Medium\n')
+        self.assertEqual(rows, [{"Category": "Lost Card", "Use Case": "Declined, then success", "Risk": "Medium"}])
+
+    def test_malformed_tables_raise(self):
+        # ValueError sends tabular_to_json_agent to the LLM fallback
+        malformed = {
+            "ragged row": "| a | b |\n| --- | --- |\n| 1 |",
+            "duplicate header": "| a | a |\n| 1 | 2 |",
+            "blank header": "| a |  |\n| 1 | 2 |",
+            "no rows": "| a | b |\n| --- | --- |",
+            "empty": "",
+        }
+        for name, table in malformed.items():
+            with self.subTest(name), self.assertRaises(ValueError):
+                parse_table(table)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+from joblib import dump
+
+from run_time.ml_engine import training_pipeline as pipeline
+from run_time.ml_engine.fraud_detection_service_using_ml import MLService
+from taining_data import vectorized_data_generator as generator
+
+class TestTrainingPipeline(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.TemporaryDirectory()
+        cls.data_path = os.path.join(cls.tmp.name, "data.csv")
+        generator.generate_dataset(total_rows=4_000, output=cls.data_path, fraud_rate=0.1, workers=1)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp.cleanup()
+
+    def test_chunks_use_compact_schema(self):
+        chunks = list(pipeline.read_chunks(self.data_path, chunk_rows=1_500))
+        self.assertEqual([len(c) for c in chunks], [1_500, 1_500, 1_000])
+
+        df = chunks[0]
+        self.assertNotIn("transaction_id", df.columns)
+        self.assertEqual(df["otp_result"].dtype, np.int8)
+        self.assertEqual(df["card_age_days"].dtype, np.int16)
+        self.assertEqual(df["txn_density"].dtype, np.float32)
+        self.assertEqual(df["label"].dtype, np.int8)
+
+    def test_out_of_range_and_missing_values_are_not_corrupted(self):
+        path = os.path.join(self.tmp.name, "edge.csv")
+        with open(path, "w") as f:
+            f.write("geo_distance_km,txn_velocity_5m,card_age_days,vpn_detected,label\n")
+            f.write("40000,300,12,True,0\n")
+            f.write("5,1,,,1\n")
+
+        df = next(pipeline.read_chunks(path))
+        self.assertEqual(df["geo_distance_km"].dtype, np.int32)
+        self.assertEqual(df["geo_distance_km"].tolist(), [40000, 5])
+        self.assertEqual(df["txn_velocity_5m"].dtype, np.int16)
+        self.assertEqual(df["txn_velocity_5m"].tolist(), [300, 1])
+        # Missing values in int / bool columns: float32, filled with 0
+        self.assertEqual(df["card_age_days"].dtype, np.float32)
+        self.assertEqual(df["card_age_days"].tolist(), [12.0, 0.0])
+        self.assertEqual(df["vpn_detected"].tolist(), [1.0, 0.0])
+        self.assertEqual(df["label"].dtype, np.int8)
+
+    def test_trains_model_loadable_by_ml_service(self):
+        for external_memory in (False, True):
+            model, report = pipeline.train(
+                self.data_path, num_boost_round=10, chunk_rows=1_000,
+                external_memory=external_memory, verbose=False
+            )
+            self.assertEqual(report["rows"], 4_000)
+            self.assertEqual(report["fraud_rows"], 400)
+            self.assertEqual(report["train_rows"] + report["validation_rows"], 4_000)
+            self.assertGreater(report["auc"], 0.9)
+
+            model_path = os.path.join(self.tmp.name, "model.joblib")
+            dump(model, model_path)
+            service = MLService(model_path)
+            self.assertIn("amount_spike_ratio", service.features)
+            self.assertNotIn("label", service.features)
+
+            rows = generator.generate_chunk(0, 200, seed=7, shard=0, chunk=0, fraud_rate=0.5)
+            scores = service.predict(service.to_matrix(rows))
+            labels = rows["label"].to_numpy() == 1
+            self.assertGreater(scores[labels].mean(), scores[~labels].mean())
@@ -0,0 +1,109 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from run_time.decision_engine.fraud_decision_engine import FraudDecisionEngine
+from run_time.feature_engine.transaction_schema import TransactionSchema
+from run_time.ml_engine.fraud_detection_service_using_ml import MLService
+from run_time.rule_engine.rule_service import RuleService
+from run_time.test.test_ml_service import _train_model
+
+class TestTransactionSchema(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.TemporaryDirectory()
+        model_path = os.path.join(cls.tmp.name, "model.joblib")
+        _train_model(model_path)
+        cls.ml_service = MLService(model_path)
+
+        cls.rules = [
+            {'rule_id': '3', 'use_case': 'First transaction after long inactivity', 'primary_feature': 'new_merchant_flag', 'condition': 'new_merchant_flag == true', 'action': 'STEP_UP'},
+            {'rule_id': '5', 'use_case': 'High-value purchase after theft', 'primary_feature': 'amount_spike_ratio', 'condition': 'amount_spike_ratio > 2', 'action': 'DECLINE'},
+            {'rule_id': '24', 'use_case': 'Card used at odd hours', 'primary_feature': 'hour_of_day', 'condition': 'hour_of_day > 20 or vpn_detected == true', 'action': 'STEP_UP'},
+            {'rule_id': '59', 'use_case': 'New card + high spend immediately', 'primary_feature': 'card_age_days', 'condition': 'card_age_days < 30', 'action': 'DECLINE'},
+        ]
+        cls.rule_service = RuleService(cls.rules)
+        cls.schema = TransactionSchema.from_services(cls.ml_service, cls.rule_service)
+
+        cls.transactions = [
+            {'amount_spike_ratio': 3, 'new_merchant_flag': True},
+            {'card_age_days': 5, 'transaction_id': 'txn_1'},
+            {'new_merchant_flag': 1, 'hour_of_day': 23, 'card_age_days': 400},
+            {'card_age_days': 4000, 'amount_spike_ratio': 1.0, 'txn_density': 2.5},
+            {'hour_of_day': None, 'txn_density': 0.2},
+            {'vpn_detected': True, 'amount_spike_ratio': 1.5},
+            {'card_age_days': None, 'amount_spike_ratio': 1.1},
+            {},
+        ]
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp.cleanup()
+
+    def test_schema_features_and_bools(self):
+        self.assertEqual(self.schema.features[:4], self.ml_service.features)
+        self.assertIn("hour_of_day", self.schema.features)
+        self.assertEqual(self.schema.bool_features, {"new_merchant_flag", "vpn_detected"})
+
+        with self.assertRaises(ValueError):
+            TransactionSchema(["items"])
+        with self.assertRaises(ValueError):
+            TransactionSchema(["not an identifier"])
+
+    def test_record_is_a_coerced_mapping(self):
+        record = self.schema.record({'new_merchant_flag': "true", 'vpn_detected': 0,
+                                     'card_age_days': 12, 'transaction_id': 'txn_9'})
+
+        self.assertIs(record["new_merchant_flag"], True)
+        self.assertIs(record["vpn_detected"], False)
+        self.assertEqual(record["transaction_id"], 'txn_9')
+        self.assertNotIn("hour_of_day", record)
+        self.assertIsNone(record.get("hour_of_day"))
+        with self.assertRaises(KeyError):
+            record["hour_of_day"]
+        self.assertEqual(dict(record), {'new_merchant_flag': True, 'vpn_detected': False,
+                                        'card_age_days': 12, 'transaction_id': 'txn_9'})
+        self.assertIs(self.schema.record(record), record)
+
+    def test_rules_and_model_accept_records(self):
+        for t in self.transactions:
+            record = self.schema.record(t)
+            self.assertEqual(self.rule_service.evaluate(record), self.rule_service.evaluate(t))
+            np.testing.assert_array_equal(
+                self.ml_service.to_matrix([record]), self.ml_service.to_matrix([t])
+            )
+
+    def test_batch_matches_single_transactions(self):
+        batch = self.schema.batch(self.transactions)
+        self.assertEqual(len(batch), len(self.transactions))
+
+        np.testing.assert_array_equal(
+            self.ml_service.to_matrix(batch), self.ml_service.to_matrix(self.transactions)
+        )
+        decisions = self.rule_service.evaluate_batch(batch)["decision"].tolist()
+        self.assertEqual(decisions, [self.rule_service.evaluate(t)["decision"] for t in self.transactions])
+
+        # A DataFrame batch keeps NaN as a value, as the DataFrame paths do
+        frame = pd.DataFrame(self.transactions)
+        np.testing.assert_array_equal(
+            self.ml_service.to_matrix(self.schema.batch(frame)), self.ml_service.to_matrix(frame)
+        )
+
+    def test_engine_evaluate_batch_matches_evaluate(self):
+        engine = FraudDecisionEngine(
+            self.rule_service, self.ml_service,
+            trusted_profiles=[{"name": "tenured", "condition": "card_age_days > 1000"}],
+        )
+        result = engine.evaluate_batch(self.schema.batch(self.transactions))
+
+        for i, t in enumerate(self.transactions):
+            expected = engine.evaluate(self.schema.record(t))
+            self.assertEqual(expected, engine.evaluate(t))
+            self.assertEqual(result["decision"][i], expected["decision"])
+            if "fraud_score" in expected:
+                self.assertEqual(result["fraud_score"][i], expected["fraud_score"])
+            else:
+                self.assertTrue(np.isnan(result["fraud_score"][i]))
@@ -0,0 +1,48 @@
+import os
+import tempfile
+import unittest
+
+import pandas as pd
+
+from taining_data import sample_data_generator
+from taining_data import vectorized_data_generator as generator
+
+class TestVectorizedDataGenerator(unittest.TestCase):
+    def test_columns_match_row_generator(self):
+        df = generator.generate_chunk(0, 1000, seed=1, shard=0, chunk=0)
+        expected = list(sample_data_generator.generate_genuine(0))
+        self.assertEqual(list(df.columns), expected)
+        self.assertEqual(df["transaction_id"].iloc[0], "txn_0")
+        self.assertEqual(int(df["label"].sum()), 30)
+
+    def test_fraud_patterns_applied_to_fraud_rows_only(self):
+        df = generator.generate_chunk(0, 20_000, seed=1, shard=0, chunk=0)
+        genuine, fraud = df[df["label"] == 0], df[df["label"] == 1]
+
+        # Every genuine row stays inside the genuine ranges
+        self.assertTrue(genuine["time_since_block"].between(1000, 50000).all())
+        self.assertTrue(genuine["otp_result"].all())
+        self.assertFalse(genuine["keylogger_detected"].any())
+
+        # Each pattern shows up among fraud rows
+        self.assertTrue((fraud["time_since_block"] < 5).any())
+        self.assertTrue((~fraud["otp_result"] & fraud["vpn_detected"]).any())
+        self.assertTrue((fraud["credit_history_length"] == 0).any())
+        self.assertTrue(fraud["amount_spike_ratio"].max() > 2.0)
+
+    def test_output_independent_of_workers(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            outputs = []
+            for workers in (1, 2):
+                out = os.path.join(tmp, f"w{workers}")
+                result = generator.generate_dataset(
+                    total_rows=2_500, output=out, shard_rows=1_000,
+                    chunk_rows=300, workers=workers
+                )
+                self.assertEqual(result["rows"], 2_500)
+                self.assertEqual(len(result["files"]), 3)
+                outputs.append(pd.concat(pd.read_csv(p) for p in result["files"]))
+
+            pd.testing.assert_frame_equal(outputs[0], outputs[1])
+            self.assertEqual(outputs[0]["transaction_id"].iloc[-1], "txn_2499")
+            self.assertTrue(outputs[0]["transaction_id"].is_unique)
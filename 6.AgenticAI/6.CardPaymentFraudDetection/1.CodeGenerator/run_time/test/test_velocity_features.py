@@ -0,0 +1,115 @@
+import unittest
+
+import numpy as np
+
+from run_time.feature_engine.velocity_features import (
+    AMOUNT_WINDOW_DAYS, DAY_S, SHORT_WINDOWS_S, VelocityFeatureEngine
+)
+
+def brute_force(events, i, resolution_s):
+    card, t, amount = events[i]
+    prior = [(pt, pa) for pc, pt, pa in events[:i] if pc == card]
+    bucket = t // resolution_s
+    features = {}
+
+    for name, seconds in SHORT_WINDOWS_S.items():
+        span = seconds // resolution_s
+        features[f"txn_count_{name}"] = 1 + sum(1 for pt, _ in prior if 0 <= bucket - pt // resolution_s < span)
+    features["txn_velocity_5m"] = features["txn_count_5m"] - 1
+    features["txn_density"] = features["txn_count_5m"] / 5
+
+    if prior:
+        features["time_gap"] = t - max(pt for pt, _ in prior)
+
+    window = [pa for pt, pa in prior if 0 <= t // DAY_S - pt // DAY_S < AMOUNT_WINDOW_DAYS]
+    if window:
+        features["avg_amount_30d"] = sum(window) / len(window)
+        features["amount_spike_ratio"] = amount / features["avg_amount_30d"]
+    else:
+        features["amount_spike_ratio"] = 1.0
+
+    return features
+
+class TestVelocityFeatureEngine(unittest.TestCase):
+    def test_matches_brute_force(self):
+        rng = np.random.default_rng(7)
+        n = 3000
+        cards = rng.integers(0, 20, n).tolist()
+        # Bursts of seconds apart mixed with multi-day gaps
+        gaps = np.where(rng.random(n) < 0.02, rng.uniform(DAY_S, 10 * DAY_S, n), rng.exponential(20, n))
+        timestamps = (1_700_000_000 + np.cumsum(gaps)).tolist()
+        amounts = rng.lognormal(3, 1, n).round(2).tolist()
+        events = list(zip(cards, timestamps, amounts))
+
+        engine = VelocityFeatureEngine(capacity=64)
+        for i, (card, t, amount) in enumerate(events):
+            features = engine.update(card, t, amount)
+            expected = brute_force(events, i, engine.resolution_s)
+
+            self.assertEqual(features.keys(), expected.keys())
+            for key, value in expected.items():
+                self.assertAlmostEqual(features[key], value, delta=1e-5 * max(1.0, abs(value)), msg=key)
+
+    def test_out_of_order_arrivals_match_brute_force(self):
+        rng = np.random.default_rng(11)
+        n = 3000
+        cards = rng.integers(0, 20, n).tolist()
+        gaps = np.where(rng.random(n) < 0.02, rng.uniform(DAY_S, 10 * DAY_S, n), rng.exponential(20, n))
+        # Arrival order of a clean stream, each event delayed by up to 2 minutes
+        timestamps = (1_700_000_000 + np.cumsum(gaps) - rng.uniform(0, 120, n) * (rng.random(n) < 0.2)).tolist()
+        amounts = rng.lognormal(3, 1, n).round(2).tolist()
+        events = list(zip(cards, timestamps, amounts))
+
+        engine = VelocityFeatureEngine(capacity=64)
+        newest = {}
+        late = 0
+        for i, (card, t, amount) in enumerate(events):
+            features = engine.update(card, t, amount)
+            expected = brute_force(events, i, engine.resolution_s)
+            is_late = t < newest.get(card, t)
+            late += is_late
+            newest[card] = max(t, newest.get(card, t))
+
+            self.assertEqual(features.keys(), expected.keys())
+            for key, value in expected.items():
+                if is_late and key == "txn_count_10m":
+                    # May reach back to buckets recycled by newer ones
+                    self.assertLessEqual(features[key], value)
+                    continue
+                self.assertAlmostEqual(features[key], value, delta=1e-5 * max(1.0, abs(value)), msg=key)
+        self.assertGreater(late, 50)
+
+    def test_event_late_past_the_horizon_keeps_newer_counts(self):
+        engine = VelocityFeatureEngine(capacity=4)
+        self.assertEqual([engine.update("card", 1000 + i, 10)["txn_count_5m"] for i in range(5)], [1, 2, 3, 4, 5])
+        # Same ring slot as the newest bucket, 600 s older
+        self.assertEqual(engine.update("card", 400, 10)["txn_count_5m"], 1)
+        self.assertEqual(engine.update("card", 1006, 10)["txn_count_5m"], 6)
+
+    def test_capacity_evicts_least_recently_seen(self):
+        engine = VelocityFeatureEngine(capacity=2)
+        engine.update("card_a", 0, 10)
+        engine.update("card_b", 1, 10)
+        engine.update("card_a", 2, 10)
+        engine.update("card_c", 3, 10)
+
+        self.assertEqual(list(engine.slots), ["card_a", "card_c"])
+        self.assertEqual(engine.evictions, 1)
+        self.assertEqual(engine.update("card_b", 4, 10)["txn_count_5m"], 1)
+
+    def test_evict_expired(self):
+        engine = VelocityFeatureEngine(capacity=4)
+        engine.update("old_card", 0, 10)
+        engine.update("new_card", 40 * DAY_S, 10)
+
+        self.assertEqual(engine.evict_expired(40 * DAY_S), 1)
+        self.assertEqual(list(engine.slots), ["new_card"])
+
+    def test_enrich_keeps_transaction_fields(self):
+        engine = VelocityFeatureEngine(capacity=4)
+        transaction = engine.enrich({"vpn_detected": False}, "card_a", 100, 25.0)
+        self.assertFalse(transaction["vpn_detected"])
+        self.assertEqual(transaction["txn_count_5m"], 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,291 @@
+"""
+Vectorized, Sharded Fraud Data Generator
+----------------------------------------
+
+Same columns, value ranges and ten fraud patterns as
+sample_data_generator.py, but:
+- Every column is drawn as a NumPy array per chunk
+- Fraud pattern overrides ("stolen", "cnp", "velocity", ...) applied with masks
+- Chunks stream to CSV or Parquet, so memory is bounded by --chunk-rows
+- Shards are generated in parallel processes; each chunk's seed is derived
+  from (seed, shard, chunk), so output is identical for any --workers
+
+Output:
+    --rows <= --shard-rows : a single file at --output
+    otherwise              : --output/part-00000.csv (or .parquet), one file per shard
+
+Usage (from 1.CodeGenerator/):
+    python -m taining_data.vectorized_data_generator --rows 100000000 \
+        --shard-rows 5000000 --format parquet --output taining_data/fraud_100m --workers 8
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+# ---------------- CONFIG ----------------
+
+OUTPUT_FILE = "rule_compatible_fraud_data.csv"
+TOTAL_ROWS = 1_000_000
+FRAUD_RATE = 0.03
+SEED = 42
+
+CHUNK_ROWS = 500_000
+SHARD_ROWS = 5_000_000
+
+FRAUD_PATTERNS = [
+    "stolen", "cnp", "identity", "velocity", "atm",
+    "bin", "malware", "refund", "behavioral", "synthetic"
+]
+
+# ---------------- HELPERS ----------------
+
+def randint(rng, low, high, n):
+    """Inclusive, like random.randint."""
+    return rng.integers(low, high + 1, n)
+
+# ---------------- GENUINE COLUMNS ----------------
+
+def generate_genuine(rng, n):
+    return {
+        "time_since_block": randint(rng, 1000, 50000, n),
+        "txn_velocity_5m": randint(rng, 0, 2, n),
+        "geo_distance_km": randint(rng, 0, 10, n),
+        "hour_of_day": randint(rng, 8, 21, n),
+        "otp_result": np.ones(n, dtype=bool),
+        "vpn_detected": np.zeros(n, dtype=bool),
+        "mcc_risk_score": randint(rng, 1, 4, n),
+        "sim_swap_days": randint(rng, 90, 1000, n),
+        "profile_change_recency": randint(rng, 30, 1000, n),
+        "wallet_age_minutes": randint(rng, 5000, 50000, n),
+        "txn_density": rng.uniform(0.1, 0.5, n),
+        "is_first_international": np.zeros(n, dtype=bool),
+        "time_gap": randint(rng, 60, 600, n),
+        "wallets_per_card": randint(rng, 1, 2, n),
+        "atm_risk_score": randint(rng, 1, 4, n),
+        "pos_decline_then_atm": np.zeros(n, dtype=bool),
+        "cvv_fail_rate": randint(rng, 0, 1, n),
+        "expiry_fail_pattern": randint(rng, 0, 1, n),
+        "screen_overlay_detected": np.zeros(n, dtype=bool),
+        "keylogger_detected": np.zeros(n, dtype=bool),
+        "suspicious_app_usage": np.zeros(n, dtype=bool),
+        "refund_card_mismatch": np.zeros(n, dtype=bool),
+        "refund_without_sale": np.zeros(n, dtype=bool),
+        "refund_latency": randint(rng, 10, 500, n),
+        "salary_cycle_deviation": rng.uniform(0.5, 1.2, n),
+        "mcc_entropy": rng.uniform(0.1, 0.5, n),
+        "app_inactive_days": randint(rng, 0, 3, n),
+        "peer_spend_zscore": rng.uniform(0.1, 1.5, n),
+        "offline_contactless": np.zeros(n, dtype=bool),
+        "card_age_days": randint(rng, 100, 5000, n),
+        "credit_history_length": randint(rng, 2, 20, n),
+        "amount_spike_ratio": rng.uniform(0.8, 1.2, n),
+    }
+
+# ---------------- FRAUD OVERRIDES ----------------
+
+def apply_fraud_patterns(rng, cols, fraud_mask):
+    """Each fraud row gets one of FRAUD_PATTERNS, applied column-wise with masks."""
+    fraud_idx = np.flatnonzero(fraud_mask)
+    patterns = rng.integers(0, len(FRAUD_PATTERNS), len(fraud_idx))
+
+    def rows(name):
+        return fraud_idx[patterns == FRAUD_PATTERNS.index(name)]
+
+    def set_int(col, idx, low, high):
+        cols[col][idx] = randint(rng, low, high, len(idx))
+
+    def set_float(col, idx, low, high):
+        cols[col][idx] = rng.uniform(low, high, len(idx))
+
+    idx = rows("stolen")
+    set_int("time_since_block", idx, 0, 4)
+    set_int("txn_velocity_5m", idx, 5, 10)
+
+    idx = rows("cnp")
+    cols["otp_result"][idx] = False
+    cols["vpn_detected"][idx] = True
+    set_int("mcc_risk_score", idx, 8, 10)
+
+    idx = rows("identity")
+    set_int("sim_swap_days", idx, 0, 10)
+    set_int("profile_change_recency", idx, 0, 5)
+    set_int("wallet_age_minutes", idx, 0, 30)
+
+    idx = rows("velocity")
+    set_int("hour_of_day", idx, 22, 23)
+    set_float("txn_density", idx, 1.5, 3.0)
+
+    idx = rows("atm")
+    set_int("atm_risk_score", idx, 8, 10)
+    cols["pos_decline_then_atm"][idx] = True
+
+    idx = rows("bin")
+    set_int("cvv_fail_rate", idx, 4, 10)
+    set_int("expiry_fail_pattern", idx, 4, 10)
+
+    idx = rows("malware")
+    cols["screen_overlay_detected"][idx] = True
+    cols["keylogger_detected"][idx] = True
+
+    idx = rows("refund")
+    cols["refund_card_mismatch"][idx] = True
+    cols["refund_without_sale"][idx] = True
+    set_int("refund_latency", idx, 0, 1)
+
+    idx = rows("behavioral")
+    set_float("salary_cycle_deviation", idx, 2.0, 4.0)
+    set_float("mcc_entropy", idx, 0.8, 1.0)
+    set_float("peer_spend_zscore", idx, 2.5, 5.0)
+
+    idx = rows("synthetic")
+    set_int("card_age_days", idx, 1, 20)
+    cols["credit_history_length"][idx] = 0
+    set_float("amount_spike_ratio", idx, 2.0, 6.0)
+
+# ---------------- CHUNK ----------------
+
+def generate_chunk(start, n, seed, shard, chunk, fraud_rate=FRAUD_RATE) -> pd.DataFrame:
+    """Rows [start, start + n): exactly int(n * fraud_rate) fraud rows, shuffled."""
+    rng = np.random.default_rng([seed, shard, chunk])
+
+    fraud_mask = np.zeros(n, dtype=bool)
+    fraud_mask[:int(n * fraud_rate)] = True
+    rng.shuffle(fraud_mask)
+
+    cols = generate_genuine(rng, n)
+    apply_fraud_patterns(rng, cols, fraud_mask)
+
+    ids = pd.Series(np.arange(start, start + n)).astype(str)
+    return pd.DataFrame({
+        "transaction_id": "txn_" + ids,
+        **cols,
+        "label": fraud_mask.astype(np.int8),
+    })
+
+# ---------------- WRITERS ----------------
+
+class CsvChunkWriter:
+    def __init__(self, path):
+        self.path = path
+        self.header = True
+
+    def write(self, df):
+        df.to_csv(self.path, mode="w" if self.header else "a", header=self.header, index=False)
+        self.header = False
+
+    def close(self):
+        pass
+
+
+class ParquetChunkWriter:
+    def __init__(self, path):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("❌ Parquet output needs: pip install pyarrow") from None
+        self.pa, self.pq = pa, pq
+        self.path = path
+        self.writer = None
+
+    def write(self, df):
+        table = self.pa.Table.from_pandas(df, preserve_index=False)
+        if self.writer is None:
+            self.writer = self.pq.ParquetWriter(self.path, table.schema)
+        self.writer.write_table(table)
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+
+WRITERS = {"csv": CsvChunkWriter, "parquet": ParquetChunkWriter}
+
+# ---------------- SHARD ----------------
+
+def generate_shard(shard, start, n, path, fmt, seed, chunk_rows, fraud_rate):
+    writer = WRITERS[fmt](path)
+    fraud = 0
+
+    for chunk, offset in enumerate(range(0, n, chunk_rows)):
+        size = min(chunk_rows, n - offset)
+        df = generate_chunk(start + offset, size, seed, shard, chunk, fraud_rate)
+        fraud += int(df["label"].sum())
+        writer.write(df)
+
+    writer.close()
+    return n, fraud
+
+
+def generate_dataset(total_rows=TOTAL_ROWS, output=OUTPUT_FILE, fmt="csv", seed=SEED,
+                     shard_rows=SHARD_ROWS, chunk_rows=CHUNK_ROWS, fraud_rate=FRAUD_RATE,
+                     workers=None):
+    shards = [
+        (i, start, min(shard_rows, total_rows - start))
+        for i, start in enumerate(range(0, total_rows, shard_rows))
+    ]
+
+    if len(shards) == 1:
+        paths = [output]
+    else:
+        os.makedirs(output, exist_ok=True)
+        paths = [os.path.join(output, f"part-{i:05d}.{fmt}") for i, _, _ in shards]
+
+    jobs = [
+        (i, start, n, path, fmt, seed, chunk_rows, fraud_rate)
+        for (i, start, n), path in zip(shards, paths)
+    ]
+
+    workers = min(workers or os.cpu_count() or 1, len(jobs))
+    if workers == 1:
+        results = [generate_shard(*job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(generate_shard, *zip(*jobs)))
+
+    return {
+        "rows": sum(n for n, _ in results),
+        "fraud_rows": sum(f for _, f in results),
+        "files": paths,
+    }
+
+# ---------------- MAIN ----------------
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Vectorized rule-compatible fraud data generator")
+    parser.add_argument("--rows", type=int, default=TOTAL_ROWS)
+    parser.add_argument("--output", default=OUTPUT_FILE)
+    parser.add_argument("--format", choices=sorted(WRITERS), default="csv")
+    parser.add_argument("--seed", type=int, default=SEED)
+    parser.add_argument("--shard-rows", type=int, default=SHARD_ROWS)
+    parser.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS)
+    parser.add_argument("--fraud-rate", type=float, default=FRAUD_RATE)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    result = generate_dataset(
+        total_rows=args.rows,
+        output=args.output,
+        fmt=args.format,
+        seed=args.seed,
+        shard_rows=args.shard_rows,
+        chunk_rows=args.chunk_rows,
+        fraud_rate=args.fraud_rate,
+        workers=args.workers,
+    )
+    elapsed = time.perf_counter() - start
+
+    print(f"\n✅ Written: {args.output} ({len(result['files'])} file(s))")
+    print(f"📊 Total rows: {result['rows']}")
+    print(f"🚨 Fraud rows: {result['fraud_rows']}")
+    print(f"⏱️ {elapsed:.1f}s ({result['rows'] / elapsed:,.0f} rows/sec)")
+
+
+if __name__ == "__main__":
+    main()